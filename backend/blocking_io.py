@@ -0,0 +1,85 @@
+"""Bounded worker pool for blocking campaign reads.
+
+Projection endpoints take the world flock, parse ``world.json`` and build
+views synchronously.  Doing that inside an ``async def`` handler stalls every
+WebSocket stream on the server, so the work is submitted to a small thread
+pool instead.  Calls that share a key while one is in flight await the same
+future: a burst of dashboard polls for one revision costs one computation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Hashable
+
+DEFAULT_WORKERS = 4
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_in_flight: dict[Hashable, Future] = {}
+
+
+def _worker_count() -> int:
+    """Pool size from ``DND_IO_WORKERS``, falling back to ``DEFAULT_WORKERS``."""
+    try:
+        return max(1, int(os.environ.get("DND_IO_WORKERS", DEFAULT_WORKERS)))
+    except ValueError:
+        return DEFAULT_WORKERS
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_worker_count(), thread_name_prefix="campaign-io"
+        )
+    return _executor
+
+
+def _land(key: Hashable, future: Future) -> None:
+    with _lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+
+async def run_blocking(
+    key: Hashable | None, func: Callable[..., Any], *args: Any
+) -> Any:
+    """Run ``func(*args)`` on the pool, joining an in-flight call for ``key``.
+
+    The key must identify the result completely (endpoint, campaign and
+    revision); joiners receive the very same object or exception.  Pass
+    ``None`` for reads that must observe writes made after they were issued.
+    A waiter that is cancelled, e.g. by a client disconnect, leaves the shared
+    computation running for the others.
+    """
+    with _lock:
+        future = None if key is None else _in_flight.get(key)
+        started = future is None
+        if started:
+            future = _get_executor().submit(func, *args)
+            if key is not None:
+                _in_flight[key] = future
+    if started and key is not None:
+        # Registered outside the lock: it runs inline if the job already ended.
+        future.add_done_callback(partial(_land, key))
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+
+def in_flight_count() -> int:
+    """Number of distinct computations currently running or queued."""
+    with _lock:
+        return len(_in_flight)
+
+
+def shutdown_blocking_io() -> None:
+    """Stop the pool; the next ``run_blocking`` call starts a fresh one."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from backend.config import get_project_root
+from lib.campaign_catalog import CampaignCatalog, shared_catalog
 from lib.campaign_context import (
     InvalidCampaignName,
     resolve_campaign_dir,
@@ -48,6 +49,27 @@ def _read_campaign_overview(campaign_dir: Path) -> Dict:
     return {}
 
 
+def _campaign_summary(campaign_dir: Path) -> Dict:
+    """Build the overview-derived part of a campaign's info dict."""
+    overview = _read_campaign_overview(campaign_dir)
+
+    return {
+        "name": campaign_dir.name,
+        "active": False,
+        "created_at": overview.get("created_at", ""),
+        "genre": overview.get("genre", ""),
+        "tone": overview.get("tone", ""),
+        "description": overview.get("description", ""),
+    }
+
+
+def _campaign_catalog() -> CampaignCatalog:
+    """Return the watched catalog of campaign summaries."""
+    return shared_catalog(
+        _get_campaigns_dir(), ("campaign-overview.json",), _campaign_summary
+    )
+
+
 def _campaign_to_info(campaign_name: str, campaigns_dir: Path, active_name: Optional[str]) -> Dict:
     """Build info dict for single campaign.
 
@@ -59,17 +81,9 @@ def _campaign_to_info(campaign_name: str, campaigns_dir: Path, active_name: Opti
     Returns:
         Dict with fields: name, active, created_at, genre, tone, description
     """
-    campaign_dir = campaigns_dir / campaign_name
-    overview = _read_campaign_overview(campaign_dir)
-
-    return {
-        "name": campaign_name,
-        "active": campaign_name == active_name,
-        "created_at": overview.get("created_at", ""),
-        "genre": overview.get("genre", ""),
-        "tone": overview.get("tone", ""),
-        "description": overview.get("description", ""),
-    }
+    info = _campaign_summary(campaigns_dir / campaign_name)
+    info["active"] = campaign_name == active_name
+    return info
 
 
 # ─────────────────────────── Public Functions ──────────────────────────────────
@@ -77,6 +91,9 @@ def _campaign_to_info(campaign_name: str, campaigns_dir: Path, active_name: Opti
 def list_campaigns() -> List[Dict]:
     """Get list of all available campaigns.
 
+    Summaries come from an in-memory catalog that only re-reads overviews
+    whose files changed.
+
     Returns:
         List of dicts with information about each campaign:
             - name (str): Campaign name
@@ -93,9 +110,10 @@ def list_campaigns() -> List[Dict]:
     active_name = _get_active_campaign_name()
 
     campaigns = []
-    for entry in sorted(campaigns_dir.iterdir()):
-        if entry.is_dir():
-            campaigns.append(_campaign_to_info(entry.name, campaigns_dir, active_name))
+    for summary in _campaign_catalog().summaries():
+        info = dict(summary)
+        info["active"] = info["name"] == active_name
+        campaigns.append(info)
 
     return campaigns
 
@@ -7,13 +7,20 @@ small, JSON-safe DTOs instead of exposing raw nodes, edges, or DM-only fields.
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
+import math
+import pickle
 import re
+import threading
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
 
+from backend.view_cache import file_stamp, world_revision
 from lib.currency import format_money, load_config
 from lib.world_graph import WorldGraph, calculate_inventory_load
+from lib.world_repository import WorldRepository
 
 
 WIKI_TYPES = {
@@ -69,6 +76,45 @@ _LEGACY_ITEM_WEIGHT_RE = re.compile(
     re.IGNORECASE,
 )
 
+SECTIONS = (
+    "campaign",
+    "character",
+    "inventory",
+    "quests",
+    "npcs",
+    "wiki",
+    "economy",
+    "consequences",
+)
+_WIKI_INPUTS = tuple(f"nodes:{node_type}" for node_type in sorted(WIKI_TYPES))
+# World inputs each section reads.  A section is recomputed only when the
+# digest of its own inputs changes, so a quest update leaves the wiki cached.
+_SECTION_INPUTS: dict[str, tuple[str, ...]] = {
+    "campaign": ("overview", "nodes:player", "edges:at", "nodes:location"),
+    "character": ("overview", "nodes:player", "edges:at", "nodes:location"),
+    "inventory": ("nodes:player", "edges:owns", *_WIKI_INPUTS),
+    "quests": ("nodes:quest",),
+    "npcs": (
+        "nodes:npc",
+        "nodes:player",
+        "nodes:location",
+        "edges:at",
+        "edges:known_by",
+        "edges:owns",
+        "edges:trained",
+        *_WIKI_INPUTS,
+    ),
+    "wiki": (
+        "nodes:player",
+        "edges:known_by",
+        "edges:owns",
+        "edges:trained",
+        *_WIKI_INPUTS,
+    ),
+    "economy": ("overview", "nodes:player", "nodes:misc", "nodes:location"),
+    "consequences": ("nodes:consequence",),
+}
+
 
 def _node_data(node: dict[str, Any]) -> dict[str, Any]:
     data = node.get("data", {})
@@ -309,14 +355,278 @@ def inventory_items(
     return sorted(result, key=lambda item: item["name"].casefold())
 
 
+class WorldIndex:
+    """Read-only, indexed view over one loaded ``world.json`` snapshot.
+
+    Implements the subset of the WorldGraph read API used by the projections
+    (``get_node``, ``list_nodes``, ``npc_list``, ``get_edges``) without
+    re-reading the file, and answers edge lookups from per-node adjacency
+    lists built in a single pass instead of scanning every edge.
+    """
+
+    def __init__(self, world: dict[str, Any]):
+        self.revision = WorldRepository.revision(world)
+        nodes = world.get("nodes", {})
+        self._nodes: dict[str, dict[str, Any]] = nodes if isinstance(nodes, dict) else {}
+        self._by_type: dict[str, list[dict[str, Any]]] = {}
+        for node_id, node in self._nodes.items():
+            self._by_type.setdefault(node.get("type"), []).append({"id": node_id, **node})
+        for nodes_of_type in self._by_type.values():
+            nodes_of_type.sort(key=lambda node: node.get("name", ""))
+        # Edge positions are kept so merged in/out lookups preserve file order,
+        # which WorldGraph.get_edges callers (e.g. the first ``at`` edge) rely on.
+        self._out: dict[str, list[tuple[int, dict[str, Any]]]] = {}
+        self._in: dict[str, list[tuple[int, dict[str, Any]]]] = {}
+        self._edges_by_type: dict[str, list[dict[str, Any]]] = {}
+        for position, edge in enumerate(world.get("edges", [])):
+            self._out.setdefault(edge["from"], []).append((position, edge))
+            self._in.setdefault(edge["to"], []).append((position, edge))
+            self._edges_by_type.setdefault(edge.get("type"), []).append(edge)
+        self._digests: dict[str, str] = {}
+
+    def digest(self, token: str) -> str:
+        """Hash one input bucket: ``nodes:<type>`` or ``edges:<type>``.
+
+        Pickle is the cheapest canonical-enough encoding here: different
+        content always yields different bytes, and the rare spurious mismatch
+        only costs a recomputation.
+        """
+        if token not in self._digests:
+            kind, _, name = token.partition(":")
+            bucket = self._by_type if kind == "nodes" else self._edges_by_type
+            encoded = pickle.dumps(bucket.get(name, []), protocol=5)
+            self._digests[token] = hashlib.sha1(encoded).hexdigest()
+        return self._digests[token]
+
+    @classmethod
+    def load(cls, campaign_dir: Path | str) -> "WorldIndex":
+        """Load ``world.json`` once under the repository's shared lock."""
+        graph = WorldGraph(campaign_dir=Path(campaign_dir))
+        return cls(graph.repository.load())
+
+    def get_node(self, node_id: str) -> dict[str, Any] | None:
+        return self._nodes.get(node_id)
+
+    def list_nodes(self, node_type: str | None = None) -> list[dict[str, Any]]:
+        if node_type:
+            return list(self._by_type.get(node_type, ()))
+        return sorted(
+            (node for nodes in self._by_type.values() for node in nodes),
+            key=lambda node: (node.get("type", ""), node.get("name", "")),
+        )
+
+    def npc_list(self) -> list[dict[str, Any]]:
+        return sorted(
+            self._by_type.get("npc", ()),
+            key=lambda node: node.get("name", "").casefold(),
+        )
+
+    def get_edges(
+        self,
+        node_id: str,
+        edge_type: str | None = None,
+        direction: str = "both",
+    ) -> list[dict[str, Any]]:
+        matches: dict[int, dict[str, Any]] = {}
+        if direction in ("out", "both"):
+            matches.update(self._out.get(node_id, ()))
+        if direction in ("in", "both"):
+            for position, edge in self._in.get(node_id, ()):
+                matches.setdefault(position, edge)
+        return [
+            matches[position]
+            for position in sorted(matches)
+            if not edge_type or matches[position]["type"] == edge_type
+        ]
+
+
+def _check_contract(value: Any) -> None:
+    """Reject values the JSON API contract cannot represent.
+
+    A type walk over the freshly built section replaces a full
+    ``json.loads(json.dumps(...))`` round trip: sections are assembled from
+    new containers, so only the leaf types need asserting.
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if item is None or isinstance(item, (str, bool, int)):
+            continue
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                raise ValueError(f"non-finite number in campaign view: {item!r}")
+        elif isinstance(item, dict):
+            for key, nested in item.items():
+                if not isinstance(key, str):
+                    raise TypeError(f"campaign view key must be a string: {key!r}")
+                stack.append(nested)
+        elif isinstance(item, list):
+            stack.extend(item)
+        else:
+            raise TypeError(
+                f"campaign view value is not JSON-safe: {type(item).__name__}"
+            )
+
+
+_section_lock = threading.Lock()
+# campaign dir -> {section: (file key, input digest, projected value)}
+_section_cache: dict[str, dict[str, tuple[tuple[Any, ...], str, Any]]] = {}
+
+
+def clear_section_cache() -> None:
+    """Forget every memoized dashboard section and knowledge set."""
+    with _section_lock:
+        _section_cache.clear()
+    with _knowledge_lock:
+        _knowledge_cache.clear()
+
+
+class PlayerKnowledge:
+    """Entities the player knows about, for visibility filtering.
+
+    An entity is known when it is linked to the player by ``known_by``, is a
+    ``trained`` target, is ``owns``-linked while the player has no embedded
+    inventory, or shares a name (case-insensitively) with an inventory item.
+    """
+
+    __slots__ = ("world_stamp", "player_id", "known_ids", "inventory_names")
+
+    def __init__(
+        self,
+        world_stamp: tuple[int, ...] | None,
+        player_id: str,
+        known_ids: Iterable[str],
+        inventory_names: Iterable[str],
+    ):
+        self.world_stamp = world_stamp
+        self.player_id = player_id
+        self.known_ids = frozenset(known_ids)
+        self.inventory_names = frozenset(inventory_names)
+
+    @classmethod
+    def build(
+        cls,
+        graph: WorldIndex,
+        player_id: str,
+        player: dict[str, Any],
+        inventory: Iterable[dict[str, Any]],
+        world_stamp: tuple[int, ...] | None,
+    ) -> "PlayerKnowledge":
+        """Derive the sets from the player's own edges and inventory only."""
+        known = {player_id}
+        for edge in graph.get_edges(player_id, edge_type="known_by", direction="both"):
+            known.add(edge["to"] if edge.get("from") == player_id else edge["from"])
+        has_embedded_inventory = (
+            "inventory" in player
+            or "inventory" in _node_data(player)
+        )
+        for edge in graph.get_edges(player_id, direction="out"):
+            if edge.get("type") == "trained" or (
+                edge.get("type") == "owns" and not has_embedded_inventory
+            ):
+                known.add(edge.get("to"))
+        known.discard(None)
+        names = {item["name"].casefold() for item in inventory}
+        return cls(world_stamp, player_id, known, names)
+
+    def knows(self, entity_id: str, name: str | None = None) -> bool:
+        """Constant-time visibility test for one entity."""
+        return entity_id in self.known_ids or (
+            name is not None and name.casefold() in self.inventory_names
+        )
+
+
+_knowledge_lock = threading.Lock()
+_knowledge_cache: dict[str, PlayerKnowledge] = {}
+
+
+def _stored_knowledge(
+    campaign_dir: Path, world_stamp: tuple[int, ...] | None
+) -> PlayerKnowledge | None:
+    """Return knowledge built from exactly this ``world.json``, if any."""
+    if world_stamp is None:
+        return None
+    with _knowledge_lock:
+        cached = _knowledge_cache.get(str(campaign_dir))
+    if cached is not None and cached.world_stamp == world_stamp:
+        return cached
+    return None
+
+
+def _remember_knowledge(campaign_dir: Path, knowledge: PlayerKnowledge) -> None:
+    with _knowledge_lock:
+        _knowledge_cache[str(campaign_dir)] = knowledge
+
+
 class CampaignViewProjector:
-    """Build related dashboard views from one campaign graph."""
+    """Build related dashboard views from one campaign graph.
+
+    The world is loaded at most once per projector, and only when a section is
+    not already memoized for the current world revision and overview file.
+    Memoized sections are shared between requests and must be treated as
+    read-only by callers.
+    """
 
     def __init__(self, campaign_dir: Path | str):
         self.campaign_dir = Path(campaign_dir)
-        self.graph = WorldGraph(campaign_dir=self.campaign_dir)
-        self.overview = self._load_overview()
-        self.player_id, self.player = self._find_player()
+        revision, world_stamp = world_revision(self.campaign_dir)
+        self.cache_key = (
+            revision,
+            world_stamp,
+            file_stamp(self.campaign_dir / "campaign-overview.json"),
+        )
+
+    @cached_property
+    def graph(self) -> WorldIndex:
+        return WorldIndex.load(self.campaign_dir)
+
+    @cached_property
+    def overview(self) -> dict[str, Any]:
+        return self._load_overview()
+
+    @cached_property
+    def _player_entry(self) -> tuple[str, dict[str, Any]]:
+        return self._find_player()
+
+    @property
+    def player_id(self) -> str:
+        return self._player_entry[0]
+
+    @property
+    def player(self) -> dict[str, Any]:
+        return self._player_entry[1]
+
+    def _input_digest(self, section: str) -> str:
+        parts = []
+        for token in _SECTION_INPUTS[section]:
+            if token == "overview":
+                encoded = pickle.dumps(self.overview, protocol=5)
+                parts.append(hashlib.sha1(encoded).hexdigest())
+            else:
+                parts.append(self.graph.digest(token))
+        return ":".join(parts)
+
+    def _memoized(self, section: str, build: Callable[[], Any]) -> Any:
+        """Return a section, rebuilding it only when its own inputs changed.
+
+        An unchanged file key answers without loading the world.  After a
+        write, the section's input digest decides whether the cached value is
+        still valid for the new revision.
+        """
+        key = str(self.campaign_dir)
+        with _section_lock:
+            entry = _section_cache.get(key, {}).get(section)
+        if entry and entry[0] == self.cache_key:
+            return entry[2]
+        digest = self._input_digest(section)
+        if entry and entry[1] == digest:
+            value = entry[2]
+        else:
+            value = build()
+            _check_contract(value)
+        with _section_lock:
+            _section_cache.setdefault(key, {})[section] = (self.cache_key, digest, value)
+        return value
 
     def _load_overview(self) -> dict[str, Any]:
         path = self.campaign_dir / "campaign-overview.json"
@@ -340,13 +650,20 @@ class CampaignViewProjector:
         player = players[0]
         return player["id"], player
 
+    @cached_property
+    def _currency(self) -> dict[str, Any]:
+        return load_config(self.campaign_dir)
+
     def _money(self) -> tuple[int, dict[str, Any]]:
         raw = _field(self.player, "money", _field(self.player, "gold", 0))
         amount = int(_number(raw, 0))
-        config = load_config(self.campaign_dir)
-        return amount, config
+        return amount, self._currency
 
-    def campaign(self) -> dict[str, Any]:
+    @cached_property
+    def _player_items(self) -> list[dict[str, Any]]:
+        return inventory_items(self.graph, self.player_id, self.player)
+
+    def _project_campaign(self) -> dict[str, Any]:
         return {
             "name": self.overview.get("name", self.campaign_dir.name),
             "campaign_name": self.overview.get(
@@ -364,7 +681,7 @@ class CampaignViewProjector:
             ),
         }
 
-    def character(self) -> dict[str, Any]:
+    def _project_character(self) -> dict[str, Any]:
         hp_raw = _field(self.player, "hp", 0)
         if isinstance(hp_raw, dict):
             hp_current = int(_number(hp_raw.get("current"), 0))
@@ -417,8 +734,8 @@ class CampaignViewProjector:
         }
         return result
 
-    def inventory(self) -> dict[str, Any]:
-        items = inventory_items(self.graph, self.player_id, self.player)
+    def _project_inventory(self) -> dict[str, Any]:
+        items = self._player_items
         total_weight = sum(
             float(item.get("weight", 0)) * float(item.get("quantity", 1))
             for item in items
@@ -455,7 +772,7 @@ class CampaignViewProjector:
             ),
         }
 
-    def quests(self) -> list[dict[str, Any]]:
+    def _project_quests(self) -> list[dict[str, Any]]:
         result = []
         for quest in self.graph.list_nodes(node_type="quest"):
             if _explicitly_hidden(quest):
@@ -490,29 +807,27 @@ class CampaignViewProjector:
             )
         return sorted(result, key=lambda quest: (quest["status"] != "active", quest["name"]))
 
-    def _known_entity_ids(self) -> set[str]:
-        known = {self.player_id}
-        for edge in self.graph.get_edges(self.player_id, edge_type="known_by", direction="both"):
-            known.add(edge["to"] if edge.get("from") == self.player_id else edge["from"])
-        has_embedded_inventory = (
-            "inventory" in self.player
-            or "inventory" in _node_data(self.player)
+    @cached_property
+    def knowledge(self) -> PlayerKnowledge:
+        """The player's knowledge set for this exact ``world.json``."""
+        world_stamp = self.cache_key[1]
+        stored = _stored_knowledge(self.campaign_dir, world_stamp)
+        if stored is not None:
+            return stored
+        knowledge = PlayerKnowledge.build(
+            self.graph, self.player_id, self.player, self._player_items, world_stamp
         )
-        for edge in self.graph.get_edges(self.player_id, direction="out"):
-            if edge.get("type") == "trained" or (
-                edge.get("type") == "owns" and not has_embedded_inventory
-            ):
-                known.add(edge.get("to"))
-        return known
+        _remember_knowledge(self.campaign_dir, knowledge)
+        return knowledge
 
-    def npcs(self) -> dict[str, list[dict[str, Any]]]:
-        known_ids = self._known_entity_ids()
+    def _project_npcs(self) -> dict[str, list[dict[str, Any]]]:
+        knowledge = self.knowledge
         party: list[dict[str, Any]] = []
         known: list[dict[str, Any]] = []
         for npc in self.graph.npc_list():
             data = _node_data(npc)
             is_party = bool(data.get("party_member") or data.get("is_party_member"))
-            is_known = is_party or npc["id"] in known_ids or _explicitly_visible(npc)
+            is_known = is_party or knowledge.knows(npc["id"]) or _explicitly_visible(npc)
             if _explicitly_hidden(npc) or not is_known:
                 continue
 
@@ -544,20 +859,14 @@ class CampaignViewProjector:
             "known": sorted(known, key=lambda npc: npc["name"].casefold()),
         }
 
-    def wiki(self) -> list[dict[str, Any]]:
-        known_ids = self._known_entity_ids()
-        inventory_names = {
-            item["name"].casefold() for item in inventory_items(
-                self.graph, self.player_id, self.player
-            )
-        }
+    def _project_wiki(self) -> list[dict[str, Any]]:
+        knowledge = self.knowledge
         result = []
         for node_type in WIKI_TYPES:
             for node in self.graph.list_nodes(node_type=node_type):
                 data = _node_data(node)
                 known = (
-                    node["id"] in known_ids
-                    or node.get("name", "").casefold() in inventory_names
+                    knowledge.knows(node["id"], node.get("name", ""))
                     or _explicitly_visible(node)
                 )
                 if _explicitly_hidden(node) or not known:
@@ -587,7 +896,7 @@ class CampaignViewProjector:
                 result.append(projected)
         return result
 
-    def economy(self) -> dict[str, Any]:
+    def _project_economy(self) -> dict[str, Any]:
         money, currency = self._money()
         economy_node = self.graph.get_node("misc:economy") or {}
         data = _node_data(economy_node)
@@ -623,7 +932,7 @@ class CampaignViewProjector:
             "production": production,
         }
 
-    def consequences(self) -> list[dict[str, Any]]:
+    def _project_consequences(self) -> list[dict[str, Any]]:
         result = []
         visible_statuses = {"expired", "resolved", "triggered"}
         for node in self.graph.list_nodes(node_type="consequence"):
@@ -647,28 +956,69 @@ class CampaignViewProjector:
             result.append(item)
         return sorted(result, key=lambda item: (item["status"], item["name"].casefold()))
 
-    def snapshot(self) -> dict[str, Any]:
-        """Return the complete player-facing dashboard state."""
-        result = {
+    def campaign(self) -> dict[str, Any]:
+        return self._memoized("campaign", self._project_campaign)
+
+    def character(self) -> dict[str, Any]:
+        return self._memoized("character", self._project_character)
+
+    def inventory(self) -> dict[str, Any]:
+        return self._memoized("inventory", self._project_inventory)
+
+    def quests(self) -> list[dict[str, Any]]:
+        return self._memoized("quests", self._project_quests)
+
+    def npcs(self) -> dict[str, list[dict[str, Any]]]:
+        return self._memoized("npcs", self._project_npcs)
+
+    def wiki(self) -> list[dict[str, Any]]:
+        return self._memoized("wiki", self._project_wiki)
+
+    def economy(self) -> dict[str, Any]:
+        return self._memoized("economy", self._project_economy)
+
+    def consequences(self) -> list[dict[str, Any]]:
+        return self._memoized("consequences", self._project_consequences)
+
+    def section(self, name: str) -> Any:
+        """Return one named section, computing nothing else."""
+        if name not in SECTIONS:
+            raise ValueError(f"unknown campaign view section: {name!r}")
+        return getattr(self, name)()
+
+    def snapshot(self, sections: Iterable[str] | None = None) -> dict[str, Any]:
+        """Return the player-facing dashboard state.
+
+        ``sections`` limits the result to the named sections; only those are
+        computed.  Each section is contract-checked when it is built; the
+        returned mapping is fresh but its section values are shared,
+        read-only memoized data.
+        """
+        names = SECTIONS if sections is None else tuple(sections)
+        result: dict[str, Any] = {
             "visibility_policy": {
                 "npcs": "party_or_explicitly_known",
                 "wiki": "owned_trained_or_explicitly_known",
                 "consequences": "occurred_or_explicitly_revealed",
                 "future_random_events": "never_exposed",
             },
-            "campaign": self.campaign(),
-            "character": self.character(),
-            "inventory": self.inventory(),
-            "quests": self.quests(),
-            "npcs": self.npcs(),
-            "wiki": self.wiki(),
-            "economy": self.economy(),
-            "consequences": self.consequences(),
         }
-        # Assert the API contract at its boundary and return a detached value.
-        return json.loads(json.dumps(result, ensure_ascii=False))
+        for name in names:
+            result[name] = self.section(name)
+        return result
+
+
+def get_campaign_views(
+    campaign_dir: Path | str,
+    sections: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """Build dashboard projections for a campaign directory.
+
+    All sections are returned unless ``sections`` names a subset.
+    """
+    return CampaignViewProjector(campaign_dir).snapshot(sections)
 
 
-def get_campaign_views(campaign_dir: Path | str) -> dict[str, Any]:
-    """Build all dashboard projections for a campaign directory."""
-    return CampaignViewProjector(campaign_dir).snapshot()
+def get_campaign_view_section(campaign_dir: Path | str, section: str) -> Any:
+    """Build a single dashboard section for a campaign directory."""
+    return CampaignViewProjector(campaign_dir).section(section)
@@ -10,6 +10,7 @@ from typing import Any, Mapping
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
 from backend.media import store_generated_image
+from backend.media_variants import schedule_variants
 
 CINEMATIC_EVENT_PREFIX = "__DM_CINEMATIC_EVENT__"
 DEFAULT_CINEMATIC_MODEL = "gpt-5.6-luna"
@@ -88,7 +89,8 @@ async def render_cinematic_scene(
         campaign_name=campaign_name,
         reasoning_effort="low",
     )
-    image_event = None
+    campaign_dir = project_root / "world-state" / "campaigns" / campaign_name
+    published = None
     errors: list[str] = []
     try:
         async for event in provider.process_message(
@@ -100,19 +102,21 @@ async def render_cinematic_scene(
             model_name=model,
         ):
             if event.type == "image":
-                image_event = event
+                # A spooled source_path only lives until the generator resumes,
+                # so publish before asking for the next event.
+                published = store_generated_image(
+                    campaign_dir,
+                    source_path=event.metadata.get("source_path"),
+                    data_url=event.metadata.get("data_url"),
+                )
             elif event.type == "error" and event.content:
                 errors.append(event.content)
     finally:
         await provider.close()
-    if image_event is None:
+    if published is None:
         detail = errors[-1] if errors else "Codex returned no generated image"
         raise RuntimeError(detail)
-    published = store_generated_image(
-        project_root / "world-state" / "campaigns" / campaign_name,
-        source_path=image_event.metadata.get("source_path"),
-        data_url=image_event.metadata.get("data_url"),
-    )
+    schedule_variants(campaign_dir, published.filename)
     return {
         "type": "image",
         "source_path": str(
@@ -1,30 +1,102 @@
-"""DM Agent - System prompt builder."""
+"""DM Agent - System prompt builder.
+
+The prompt is a stable prefix (compiled DM rules, narrator style, campaign
+rules, cinematic contract) followed by a volatile suffix (the current
+character and location).  Compiling the prefix runs the bash rules
+compiler, so it is cached under a digest of everything it is built from:
+the campaign, the overview fields it uses (modules, narrator style,
+cinematic settings), and the path, size and mtime of every rules, module,
+narrator and campaign rules file it reads.  Editing any of them
+changes the digest; the volatile suffix is rebuilt on every call.
+"""
 
+import hashlib
 import json
 import os
 import subprocess
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+from lib.metrics import counter
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROMPT_CACHE_SIZE = 32
+# campaign-overview.json is rewritten by gameplay (clock, date), so the key
+# uses only the fields the stable prefix reads rather than the file's mtime.
+_PREFIX_OVERVIEW_FIELDS = ("modules", "narrator_style", "cinematic_visuals")
+
+_FALLBACK_PROMPT = """# DM System - AI Dungeon Master
+
+You are an AI Dungeon Master for D&D 5e campaigns. Guide players through their adventure, narrate scenes, manage combat, and call appropriate tools to track game state.
+
+Use the available tools to:
+- Roll dice for checks, saves, and attacks
+- Manage inventory, HP, XP, and gold
+- Track NPCs, locations, and plot threads
+- Advance game time
+
+Be descriptive, engaging, and fair. Follow D&D 5e rules. Make the game fun!
+"""
+
+_stable_cache: "OrderedDict[str, str]" = OrderedDict()
+_stable_cache_lock = threading.Lock()
+_PROMPT_CACHE = counter(
+    "dm_prompt_cache",
+    "Stable system prompt lookups by result (hit or miss).",
+    ("result",),
+)
+_PROMPT_CACHE_HIT = _PROMPT_CACHE.labels("hit")
+_PROMPT_CACHE_MISS = _PROMPT_CACHE.labels("miss")
+
 
 def load_system_prompt(campaign_name: str | None = None) -> str:
     """Build the DM system prompt for a specific campaign.
 
     Combines the compiled DM rules (dm-slots + the campaign's enabled modules),
-    the campaign's narrator style, and its campaign-rules.md. When `campaign_name`
-    is given (the web sockets are campaign-addressed), everything is scoped to that
-    campaign — NOT the global active-campaign.txt, which would be wrong or empty and
-    would race across concurrent sessions.
+    the campaign's narrator style, its campaign-rules.md and the cinematic
+    contract (the cached stable prefix), then the current-campaign context.
+    When `campaign_name` is given (the web sockets are campaign-addressed),
+    everything is scoped to that campaign — NOT the global active-campaign.txt,
+    which would be wrong or empty and would race across concurrent sessions.
 
     Args:
         campaign_name: Campaign to build the prompt for. None → fall back to the
             global active campaign (legacy / CLI use).
 
     Returns:
-        str: DM rules + narrator style + campaign rules.
+        str: Stable prefix + volatile suffix.
     """
-    project_root = Path(__file__).parent.parent
+    stable, volatile = load_system_prompt_parts(campaign_name)
+    system_prompt = stable + volatile
 
-    # Resolve which campaign to scope to.
+    # Ensure we return something meaningful
+    if len(system_prompt.strip()) < 100:
+        system_prompt = _FALLBACK_PROMPT
+    return system_prompt
+
+
+def load_system_prompt_parts(campaign_name: str | None = None) -> tuple[str, str]:
+    """Return ``(stable prefix, volatile suffix)`` for ``campaign_name``."""
+    project_root = PROJECT_ROOT
+    campaign_name = _resolve_campaign(project_root, campaign_name)
+    overview = _read_overview(project_root, campaign_name) if campaign_name else {}
+    stable = _cached_stable_prompt(project_root, campaign_name, overview)
+
+    # Active-campaign context — so the DM knows it is ALREADY inside this
+    # campaign and should just run the session (narrate + offer actions), NOT show a
+    # campaign menu / list. Without this the DM treats every turn as a fresh boot.
+    # It carries live character state, so it is the volatile suffix.
+    volatile = f"\n{_campaign_context(project_root, campaign_name)}" if campaign_name else ""
+    return stable, volatile
+
+
+def clear_prompt_cache() -> None:
+    with _stable_cache_lock:
+        _stable_cache.clear()
+
+
+def _resolve_campaign(project_root: Path, campaign_name: str | None) -> str | None:
     if not campaign_name:
         active_campaign_file = project_root / "world-state" / "active-campaign.txt"
         if active_campaign_file.exists():
@@ -38,7 +110,93 @@ def load_system_prompt(campaign_name: str | None = None) -> str:
         or ".." in campaign_name or campaign_name.startswith(".")
     ):
         campaign_name = None
+    return campaign_name
+
+
+def _read_overview(project_root: Path, campaign_name: str) -> dict:
+    overview_path = project_root / "world-state" / "campaigns" / campaign_name / "campaign-overview.json"
+    try:
+        overview = json.loads(overview_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+    return overview if isinstance(overview, dict) else {}
 
+
+def _enabled_modules(overview: dict) -> list[str]:
+    modules = overview.get("modules")
+    if isinstance(modules, list):
+        return sorted(str(module_id) for module_id in modules)
+    if isinstance(modules, dict):
+        return sorted(str(module_id) for module_id, enabled in modules.items() if enabled)
+    return []
+
+
+def _prompt_inputs(project_root: Path, campaign_name: str | None, overview: dict) -> list[Path]:
+    """Every file the stable prefix may be built from, existing or not.
+
+    Missing files are listed too, so creating one (a campaign-rules.md, a
+    module's rules) invalidates the digest just like editing one.
+    """
+    additional = project_root / ".claude" / "additional"
+    paths = [
+        additional / "infrastructure" / "dm-active-modules-rules.sh",
+        additional / "narrator-styles" / "epic-heroic.md",
+        project_root / "codex-skills" / "cinematic-scene" / "SKILL.md",
+    ]
+    for directory in (additional / "dm-slots", additional / "infrastructure"):
+        if directory.is_dir():
+            paths.extend(sorted(directory.rglob("*")))
+    for module_id in _enabled_modules(overview):
+        module_dir = additional / "modules" / module_id
+        paths.append(module_dir / "module.json")
+        if module_dir.is_dir():
+            paths.extend(sorted(module_dir.rglob("*.md")))
+    if campaign_name:
+        campaign_dir = project_root / "world-state" / "campaigns" / campaign_name
+        paths.append(campaign_dir / "campaign-rules.md")
+        narrator_id = overview.get("narrator_style")
+        if isinstance(narrator_id, str) and narrator_id.strip():
+            paths.append(additional / "narrator-styles" / f"{narrator_id.strip()}.md")
+    else:
+        paths.append(Path("/tmp/dm-rules.md"))
+    return paths
+
+
+def _prompt_digest(project_root: Path, campaign_name: str | None, overview: dict) -> str:
+    digest = hashlib.sha256()
+    prefix_fields = {field: overview.get(field) for field in _PREFIX_OVERVIEW_FIELDS}
+    digest.update(f"{campaign_name or ''}\0".encode())
+    digest.update(json.dumps(prefix_fields, sort_keys=True, default=str).encode())
+    for path in _prompt_inputs(project_root, campaign_name, overview):
+        try:
+            stat = path.stat()
+            signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            signature = "-"
+        digest.update(f"{path}\0{signature}\n".encode())
+    return digest.hexdigest()
+
+
+def _cached_stable_prompt(project_root: Path, campaign_name: str | None, overview: dict) -> str:
+    key = _prompt_digest(project_root, campaign_name, overview)
+    with _stable_cache_lock:
+        stable = _stable_cache.get(key)
+        if stable is not None:
+            _stable_cache.move_to_end(key)
+            _PROMPT_CACHE_HIT.inc()
+            return stable
+    _PROMPT_CACHE_MISS.inc()
+    stable = _build_stable_prompt(project_root, campaign_name, overview)
+    with _stable_cache_lock:
+        _stable_cache[key] = stable
+        _stable_cache.move_to_end(key)
+        while len(_stable_cache) > PROMPT_CACHE_SIZE:
+            _stable_cache.popitem(last=False)
+    return stable
+
+
+def _build_stable_prompt(project_root: Path, campaign_name: str | None, overview: dict) -> str:
+    """Compile the part of the prompt that only changes when files do."""
     # Step 1: Compile DM rules for this campaign (dm-slots + its modules).
     # The /tmp cache is campaign-blind, so only use it when no campaign is scoped.
     dm_rules = ""
@@ -65,24 +223,16 @@ def load_system_prompt(campaign_name: str | None = None) -> str:
     # case) or an embedded object; handle both, never crash on the string form.
     narrator_style = ""
     styles_dir = project_root / ".claude" / "additional" / "narrator-styles"
-    if campaign_name:
-        overview_path = project_root / "world-state" / "campaigns" / campaign_name / "campaign-overview.json"
-        if overview_path.exists():
-            try:
-                with open(overview_path) as f:
-                    overview = json.load(f)
-                narrator_data = overview.get("narrator_style", "")
-                if isinstance(narrator_data, str) and narrator_data.strip():
-                    style_file = styles_dir / f"{narrator_data.strip()}.md"
-                    if style_file.exists():
-                        narrator_style = f"\n---\n{style_file.read_text()}\n"
-                elif isinstance(narrator_data, dict) and narrator_data:
-                    style_rules = narrator_data.get("rules_raw", "")
-                    style_name = narrator_data.get("name", "")
-                    style_desc = narrator_data.get("description", "")
-                    narrator_style = f"\n---\n# Narrator Style: {style_name}\n\n{style_desc}\n\n{style_rules}\n"
-            except (json.JSONDecodeError, IOError):
-                pass
+    narrator_data = overview.get("narrator_style", "")
+    if isinstance(narrator_data, str) and narrator_data.strip():
+        style_file = styles_dir / f"{narrator_data.strip()}.md"
+        if style_file.exists():
+            narrator_style = f"\n---\n{style_file.read_text()}\n"
+    elif isinstance(narrator_data, dict) and narrator_data:
+        style_rules = narrator_data.get("rules_raw", "")
+        style_name = narrator_data.get("name", "")
+        style_desc = narrator_data.get("description", "")
+        narrator_style = f"\n---\n# Narrator Style: {style_name}\n\n{style_desc}\n\n{style_rules}\n"
 
     if not narrator_style:
         default_style_path = styles_dir / "epic-heroic.md"
@@ -96,12 +246,7 @@ def load_system_prompt(campaign_name: str | None = None) -> str:
         if rules_path.exists():
             campaign_rules = f"\n---\n# Campaign Rules\n\n{rules_path.read_text()}\n"
 
-    # Step 4: Active-campaign context — so the DM knows it is ALREADY inside this
-    # campaign and should just run the session (narrate + offer actions), NOT show a
-    # campaign menu / list. Without this the DM treats every turn as a fresh boot.
-    campaign_context = _campaign_context(project_root, campaign_name) if campaign_name else ""
-
-    # Step 5: Provider-neutral cinematic contract. Codex has native image
+    # Step 4: Provider-neutral cinematic contract. Codex has native image
     # generation; Claude receives the equivalent in-process MCP tool.
     cinematic_context = (
         _cinematic_context(project_root, campaign_name)
@@ -109,29 +254,7 @@ def load_system_prompt(campaign_name: str | None = None) -> str:
         else ""
     )
 
-    # Combine prompts
-    system_prompt = (
-        f"{dm_rules}\n{narrator_style}\n{campaign_rules}\n"
-        f"{campaign_context}\n{cinematic_context}"
-    )
-
-    # Ensure we return something meaningful
-    if len(system_prompt.strip()) < 100:
-        # Fallback minimal prompt
-        system_prompt = """# DM System - AI Dungeon Master
-
-You are an AI Dungeon Master for D&D 5e campaigns. Guide players through their adventure, narrate scenes, manage combat, and call appropriate tools to track game state.
-
-Use the available tools to:
-- Roll dice for checks, saves, and attacks
-- Manage inventory, HP, XP, and gold
-- Track NPCs, locations, and plot threads
-- Advance game time
-
-Be descriptive, engaging, and fair. Follow D&D 5e rules. Make the game fun!
-"""
-
-    return system_prompt
+    return f"{dm_rules}\n{narrator_style}\n{campaign_rules}\n{cinematic_context}"
 
 
 def _campaign_context(project_root: Path, campaign_name: str) -> str:
@@ -7,13 +7,21 @@ Monotonic ids let clients request replay via `after_id` on reconnect.
 import fcntl
 import json
 import os
+import time
 from collections.abc import Mapping
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, BinaryIO, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from lib.metrics import counter, histogram
 
 EVENT_LOG_FILENAME = "events.jsonl"
 
+_APPEND_SECONDS = histogram(
+    "dm_event_append_seconds", "Time to lock, append and fsync one event."
+).labels()
+_FSYNCS = counter("dm_event_fsync", "fsync calls made by event appends.").labels()
+
 
 def _log_path(campaign_dir: Path) -> Path:
     return campaign_dir / EVENT_LOG_FILENAME
@@ -70,32 +78,72 @@ def read_current_session_events(
     ]
 
 
+def _reverse_lines(file_obj: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield the file's lines newest first, reading fixed chunks from the end.
+
+    Lines are split on raw bytes, so a chunk boundary inside a multi-byte
+    UTF-8 character never has to be decoded.
+    """
+    file_obj.seek(0, os.SEEK_END)
+    position = file_obj.tell()
+    # Pieces of the line being assembled, newest first; kept as a list so a
+    # line longer than a chunk is joined once instead of copied per chunk.
+    pending: list[bytes] = []
+    while position > 0:
+        start = max(0, position - chunk_size)
+        file_obj.seek(start)
+        pieces = file_obj.read(position - start).split(b"\n")
+        position = start
+        if len(pieces) == 1:
+            pending.append(pieces[0])
+            continue
+        pending.append(pieces[-1])
+        for line in (b"".join(reversed(pending)), *reversed(pieces[1:-1])):
+            if line.strip():
+                yield line
+        pending = [pieces[0]]
+    line = b"".join(reversed(pending))
+    if line.strip():
+        yield line
+
+
 def _last_id_from_tail(file_obj: BinaryIO, chunk_size: int = 64 * 1024) -> int:
     """Find the last valid id without decoding from an arbitrary UTF-8 offset."""
-    file_obj.seek(0, os.SEEK_END)
-    end = file_obj.tell()
-    if end == 0:
-        return 0
+    for line in _reverse_lines(file_obj, chunk_size):
+        try:
+            event_id = json.loads(line).get("id")
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            continue
+        if isinstance(event_id, int):
+            return event_id
+    return 0
 
-    window = chunk_size
-    while True:
-        start = max(0, end - window)
-        file_obj.seek(start)
-        tail = file_obj.read()
-        if start:
-            tail = tail.split(b"\n", 1)[-1]
 
-        for line in reversed(tail.splitlines()):
+def iter_current_session_events_reversed(
+    campaign_dir: Path,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[Dict]:
+    """Yield the current session's events newest first, stopping at its boundary.
+
+    Only as much of the log as the caller consumes is read, so taking the
+    last few events costs the same however long the campaign has run.
+    """
+    path = _log_path(campaign_dir)
+    try:
+        file_obj = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with file_obj:
+        for line in _reverse_lines(file_obj, chunk_size):
             try:
-                event_id = json.loads(line).get("id")
-            except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                event = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
-            if isinstance(event_id, int):
-                return event_id
-
-        if start == 0:
-            return 0
-        window *= 2
+            if not isinstance(event, dict):
+                continue
+            if event.get("type") == "session_reset":
+                return
+            yield event
 
 
 def append_event(
@@ -106,6 +154,7 @@ def append_event(
     metadata: Mapping[str, Any] | None = None,
 ) -> Dict:
     """Append a single event to the log. Returns the stored event (with id)."""
+    started = time.perf_counter()
     campaign_dir.mkdir(parents=True, exist_ok=True)
     path = _log_path(campaign_dir)
     with open(path, "a+b") as f:
@@ -122,5 +171,7 @@ def append_event(
         f.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
         f.flush()
         os.fsync(f.fileno())
+        _FSYNCS.inc()
         fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    _APPEND_SECONDS.observe(time.perf_counter() - started)
     return event
@@ -4,20 +4,28 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import time
+from collections import defaultdict
 from collections.abc import Mapping
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from urllib.parse import quote
 
-from backend.event_log import append_event, read_current_session_events
+from backend.blocking_io import run_blocking
+from backend.event_log import append_event, iter_current_session_events_reversed
 from backend.live_broker import broker
 from backend.media import store_generated_image
+from backend.media_variants import schedule_variants
+from backend.prompt_cache_report import record_turn
+from backend.turn_trace import TurnTrace, save_trace
+from lib.metrics import counter, gauge, histogram
 from backend.runtime import (
     AgentEvent,
     ProviderBuildContext,
     RuntimeRegistry,
+    TurnUsage,
     clear_runtime_session,
     create_default_registry,
     load_runtime_session,
@@ -26,13 +34,50 @@ from backend.runtime import (
 
 logger = logging.getLogger(__name__)
 
+_TURN_TTFT_SECONDS = histogram(
+    "dm_turn_ttft_seconds",
+    "Time from a player message to the first narrated text, by whether the "
+    "provider was already connected (warm) or started for the turn (cold).",
+    ("runtime", "model", "start"),
+)
+_PROMPT_INPUT_TOKENS = counter(
+    "dm_prompt_input_tokens",
+    "Prompt tokens sent to providers, cached ones included.",
+    ("runtime", "model"),
+)
+_PROMPT_CACHED_TOKENS = counter(
+    "dm_prompt_cached_input_tokens",
+    "Prompt tokens providers served from their prompt cache.",
+    ("runtime", "model"),
+)
+_PREWARM_SECONDS = histogram(
+    "dm_provider_prewarm_seconds",
+    "Time to connect a provider ahead of the first turn.",
+    ("runtime",),
+)
+_TURN_SECONDS = histogram(
+    "dm_turn_duration_seconds",
+    "Wall time of a whole turn, including tool calls.",
+    ("runtime", "model"),
+)
+
 _sessions: dict[str, "GameSession"] = {}
 _registry: RuntimeRegistry | None = None
 
 HIBERNATE_IDLE_SECONDS = 5 * 60
+SESSION_EVICT_SECONDS = 30 * 60
+REAPER_INTERVAL_SECONDS = 30.0
+DEFAULT_MAX_LIVE_PROVIDERS = 8
+DEFAULT_PREWARM_POOL = 0
 HANDOFF_MAX_EVENTS = 24
 HANDOFF_MAX_CHARACTERS = 12_000
 
+_reaper_task: asyncio.Task[None] | None = None
+# Provider RSS per campaign, refreshed by the reaper; the gauge reads this.
+_rss_samples: list[tuple[tuple[str], float]] = []
+# Prompt-cache rows and traces still being written after their turn ended.
+_record_writes: set[asyncio.Task[None]] = set()
+
 
 def get_runtime_registry() -> RuntimeRegistry:
     global _registry
@@ -80,19 +125,225 @@ def peek_session(campaign: str) -> "GameSession | None":
     return _sessions.get(campaign)
 
 
+def max_live_providers() -> int:
+    """Cap on connected providers from ``DND_MAX_LIVE_PROVIDERS``."""
+    try:
+        return max(1, int(os.environ.get("DND_MAX_LIVE_PROVIDERS", DEFAULT_MAX_LIVE_PROVIDERS)))
+    except ValueError:
+        return DEFAULT_MAX_LIVE_PROVIDERS
+
+
+def prewarm_on_connect() -> bool:
+    """Whether opening ``/ws/game`` starts the provider (``DND_PREWARM``)."""
+    return os.environ.get("DND_PREWARM", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def prewarm_pool_size() -> int:
+    """Recently played campaigns to connect at startup (``DND_PREWARM_POOL``)."""
+    try:
+        return max(0, int(os.environ.get("DND_PREWARM_POOL", DEFAULT_PREWARM_POOL)))
+    except ValueError:
+        return DEFAULT_PREWARM_POOL
+
+
+def live_sessions() -> list["GameSession"]:
+    return [session for session in _sessions.values() if session.provider_live]
+
+
+async def _enforce_live_cap(current: "GameSession") -> None:
+    """Hibernate least recently used idle providers so ``current`` fits the cap.
+
+    Running sessions are never evicted, so the cap is exceeded rather than a
+    turn refused when every live provider is busy.
+    """
+    others = sorted(
+        (session for session in live_sessions() if session is not current),
+        key=lambda session: session.last_active,
+    )
+    excess = len(others) + 1 - max_live_providers()
+    for session in others:
+        if excess <= 0:
+            break
+        if await session.hibernate():
+            logger.info("[%s] provider evicted (live provider cap)", session.campaign)
+            excess -= 1
+
+
+async def reap_idle_sessions(now: float | None = None) -> dict[str, list[str]]:
+    """Close providers idle past ``HIBERNATE_IDLE_SECONDS`` and drop sessions
+    idle past ``SESSION_EVICT_SECONDS`` that nobody is watching.
+
+    Dropped sessions are rebuilt on the next connection and resume from the
+    persisted ``.runtime-session.json``.
+    """
+    now = time.monotonic() if now is None else now
+    hibernated: list[str] = []
+    evicted: list[str] = []
+    for campaign, session in list(_sessions.items()):
+        idle = now - session.last_active
+        if session.running or session._mutation_lock.locked():
+            continue
+        if idle > HIBERNATE_IDLE_SECONDS and await session.hibernate():
+            hibernated.append(campaign)
+        if (
+            idle > SESSION_EVICT_SECONDS
+            and not session.running
+            and not session.provider_live
+            and broker.subscriber_count(campaign) == 0
+            and _sessions.get(campaign) is session
+        ):
+            del _sessions[campaign]
+            evicted.append(campaign)
+    return {"hibernated": hibernated, "evicted": evicted}
+
+
+async def _reaper_loop() -> None:
+    while True:
+        await asyncio.sleep(REAPER_INTERVAL_SECONDS)
+        try:
+            reaped = await reap_idle_sessions()
+            await sample_provider_rss()
+        except Exception as exc:
+            logger.error("session reaper failed: %s", exc, exc_info=True)
+            continue
+        if reaped["hibernated"] or reaped["evicted"]:
+            logger.info(
+                "reaper hibernated %s, evicted %s", reaped["hibernated"], reaped["evicted"]
+            )
+
+
+def start_session_reaper() -> None:
+    """Start the background reaper on the running event loop (idempotent)."""
+    global _reaper_task
+    if _reaper_task is None or _reaper_task.done():
+        _reaper_task = asyncio.create_task(_reaper_loop())
+
+
+async def stop_session_reaper() -> None:
+    global _reaper_task
+    task, _reaper_task = _reaper_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def _process_tree_rss_kib(root_pids: set[int]) -> dict[int, int]:
+    """Resident KiB of each root PID plus its descendants, read from /proc.
+
+    Providers spawn helpers (MCP servers, tool shells), so the whole tree is
+    attributed to the session.  Returns an empty mapping off Linux.
+    """
+    if not root_pids:
+        return {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return {}
+    page_kib = os.sysconf("SC_PAGE_SIZE") // 1024
+    children: dict[int, list[int]] = defaultdict(list)
+    rss: dict[int, int] = {}
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as handle:
+                fields = handle.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        pid = int(entry)
+        children[int(fields[1])].append(pid)
+        rss[pid] = int(fields[21]) * page_kib
+    totals = {}
+    for root in root_pids:
+        total, stack = 0, [root]
+        while stack:
+            pid = stack.pop()
+            total += rss.get(pid, 0)
+            stack.extend(children.get(pid, ()))
+        totals[root] = total
+    return totals
+
+
+async def session_stats() -> dict[str, Any]:
+    """Live-provider accounting for ``/api/sessions``.
+
+    Sessions are read on the event loop; only the ``/proc`` scan runs on a
+    worker thread.
+    """
+    sessions = sorted(_sessions.values(), key=lambda session: session.campaign)
+    now = time.monotonic()
+    entries = [
+        {
+            "campaign": session.campaign,
+            "runtime": session.runtime_id,
+            "model": session.model_name,
+            "running": session.running,
+            "provider_live": session.provider_live,
+            "idle_seconds": round(now - session.last_active, 1),
+            "subscribers": broker.subscriber_count(session.campaign),
+            "provider_pid": session.provider_pid,
+            "rss_kib": None,
+        }
+        for session in sessions
+    ]
+    live_providers = sum(session.provider_live for session in sessions)
+    pids = {entry["provider_pid"] for entry in entries if entry["provider_pid"]}
+    rss = await run_blocking(None, _process_tree_rss_kib, pids)
+    for entry in entries:
+        if entry["provider_pid"]:
+            entry["rss_kib"] = rss.get(entry["provider_pid"])
+    return {
+        "max_live_providers": max_live_providers(),
+        "live_providers": live_providers,
+        "sessions": entries,
+    }
+
+
+async def sample_provider_rss() -> None:
+    """Refresh the ``dm_provider_rss_bytes`` samples off the event loop."""
+    global _rss_samples
+    pids = {session.campaign: session.provider_pid for session in _sessions.values()}
+    pids = {campaign: pid for campaign, pid in pids.items() if pid}
+    rss = await run_blocking(None, _process_tree_rss_kib, set(pids.values()))
+    _rss_samples = [((campaign,), rss.get(pid, 0) * 1024) for campaign, pid in pids.items()]
+
+
+gauge(
+    "dm_live_providers",
+    "Game sessions with a connected provider.",
+    callback=lambda: [((), len(live_sessions()))],
+)
+gauge(
+    "dm_provider_rss_bytes",
+    "Resident memory of each live provider process tree.",
+    ("campaign",),
+    # Scraped on the event loop, so it serves the reaper's last sample.
+    callback=lambda: list(_rss_samples),
+)
+
+
+async def flush_turn_records() -> None:
+    """Wait for prompt-cache rows and turn traces that are still being written."""
+    while _record_writes:
+        await asyncio.gather(*list(_record_writes), return_exceptions=True)
+
+
 async def close_all_sessions() -> None:
     """Stop active turns and close every provider during server shutdown."""
 
+    await stop_session_reaper()
     sessions = list(_sessions.values())
     turn_tasks = [
-        session._turn_task
+        task
         for session in sessions
-        if session._turn_task is not None and not session._turn_task.done()
+        for task in (session._turn_task, session._prewarm_task)
+        if task is not None and not task.done()
     ]
     for task in turn_tasks:
         task.cancel()
     if turn_tasks:
         await asyncio.gather(*turn_tasks, return_exceptions=True)
+    await flush_turn_records()
     if sessions:
         await asyncio.gather(
             *(session.provider.close() for session in sessions),
@@ -139,7 +390,12 @@ class GameSession:
         self.running = False
         self._turn_started_at: str | None = None
         self._turn_task: asyncio.Task[None] | None = None
+        self._record_task: asyncio.Task[None] | None = None
         self._last_turn_end_at = 0.0
+        self.last_active = time.monotonic()
+        self.provider_live = False
+        self._prewarming = False
+        self._prewarm_task: asyncio.Task[bool] | None = None
         self._mutation_lock = asyncio.Lock()
         # The handoff is ignored by a successful native resume, but is ready for
         # providers that reject a stale resume token and fall back to a new thread.
@@ -184,8 +440,11 @@ class GameSession:
             and resolved_effort == self.reasoning_effort
         ):
             return False
-        if self.running or self._mutation_lock.locked():
+        if self.running or self._turn_blocked():
             raise RuntimeError("provider cannot be switched while a turn is in progress")
+        if self._prewarm_task and not self._prewarm_task.done():
+            # A background connect of the provider being replaced is moot.
+            self._prewarm_task.cancel()
         old_provider = self.provider
         resume_session_id = (
             old_provider.session_id
@@ -204,31 +463,34 @@ class GameSession:
         self.model_name = model_name
         self.reasoning_effort = resolved_effort
         self.provider = new_provider
+        self.provider_live = False
         self._history_handoff = self._build_history_handoff()
         self._persisted_session_id = resume_session_id
         asyncio.create_task(old_provider.close())
         return True
 
     def _build_history_handoff(self) -> str | None:
-        """Keep narrative continuity when a fresh provider replaces another."""
-        events = [
-            event
-            for event in read_current_session_events(self.campaign_dir)
-            if event.get("type") in {"user_message", "text"}
-            and str(event.get("content", "")).strip()
-        ][-HANDOFF_MAX_EVENTS:]
-        if not events:
-            return None
+        """Keep narrative continuity when a fresh provider replaces another.
 
-        lines = []
+        The log is read backwards and only until the transcript is full, so
+        this stays cheap however long the campaign's log has grown.
+        """
+        lines: list[str] = []
         characters = 0
-        for event in reversed(events):
+        for event in iter_current_session_events_reversed(self.campaign_dir):
+            content = str(event.get("content", "")).strip()
+            if event.get("type") not in {"user_message", "text"} or not content:
+                continue
             role = "PLAYER" if event["type"] == "user_message" else "GAME MASTER"
-            line = f"{role}: {str(event['content']).strip()}"
+            line = f"{role}: {content}"
             if lines and characters + len(line) > HANDOFF_MAX_CHARACTERS:
                 break
             lines.append(line)
             characters += len(line)
+            if len(lines) == HANDOFF_MAX_EVENTS:
+                break
+        if not lines:
+            return None
         lines.reverse()
         return (
             "\n\n<provider_handoff>\n"
@@ -243,6 +505,91 @@ class GameSession:
         model = self.registry.get_model(model_name)
         self.configure(model.runtime_id, model_name)
 
+    @property
+    def provider_pid(self) -> int | None:
+        """PID of the provider's process when it has one and it is live."""
+        if not self.provider_live:
+            return None
+        return getattr(self.provider, "process_id", None)
+
+    def _turn_blocked(self) -> bool:
+        """True while a reset, compact or hibernate holds the session.
+
+        A prewarm also holds the mutation lock, but a turn sent meanwhile
+        simply queues behind it rather than being refused.
+        """
+        return self._mutation_lock.locked() and not self._prewarming
+
+    def start_prewarm(
+        self,
+        system_prompt: str,
+        mcp_servers: Mapping[str, Any] | None = None,
+    ) -> bool:
+        """Connect the provider in the background before the first message."""
+        if (
+            self.provider_live
+            or self.running
+            or self._mutation_lock.locked()
+            or not hasattr(self.provider, "prewarm")
+        ):
+            return False
+        self._prewarm_task = asyncio.create_task(self.prewarm(system_prompt, mcp_servers))
+        return True
+
+    async def prewarm(
+        self,
+        system_prompt: str,
+        mcp_servers: Mapping[str, Any] | None = None,
+    ) -> bool:
+        """Spawn the provider process so the first turn skips its start-up.
+
+        Uses only spare capacity under the live provider cap: warming a
+        campaign nobody has played yet never evicts one somebody has.  The
+        history handoff goes into the prewarmed context and is also kept for
+        the first turn, so a stale resume that reconnects still carries it.
+        """
+        provider = self.provider
+        prewarm = getattr(provider, "prewarm", None)
+        if prewarm is None or self.provider_live or self.running or self._mutation_lock.locked():
+            return False
+        async with self._mutation_lock:
+            if self.provider_live or self.provider is not provider:
+                return False
+            if len(live_sessions()) >= max_live_providers():
+                return False
+            started = time.perf_counter()
+            self._prewarming = True
+            try:
+                await prewarm(system_prompt + (self._history_handoff or ""), mcp_servers)
+            except asyncio.CancelledError:
+                asyncio.create_task(provider.close())
+                raise
+            except Exception as exc:
+                logger.warning("[%s] provider prewarm failed: %s", self.campaign, exc)
+                asyncio.create_task(provider.close())
+                return False
+            finally:
+                self._prewarming = False
+            self.provider_live = True
+            self.last_active = time.monotonic()
+        _PREWARM_SECONDS.labels(self.runtime_id).observe(time.perf_counter() - started)
+        logger.info(
+            "[%s] provider prewarmed in %.2fs", self.campaign, time.perf_counter() - started
+        )
+        return True
+
+    async def hibernate(self) -> bool:
+        """Close an idle provider; the next turn reconnects and resumes."""
+        if not self.provider_live or self.running or self._mutation_lock.locked():
+            return False
+        async with self._mutation_lock:
+            if self.running:
+                return False
+            self._persist_provider_session()
+            await self.provider.close()
+            self.provider_live = False
+        return True
+
     def status_event(self) -> dict[str, Any]:
         return {
             "type": "agent_status",
@@ -317,15 +664,17 @@ class GameSession:
         system_prompt: str,
         mcp_servers: Mapping[str, Any] | None = None,
     ) -> bool:
-        if self.running or self._mutation_lock.locked():
+        if self.running or self._turn_blocked():
             return False
         idle_for = time.monotonic() - self._last_turn_end_at if self._last_turn_end_at else 0.0
-        append_event(self.campaign_dir, "user_message", user_message)
+        self.last_active = time.monotonic()
+        stored = append_event(self.campaign_dir, "user_message", user_message)
+        trace = TurnTrace(f"turn-{stored['id']}", self.campaign, self.runtime_id, self.model_name)
         self.running = True
         self._turn_started_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         broker.publish(self.campaign, self.status_event())
         self._turn_task = asyncio.create_task(
-            self._run_turn(user_message, system_prompt, mcp_servers, idle_for)
+            self._run_turn(user_message, system_prompt, mcp_servers, idle_for, trace)
         )
         self._turn_task.add_done_callback(self._on_turn_done)
         return True
@@ -340,22 +689,53 @@ class GameSession:
             value.get("metadata", {}) if isinstance(value.get("metadata"), Mapping) else {},
         )
 
+    def _append(
+        self,
+        trace: TurnTrace,
+        event_type: str,
+        content: str,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> dict:
+        with trace.span("append_event", "storage", type=event_type):
+            return append_event(self.campaign_dir, event_type, content, metadata=metadata)
+
+    def _broadcast(self, trace: TurnTrace, payload: dict) -> None:
+        with trace.span("broadcast", "broker", type=payload.get("type")):
+            broker.publish(self.campaign, payload)
+
     async def _run_turn(
         self,
         user_message: str,
         system_prompt: str,
         mcp_servers: Mapping[str, Any] | None,
         idle_for: float,
+        trace: TurnTrace,
     ) -> None:
+        started = time.perf_counter()
+        awaiting_first_event = True
+        awaiting_first_text = True
+        provider_start = "cold"
+        ttft: float | None = None
+        turn_usage: TurnUsage | None = None
+        outcome = "completed"
         try:
             async with self._mutation_lock:
-                if idle_for > HIBERNATE_IDLE_SECONDS:
-                    await self.provider.close()
+                trace.complete("mutation_lock", "session", started)
+                if self.provider_live and idle_for > HIBERNATE_IDLE_SECONDS:
+                    with trace.span("provider.close", "provider", reason="hibernate"):
+                        await self.provider.close()
+                    self.provider_live = False
                     logger.info("[%s] hibernated after %.0fs idle", self.campaign, idle_for)
+                provider_start = "warm" if self.provider_live else "cold"
+                if not self.provider_live:
+                    with trace.span("evict lru providers", "session"):
+                        await _enforce_live_cap(self)
+                    self.provider_live = True
                 turn_system_prompt = system_prompt
                 if self._history_handoff:
                     turn_system_prompt += self._history_handoff
                     self._history_handoff = None
+                provider_started = time.perf_counter()
                 async for raw_event in self.provider.process_message(
                     user_message=user_message,
                     system_prompt=turn_system_prompt,
@@ -363,43 +743,68 @@ class GameSession:
                     mcp_servers=mcp_servers,
                 ):
                     event = self._event(raw_event)
+                    if awaiting_first_event:
+                        # Connection setup is internal to providers; its upper
+                        # bound is the wait for their first event.
+                        awaiting_first_event = False
+                        trace.complete("provider.connect", "provider", provider_started)
                     self._persist_provider_session()
+                    if awaiting_first_text and event.type in {"text_delta", "text"}:
+                        awaiting_first_text = False
+                        trace.instant("first token", "provider")
+                        ttft = time.perf_counter() - started
+                        _TURN_TTFT_SECONDS.labels(
+                            self.runtime_id, self.model_name, provider_start
+                        ).observe(ttft)
+                    if event.type == "tool_use":
+                        trace.tool_started(
+                            str(event.metadata.get("tool_use_id") or ""),
+                            str(event.metadata.get("short_name") or "tool"),
+                            event.content,
+                        )
+                    elif event.type == "tool_result":
+                        trace.tool_finished(
+                            str(event.metadata.get("tool_use_id") or ""),
+                            is_error=bool(event.metadata.get("is_error")),
+                        )
                     if event.type == "text_delta":
+                        # Deltas arrive per token; one span each would dwarf the
+                        # trace, so their broadcast cost is summed on the turn.
+                        published = time.perf_counter()
                         broker.publish(self.campaign, {"type": "stream", "content": event.content})
+                        trace.stream_deltas += 1
+                        trace.stream_publish_seconds += time.perf_counter() - published
                     elif event.type in {"text", "error"}:
-                        stored = append_event(self.campaign_dir, event.type, event.content)
-                        broker.publish(self.campaign, stored)
+                        stored = self._append(trace, event.type, event.content)
+                        self._broadcast(trace, stored)
                     elif event.type in {"tool_use", "tool_result", "thinking", "file_change", "activity"}:
                         metadata = dict(event.metadata)
                         metadata["activity_type"] = event.type
-                        stored = append_event(
-                            self.campaign_dir,
-                            "activity",
-                            event.content,
-                            metadata=metadata,
-                        )
-                        broker.publish(self.campaign, stored)
+                        stored = self._append(trace, "activity", event.content, metadata)
+                        self._broadcast(trace, stored)
                     elif event.type == "image":
                         try:
-                            published = store_generated_image(
-                                self.campaign_dir,
-                                source_path=event.metadata.get("source_path"),
-                                data_url=event.metadata.get("data_url"),
-                            )
+                            with trace.span("store_generated_image", "media"):
+                                published = store_generated_image(
+                                    self.campaign_dir,
+                                    source_path=event.metadata.get("source_path"),
+                                    data_url=event.metadata.get("data_url"),
+                                )
                         except (OSError, ValueError) as exc:
                             logger.error("[%s] generated image rejected: %s", self.campaign, exc)
-                            stored = append_event(
-                                self.campaign_dir,
+                            stored = self._append(
+                                trace,
                                 "error",
                                 "Generated cinematic image could not be published",
                             )
-                            broker.publish(self.campaign, stored)
+                            self._broadcast(trace, stored)
                             continue
-                        stored = append_event(
-                            self.campaign_dir,
+                        schedule_variants(self.campaign_dir, published.filename)
+                        stored = self._append(
+                            trace,
                             "image",
                             str(event.metadata.get("alt") or "Cinematic campaign scene"),
-                            metadata={
+                            {
                                 "url": (
                                     f"/api/campaigns/{quote(self.campaign, safe='')}"
                                     f"/media/{published.filename}"
@@ -408,24 +813,36 @@ class GameSession:
                                 "size": published.size,
                             },
                         )
-                        broker.publish(self.campaign, stored)
+                        self._broadcast(trace, stored)
                     elif event.type == "rate_limit":
                         payload = event.to_dict()
                         payload.update(event.metadata)
-                        broker.publish(self.campaign, payload)
-                    elif event.type != "turn_end":
-                        broker.publish(self.campaign, event.to_dict())
+                        self._broadcast(trace, payload)
+                    elif event.type == "turn_end":
+                        turn_usage = TurnUsage.from_metadata(event.metadata) or turn_usage
+                    else:
+                        self._broadcast(trace, event.to_dict())
         except asyncio.CancelledError:
+            outcome = "cancelled"
             raise
         except Exception as exc:
+            outcome = "failed"
             logger.error("[%s] turn failed: %s", self.campaign, exc, exc_info=True)
-            stored = append_event(self.campaign_dir, "error", str(exc))
-            broker.publish(self.campaign, stored)
+            stored = self._append(trace, "error", str(exc))
+            self._broadcast(trace, stored)
         finally:
+            duration = time.perf_counter() - started
+            _TURN_SECONDS.labels(self.runtime_id, self.model_name).observe(duration)
+            cache_row = None
+            if turn_usage is not None:
+                cache_row = self._prompt_cache_row(
+                    trace, turn_usage, ttft, duration, provider_start, outcome
+                )
             self._persist_provider_session()
             self.running = False
             self._turn_started_at = None
             self._last_turn_end_at = time.monotonic()
+            self.last_active = self._last_turn_end_at
             usage = self.provider.get_context_usage()
             if usage:
                 broker.publish(
@@ -434,6 +851,87 @@ class GameSession:
                 )
             broker.publish(self.campaign, self.status_event())
             broker.publish(self.campaign, {"type": "done"})
+            # Published first: once running is False the next turn may start,
+            # and a late "done" would end that turn in the client.
+            self._spawn_record_write(
+                trace,
+                cache_row,
+                {
+                    "outcome": outcome,
+                    "provider_start": provider_start,
+                    **(turn_usage.to_dict() if turn_usage else {}),
+                },
+            )
+
+    def _prompt_cache_row(
+        self,
+        trace: TurnTrace,
+        usage: TurnUsage,
+        ttft: float | None,
+        duration: float,
+        provider_start: str,
+        outcome: str,
+    ) -> dict[str, Any]:
+        _PROMPT_INPUT_TOKENS.labels(self.runtime_id, self.model_name).inc(usage.input_tokens)
+        _PROMPT_CACHED_TOKENS.labels(self.runtime_id, self.model_name).inc(
+            usage.cached_input_tokens
+        )
+        return {
+            "turn": trace.trace_id,
+            "at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "runtime": self.runtime_id,
+            "model": self.model_name,
+            "provider_start": provider_start,
+            "outcome": outcome,
+            **usage.to_dict(),
+            "cache_hit_ratio": round(usage.cache_hit_ratio, 4),
+            "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None,
+            "duration_ms": round(duration * 1000, 1),
+        }
+
+    def _spawn_record_write(
+        self,
+        trace: TurnTrace,
+        cache_row: dict[str, Any] | None,
+        turn_args: dict[str, Any],
+    ) -> None:
+        """Write the turn's records off the event loop without holding up the turn."""
+        task = asyncio.create_task(
+            self._write_after(self._record_task, trace, cache_row, turn_args)
+        )
+        self._record_task = task
+        _record_writes.add(task)
+        task.add_done_callback(_record_writes.discard)
+
+    async def _write_after(
+        self,
+        previous: asyncio.Task[None] | None,
+        trace: TurnTrace,
+        cache_row: dict[str, Any] | None,
+        turn_args: dict[str, Any],
+    ) -> None:
+        # Appending the report may rewrite it when trimming, so one session's
+        # writes run in turn order.
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        await run_blocking(None, self._write_turn_records, trace, cache_row, turn_args)
+
+    def _write_turn_records(
+        self,
+        trace: TurnTrace,
+        cache_row: dict[str, Any] | None,
+        turn_args: dict[str, Any],
+    ) -> None:
+        """Append the prompt-cache row and save the trace; runs on a worker thread."""
+        if cache_row is not None:
+            try:
+                record_turn(self.campaign_dir, cache_row)
+            except OSError as exc:
+                logger.warning("[%s] prompt cache row not saved: %s", self.campaign, exc)
+        try:
+            save_trace(self.campaign_dir, trace, **turn_args)
+        except OSError as exc:
+            logger.warning("[%s] turn trace not saved: %s", self.campaign, exc)
 
     def _persist_provider_session(self) -> None:
         session_id = self.provider.session_id
@@ -2,27 +2,68 @@
 
 Uses WorldGraph to read data from world.json and caches results
 to minimize disk operations during frequent requests (e.g. sidebar updates).
+Entries are validated against the world revision and the identity of the
+files they were built from, so a hit is always exact and never expires.
 """
 
 import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
 
 from backend.campaign_views import inventory_items, player_location
+from backend.view_cache import file_stamp, world_revision
 
 # Add lib/ to path for world_graph import
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
 try:
     from world_graph import WorldGraph
+    # Same module object WorldGraph commits through, so its hooks fire here.
+    from world_repository import add_commit_listener
 except ImportError:
     WorldGraph = None
+    add_commit_listener = None
 
 
-# Character state cache, isolated by resolved campaign directory.
-_character_cache: Dict[str, tuple[datetime, Dict]] = {}
-_cache_ttl = timedelta(seconds=5)  # Cache valid for 5 seconds
+# Character state cache, isolated by resolved campaign directory and kept in
+# least-recently-used order: {campaign_dir: (validator, status)}.
+_CACHE_LIMIT = 64
+_cache_lock = threading.Lock()
+_character_cache: "OrderedDict[str, tuple[tuple, Dict]]" = OrderedDict()
+
+
+def _validator(campaign_dir: Path) -> tuple:
+    """Revision plus stamps of every file the status is derived from."""
+    revision, world_stamp = world_revision(campaign_dir)
+    return revision, world_stamp, file_stamp(campaign_dir / "campaign-overview.json")
+
+
+def _cached_status(cache_key: str, validator: tuple) -> Optional[Dict]:
+    with _cache_lock:
+        cached = _character_cache.get(cache_key)
+        if cached is None or cached[0] != validator:
+            return None
+        _character_cache.move_to_end(cache_key)
+        return cached[1]
+
+
+def _store_status(cache_key: str, validator: tuple, status: Dict) -> None:
+    with _cache_lock:
+        _character_cache[cache_key] = (validator, status)
+        _character_cache.move_to_end(cache_key)
+        while len(_character_cache) > _CACHE_LIMIT:
+            _character_cache.popitem(last=False)
+
+
+def _on_world_commit(world_file: Path, _revision: int) -> None:
+    with _cache_lock:
+        _character_cache.pop(str(Path(world_file).parent.resolve()), None)
+
+
+if add_commit_listener is not None:
+    add_commit_listener(_on_world_commit)
 
 
 def get_character_status(campaign_dir: Optional[Path] = None, force_refresh: bool = False) -> Dict:
@@ -30,7 +71,7 @@ def get_character_status(campaign_dir: Optional[Path] = None, force_refresh: boo
 
     Args:
         campaign_dir: Path to campaign directory (optional)
-        force_refresh: Force cache refresh (ignore TTL)
+        force_refresh: Rebuild even if the cached entry is still current
 
     Returns:
         Dict with keys:
@@ -45,14 +86,6 @@ def get_character_status(campaign_dir: Optional[Path] = None, force_refresh: boo
         Or Dict with error key if error occurred:
             - error (str): Error description
     """
-    cache_key = str(Path(campaign_dir).resolve()) if campaign_dir else None
-
-    # Check cache
-    if not force_refresh and cache_key and cache_key in _character_cache:
-        cached_at, cached_result = _character_cache[cache_key]
-        if datetime.now() - cached_at < _cache_ttl:
-            return cached_result
-
     # WorldGraph not available
     if WorldGraph is None:
         return {
@@ -77,6 +110,15 @@ def get_character_status(campaign_dir: Optional[Path] = None, force_refresh: boo
                     "error": f"Failed to initialize WorldGraph: {str(e)}"
                 }
 
+        # Captured before reading, so a concurrent write can only make the
+        # stored entry look stale, never make a stale entry look current.
+        cache_key = str(graph.campaign_dir.resolve())
+        validator = _validator(graph.campaign_dir)
+        if not force_refresh:
+            cached = _cached_status(cache_key, validator)
+            if cached is not None:
+                return cached
+
         # Find player node (first node of type "player")
         players = graph.list_nodes(node_type="player")
         if not players:
@@ -132,9 +174,7 @@ def get_character_status(campaign_dir: Optional[Path] = None, force_refresh: boo
         if location:
             result["location"] = location
 
-        # Save to cache
-        cache_key = str(graph.campaign_dir.resolve())
-        _character_cache[cache_key] = (datetime.now(), result)
+        _store_status(cache_key, validator, result)
 
         return result
 
@@ -147,10 +187,11 @@ def get_character_status(campaign_dir: Optional[Path] = None, force_refresh: boo
 def invalidate_cache() -> None:
     """Invalidate character state cache.
 
-    Called after executing tools that modify character state
-    (HP changes, add/remove items, gain XP, spend gold).
+    Entries already follow the world revision; this is for tests and for
+    callers that want to release the memory.
     """
-    _character_cache.clear()
+    with _cache_lock:
+        _character_cache.clear()
 
 
 def get_inventory(campaign_dir: Optional[Path] = None) -> List[Dict]:
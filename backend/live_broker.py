@@ -8,8 +8,14 @@ Single process only (in-memory, no cross-worker fanout — matches uvicorn singl
 import asyncio
 from collections import defaultdict
 
+from lib.metrics import counter, gauge
+
 _MAXSIZE = 256  # per-subscriber backlog; drop-oldest beyond this
 
+_DROPPED = counter(
+    "dm_broker_dropped_events", "Events dropped from full subscriber queues."
+).labels()
+
 
 class LiveBroker:
     def __init__(self) -> None:
@@ -32,6 +38,7 @@ class LiveBroker:
             if q.full():
                 try:
                     q.get_nowait()  # drop oldest — partials are ephemeral
+                    _DROPPED.inc()
                 except asyncio.QueueEmpty:
                     pass
             try:
@@ -39,5 +46,32 @@ class LiveBroker:
             except asyncio.QueueFull:
                 pass
 
+    def subscriber_count(self, campaign: str) -> int:
+        return len(self._subs.get(campaign, ()))
+
+    def queue_depths(self) -> list[tuple[tuple[str], int]]:
+        """Deepest subscriber backlog per campaign — the slowest connection."""
+        return [
+            ((campaign,), max((q.qsize() for q in subs), default=0))
+            for campaign, subs in list(self._subs.items())
+        ]
+
+    def subscriber_counts(self) -> list[tuple[tuple[str], int]]:
+        return [((campaign,), len(subs)) for campaign, subs in list(self._subs.items())]
+
 
 broker = LiveBroker()
+
+# Sampled when /api/metrics renders; publishing pays nothing for them.
+gauge(
+    "dm_broker_queue_depth",
+    "Deepest subscriber backlog per campaign.",
+    ("campaign",),
+    callback=broker.queue_depths,
+)
+gauge(
+    "dm_broker_subscribers",
+    "Live WebSocket subscribers per campaign.",
+    ("campaign",),
+    callback=broker.subscriber_counts,
+)
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import hashlib
 import importlib.util
 import json
+import math
+import os
+import tempfile
+import threading
 from pathlib import Path
 from types import ModuleType
 from typing import Any
 
+from backend.view_cache import campaign_etag
+
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 WORLD_TRAVEL_LIB = (
@@ -33,6 +40,19 @@ WorldTravelStore = _store_module.WorldTravelStore
 get_unique_edges = _connections_module.get_unique_edges
 compute_layout = _layout_module.compute_layout
 
+WORLD_TRAVEL_DATA = "module-data/world-travel.json"
+LAYOUT_CACHE_FILE = ".map-layouts.json"
+_LAYOUT_WIDTH = 800
+_LAYOUT_HEIGHT = 600
+_LAYOUT_MARGIN = 40
+# Persisted layouts are only reused by the layout code that produced them.
+_LAYOUT_VERSION = hashlib.sha256(
+    Path(_layout_module.__file__).read_bytes()
+).hexdigest()[:16]
+
+_layout_lock = threading.Lock()
+_layout_stores: dict[str, dict[str, dict[str, Any]]] = {}
+
 
 def _empty_snapshot(enabled: bool) -> dict[str, Any]:
     return {
@@ -217,15 +237,158 @@ def _connection_projection(
     return sorted(result, key=lambda edge: (edge["source"], edge["target"]))
 
 
+def _layout_key(
+    names: list[str],
+    edges: list[tuple[str, str]],
+    entry_points: list[str],
+) -> str:
+    payload = json.dumps(
+        [_LAYOUT_VERSION, _LAYOUT_WIDTH, _LAYOUT_HEIGHT, names, edges, entry_points],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_layout_store(campaign_path: Path) -> dict[str, dict[str, Any]]:
+    """Return the campaign's layout cache, reading the persisted copy once."""
+    key = str(campaign_path.resolve())
+    with _layout_lock:
+        store = _layout_stores.get(key)
+    if store is not None:
+        return store
+    try:
+        loaded = json.loads((campaign_path / LAYOUT_CACHE_FILE).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        loaded = {}
+    store = {}
+    if isinstance(loaded, dict) and loaded.get("version") == _LAYOUT_VERSION:
+        compounds = loaded.get("compounds")
+        if isinstance(compounds, dict):
+            store = {
+                name: entry
+                for name, entry in compounds.items()
+                if isinstance(entry, dict) and isinstance(entry.get("layout"), dict)
+            }
+    with _layout_lock:
+        return _layout_stores.setdefault(key, store)
+
+
+def _save_layout_store(campaign_path: Path, store: dict[str, dict[str, Any]]) -> None:
+    """Persist layouts next to the campaign; a failed write only costs speed."""
+    payload = {"version": _LAYOUT_VERSION, "compounds": store}
+    try:
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f"{LAYOUT_CACHE_FILE}.", suffix=".tmp", dir=campaign_path
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_name, campaign_path / LAYOUT_CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError:
+        pass
+
+
+def _place_added_location(
+    name: str,
+    neighbours: list[str],
+    positions: dict[str, dict[str, float]],
+) -> dict[str, float]:
+    """Relax one new location against fixed existing positions.
+
+    Existing rooms keep their coordinates, so a discovery does not reshuffle
+    a map the player has already learned.  The new room starts at the
+    centroid of the rooms it connects to and settles under the same
+    attraction/repulsion balance a force layout uses.
+    """
+    low_x, high_x = _LAYOUT_MARGIN, _LAYOUT_WIDTH - _LAYOUT_MARGIN
+    low_y, high_y = _LAYOUT_MARGIN, _LAYOUT_HEIGHT - _LAYOUT_MARGIN
+    anchors = [positions[other] for other in neighbours if other in positions]
+    if anchors:
+        x = sum(anchor["x"] for anchor in anchors) / len(anchors)
+        y = sum(anchor["y"] for anchor in anchors) / len(anchors)
+    else:
+        x, y = _LAYOUT_WIDTH / 2, _LAYOUT_HEIGHT / 2
+    # Deterministic nudge so the start never coincides with an anchor.
+    angle = int(hashlib.sha256(name.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+    x += math.cos(angle * math.tau) * 10
+    y += math.sin(angle * math.tau) * 10
+    ideal = math.sqrt(
+        (high_x - low_x) * (high_y - low_y) / (len(positions) + 1)
+    )
+    step = ideal / 2
+    for _ in range(60):
+        force_x = force_y = 0.0
+        for other, position in positions.items():
+            dx = x - position["x"]
+            dy = y - position["y"]
+            distance = max(math.hypot(dx, dy), 1.0)
+            push = ideal * ideal / distance
+            if other in neighbours:
+                push -= distance * distance / ideal
+            force_x += dx / distance * push
+            force_y += dy / distance * push
+        magnitude = math.hypot(force_x, force_y)
+        if magnitude > 0:
+            x += force_x / magnitude * min(step, magnitude)
+            y += force_y / magnitude * min(step, magnitude)
+        x = min(high_x, max(low_x, x))
+        y = min(high_y, max(low_y, y))
+        step *= 0.93
+    return {"x": round(x, 3), "y": round(y, 3)}
+
+
+def _warm_layout(
+    previous: dict[str, Any] | None,
+    names: list[str],
+    edges: list[tuple[str, str]],
+    entry_points: list[str],
+) -> dict[str, dict[str, float]] | None:
+    """Extend ``previous`` when exactly one location and its links were added."""
+    if not previous or previous.get("entry_points") != entry_points:
+        return None
+    old_names = previous.get("names") or []
+    added = sorted(set(names) - set(old_names))
+    if len(added) != 1 or len(names) != len(old_names) + 1:
+        return None
+    new_name = added[0]
+    old_edges = {tuple(edge) for edge in previous.get("edges") or []}
+    new_edges = set(edges)
+    if not old_edges <= new_edges or any(
+        new_name not in edge for edge in new_edges - old_edges
+    ):
+        return None
+    layout = dict(previous["layout"])
+    if set(layout) != set(old_names):
+        return None
+    neighbours = [
+        target if source == new_name else source
+        for source, target in edges
+        if new_name in (source, target)
+    ]
+    layout[new_name] = _place_added_location(new_name, neighbours, layout)
+    return {name: layout[name] for name in sorted(layout)}
+
+
 def _interior_layouts(
     locations: dict[str, dict[str, Any]],
     children: dict[str, list[str]],
     connections: list[dict[str, Any]],
+    campaign_path: Path,
 ) -> dict[str, dict[str, dict[str, float]]]:
+    """Lay out every visible compound, reusing cached and persisted layouts.
+
+    Layouts are keyed by a hash of the compound's visible rooms, interior
+    connections and entry points; only compounds whose key changed are laid
+    out again, and a single discovered room is placed around the previous
+    layout instead of recomputing it.
+    """
     layouts: dict[str, dict[str, dict[str, float]]] = {}
-    # The legacy layout cache omits entry points from its key. Clear it so two
-    # campaigns with the same room graph cannot reuse a differently-oriented map.
-    _layout_module._cache.clear()
+    store = _load_layout_store(campaign_path)
+    updated = dict(store)
     edge_pairs = {
         tuple(sorted((edge["source"], edge["target"])))
         for edge in connections
@@ -237,6 +400,7 @@ def _interior_layouts(
         if locations[compound].get("type") != "compound":
             continue
         child_set = set(compound_children)
+        names = sorted(compound_children)
         interior_edges = sorted(
             pair
             for pair in edge_pairs
@@ -247,23 +411,52 @@ def _interior_layouts(
             for entry in locations[compound].get("entry_points", [])
             if entry in child_set
         )
-        raw_layout = compute_layout(
-            sorted(compound_children),
-            interior_edges,
-            entry_points=entry_points,
-            width=800,
-            height=600,
-        )
-        layouts[compound] = {
-            name: {
-                "x": round(float(raw_layout[name]["x"]), 3),
-                "y": round(float(raw_layout[name]["y"]), 3),
+        key = _layout_key(names, interior_edges, entry_points)
+        previous = store.get(compound)
+        if previous and previous.get("key") == key:
+            layouts[compound] = previous["layout"]
+            continue
+        layout = _warm_layout(previous, names, interior_edges, entry_points)
+        if layout is None:
+            # The legacy layout cache omits entry points from its key. Clear it
+            # so two campaigns with the same room graph cannot reuse a
+            # differently-oriented map.
+            _layout_module._cache.clear()
+            raw_layout = compute_layout(
+                names,
+                interior_edges,
+                entry_points=entry_points,
+                width=_LAYOUT_WIDTH,
+                height=_LAYOUT_HEIGHT,
+            )
+            layout = {
+                name: {
+                    "x": round(float(raw_layout[name]["x"]), 3),
+                    "y": round(float(raw_layout[name]["y"]), 3),
+                }
+                for name in sorted(raw_layout)
             }
-            for name in sorted(raw_layout)
+        layouts[compound] = layout
+        updated[compound] = {
+            "key": key,
+            "names": names,
+            "edges": [list(edge) for edge in interior_edges],
+            "entry_points": entry_points,
+            "layout": layout,
         }
+    if updated != store:
+        with _layout_lock:
+            _layout_stores[str(campaign_path.resolve())] = updated
+        _save_layout_store(campaign_path, updated)
     return layouts
 
 
+def clear_layout_cache() -> None:
+    """Forget in-memory layouts; persisted files are read again on demand."""
+    with _layout_lock:
+        _layout_stores.clear()
+
+
 def get_map_snapshot(campaign_dir: str | Path) -> dict[str, Any]:
     """Return a JSON-safe, read-only map view for one campaign."""
     campaign_path = Path(campaign_dir)
@@ -364,5 +557,224 @@ def get_map_snapshot(campaign_dir: str | Path) -> dict[str, Any]:
         visible_locations,
         children,
         snapshot["connections"],
+        campaign_path,
     )
     return _json_safe(snapshot)
+
+
+# ─────────────────────────── Viewport queries ─────────────────────────────────
+
+GRID_DIVISIONS = 64
+DETAIL_NODE_LIMIT = 400
+MAX_ZOOM = 24
+
+BBox = tuple[float, float, float, float]
+
+
+class MapIndex:
+    """Uniform grid over the coordinates of one snapshot's top-level nodes.
+
+    Only locations without a visible parent are placed on the world map;
+    interiors are drawn from their compound's layout instead.
+    """
+
+    def __init__(self, snapshot: dict[str, Any]):
+        self.snapshot = snapshot
+        self.nodes = {node["id"]: node for node in snapshot["nodes"]}
+        self.placed = [
+            node
+            for node in snapshot["nodes"]
+            if node["parent"] is None and node["coordinates"] is not None
+        ]
+        if self.placed:
+            xs = [node["coordinates"]["x"] for node in self.placed]
+            ys = [node["coordinates"]["y"] for node in self.placed]
+            self.bounds: BBox = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            self.bounds = (0.0, 0.0, 0.0, 0.0)
+        extent = max(self.bounds[2] - self.bounds[0], self.bounds[3] - self.bounds[1])
+        self.cell_size = max(extent / GRID_DIVISIONS, 1.0)
+        self._cells: dict[tuple[int, int], list[dict[str, Any]]] = {}
+        for node in self.placed:
+            self._cells.setdefault(self._cell(node["coordinates"]), []).append(node)
+        self._descendants: dict[str, list[str]] = {}
+        for node in snapshot["nodes"]:
+            self._descendants[node["id"]] = list(node["children"])
+
+    def _cell(self, coordinates: dict[str, float]) -> tuple[int, int]:
+        return (
+            math.floor((coordinates["x"] - self.bounds[0]) / self.cell_size),
+            math.floor((coordinates["y"] - self.bounds[1]) / self.cell_size),
+        )
+
+    def nodes_in(self, bbox: BBox) -> list[dict[str, Any]]:
+        """Placed nodes inside ``bbox`` (inclusive), in snapshot order."""
+        min_x, min_y, max_x, max_y = bbox
+        low = self._cell({"x": max(min_x, self.bounds[0]), "y": max(min_y, self.bounds[1])})
+        high = self._cell({"x": min(max_x, self.bounds[2]), "y": min(max_y, self.bounds[3])})
+        found = []
+        for cell_x in range(low[0], high[0] + 1):
+            for cell_y in range(low[1], high[1] + 1):
+                for node in self._cells.get((cell_x, cell_y), ()):
+                    x = node["coordinates"]["x"]
+                    y = node["coordinates"]["y"]
+                    if min_x <= x <= max_x and min_y <= y <= max_y:
+                        found.append(node)
+        return sorted(found, key=lambda node: node["id"])
+
+    def with_descendants(self, names: list[str]) -> list[str]:
+        ordered = []
+        seen: set[str] = set()
+        pending = list(reversed(names))
+        while pending:
+            name = pending.pop()
+            if name in seen or name not in self.nodes:
+                continue
+            seen.add(name)
+            ordered.append(name)
+            pending.extend(reversed(self._descendants.get(name, [])))
+        return ordered
+
+
+def _cluster(
+    nodes: list[dict[str, Any]],
+    bounds: BBox,
+    cell_size: float,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], dict[str, str]]:
+    """Group nodes per ``cell_size`` square; lone nodes stay individual."""
+    cells: dict[tuple[int, int], list[dict[str, Any]]] = {}
+    for node in nodes:
+        key = (
+            math.floor((node["coordinates"]["x"] - bounds[0]) / cell_size),
+            math.floor((node["coordinates"]["y"] - bounds[1]) / cell_size),
+        )
+        cells.setdefault(key, []).append(node)
+    singles: list[dict[str, Any]] = []
+    clusters: list[dict[str, Any]] = []
+    marker_of: dict[str, str] = {}
+    for (cell_x, cell_y), members in sorted(cells.items()):
+        if len(members) == 1:
+            singles.append(members[0])
+            marker_of[members[0]["id"]] = members[0]["id"]
+            continue
+        xs = [member["coordinates"]["x"] for member in members]
+        ys = [member["coordinates"]["y"] for member in members]
+        cluster_id = f"cluster:{cell_x}:{cell_y}"
+        names = sorted(member["name"] for member in members)
+        clusters.append(
+            {
+                "id": cluster_id,
+                "count": len(members),
+                "coordinates": {
+                    "x": round(sum(xs) / len(xs), 3),
+                    "y": round(sum(ys) / len(ys), 3),
+                },
+                "bbox": [min(xs), min(ys), max(xs), max(ys)],
+                "sample": names[:3],
+            }
+        )
+        for member in members:
+            marker_of[member["id"]] = cluster_id
+    return singles, clusters, marker_of
+
+
+def _viewport_from_index(
+    index: MapIndex,
+    bbox: BBox | None,
+    zoom: int,
+) -> dict[str, Any]:
+    snapshot = index.snapshot
+    bbox = bbox or index.bounds
+    current = snapshot["current"]
+    pinned = [name for name in snapshot["breadcrumb"][1:] if name in index.nodes]
+    in_view = index.nodes_in(bbox)
+    extent = max(index.bounds[2] - index.bounds[0], index.bounds[3] - index.bounds[1])
+    clustered = len(in_view) > DETAIL_NODE_LIMIT
+    clusters: list[dict[str, Any]] = []
+    cluster_links: list[dict[str, Any]] = []
+    if clustered:
+        cell_size = max(extent, 1.0) / (8 * 2 ** zoom)
+        singles, clusters, marker_of = _cluster(in_view, index.bounds, cell_size)
+        names = [node["id"] for node in singles]
+        link_counts: dict[tuple[str, str], int] = {}
+        for edge in snapshot["connections"]:
+            source = marker_of.get(edge["source"])
+            target = marker_of.get(edge["target"])
+            if source and target and source != target and (
+                source.startswith("cluster:") or target.startswith("cluster:")
+            ):
+                pair = tuple(sorted((source, target)))
+                link_counts[pair] = link_counts.get(pair, 0) + 1
+        cluster_links = [
+            {"source": source, "target": target, "count": count}
+            for (source, target), count in sorted(link_counts.items())
+        ]
+    else:
+        names = index.with_descendants([node["id"] for node in in_view])
+    selected = dict.fromkeys([*names, *pinned])
+    nodes = [index.nodes[name] for name in sorted(selected)]
+    connections = [
+        edge
+        for edge in snapshot["connections"]
+        if edge["source"] in selected and edge["target"] in selected
+    ]
+    return {
+        "enabled": snapshot["enabled"],
+        "current": current,
+        "breadcrumb": snapshot["breadcrumb"],
+        "viewport": {
+            "bbox": list(bbox),
+            "zoom": zoom,
+            "bounds": list(index.bounds),
+            "clustered": clustered,
+            "total_nodes": len(index.placed),
+        },
+        "nodes": nodes,
+        "connections": connections,
+        "clusters": clusters,
+        "cluster_links": cluster_links,
+        "layouts": {
+            name: layout
+            for name, layout in snapshot["layouts"].items()
+            if name in selected
+        },
+    }
+
+
+_index_lock = threading.Lock()
+_map_indexes: dict[str, tuple[str, MapIndex]] = {}
+
+
+def get_map_index(campaign_dir: str | Path) -> MapIndex:
+    """Return the grid index for the campaign's current map revision."""
+    campaign_path = Path(campaign_dir)
+    token = campaign_etag("map", campaign_path, (WORLD_TRAVEL_DATA,))
+    key = str(campaign_path.resolve())
+    with _index_lock:
+        cached = _map_indexes.get(key)
+    if cached and cached[0] == token:
+        return cached[1]
+    index = MapIndex(get_map_snapshot(campaign_path))
+    with _index_lock:
+        _map_indexes[key] = (token, index)
+    return index
+
+
+def get_map_viewport(
+    campaign_dir: str | Path,
+    bbox: BBox | None = None,
+    zoom: int = 0,
+) -> dict[str, Any]:
+    """Return the part of the map inside ``bbox`` at level of detail ``zoom``.
+
+    Up to ``DETAIL_NODE_LIMIT`` placed locations are returned individually,
+    with their interiors and layouts.  Denser views are aggregated into
+    cluster markers whose cell size halves with every zoom level; locations
+    alone in their cell stay individual.  The player's current location chain
+    is always included.
+    """
+    if bbox is not None and (bbox[0] > bbox[2] or bbox[1] > bbox[3]):
+        raise ValueError("bbox must be min_x,min_y,max_x,max_y")
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise ValueError(f"zoom must be between 0 and {MAX_ZOOM}")
+    return _viewport_from_index(get_map_index(campaign_dir), bbox, zoom)
@@ -10,9 +10,14 @@ import re
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
 
 MEDIA_DIRNAME = "media"
 MAX_IMAGE_BYTES = 32 * 1024 * 1024
+# Images are decoded, hashed and written this many bytes at a time.
+CHUNK_BYTES = 1024 * 1024
+_BASE64_CHUNK = CHUNK_BYTES // 3 * 4
+_SNIFF_BYTES = 12
 _MEDIA_NAME = re.compile(r"^[0-9a-f]{32}\.(?:png|jpe?g|webp|gif)$")
 
 
@@ -35,36 +40,73 @@ def _image_format(data: bytes) -> tuple[str, str] | None:
     return None
 
 
-def _decode_data_url(data_url: str) -> bytes:
-    header, separator, encoded = data_url.partition(",")
+class IncrementalBase64Decoder:
+    """Decode base64 text fed in arbitrary pieces, one aligned block at a time.
+
+    Only the up to three characters that do not yet complete a 4-character
+    group are carried between calls, so memory does not grow with the input.
+    """
+
+    def __init__(self) -> None:
+        self._carry = b""
+
+    def feed(self, text: bytes) -> bytes:
+        data = self._carry + text
+        aligned = len(data) - len(data) % 4
+        self._carry = data[aligned:]
+        return self._decode(data[:aligned])
+
+    def finish(self) -> bytes:
+        carry, self._carry = self._carry, b""
+        return self._decode(carry)
+
+    @staticmethod
+    def _decode(data: bytes) -> bytes:
+        try:
+            return base64.b64decode(data, validate=True)
+        except (ValueError, binascii.Error) as exc:
+            raise ValueError("generated image contains invalid base64 data") from exc
+
+
+def _data_url_chunks(data_url: str) -> Iterator[bytes]:
+    header, separator, _encoded = data_url.partition(",")
     if not separator or not header.lower().startswith("data:image/"):
         raise ValueError("generated image result is not an image data URL")
     if ";base64" not in header.lower():
         raise ValueError("generated image data URL must use base64 encoding")
+    decoder = IncrementalBase64Decoder()
+    start = len(header) + 1
+    for offset in range(start, len(data_url), _BASE64_CHUNK):
+        try:
+            text = data_url[offset:offset + _BASE64_CHUNK].encode("ascii")
+        except UnicodeEncodeError as exc:
+            raise ValueError("generated image contains invalid base64 data") from exc
+        yield decoder.feed(text)
+    yield decoder.finish()
+
+
+def _file_chunks(source_path: str | Path) -> Iterator[bytes]:
+    source = Path(source_path).expanduser()
     try:
-        return base64.b64decode(encoded, validate=True)
-    except (ValueError, binascii.Error) as exc:
-        raise ValueError("generated image contains invalid base64 data") from exc
+        handle = source.open("rb")
+    except OSError as exc:
+        raise ValueError(f"generated image file is unavailable: {source}") from exc
+    with handle:
+        while True:
+            try:
+                chunk = handle.read(CHUNK_BYTES)
+            except OSError as exc:
+                raise ValueError(f"generated image file cannot be read: {source}") from exc
+            if not chunk:
+                return
+            yield chunk
 
 
-def _read_image(source_path: str | Path | None, data_url: str | None) -> bytes:
+def _image_chunks(source_path: str | Path | None, data_url: str | None) -> Iterator[bytes]:
     if source_path:
-        source = Path(source_path).expanduser()
-        try:
-            size = source.stat().st_size
-        except OSError as exc:
-            raise ValueError(f"generated image file is unavailable: {source}") from exc
-        if size <= 0 or size > MAX_IMAGE_BYTES:
-            raise ValueError("generated image file has an invalid size")
-        try:
-            return source.read_bytes()
-        except OSError as exc:
-            raise ValueError(f"generated image file cannot be read: {source}") from exc
+        return _file_chunks(source_path)
     if data_url:
-        data = _decode_data_url(data_url)
-        if not data or len(data) > MAX_IMAGE_BYTES:
-            raise ValueError("generated image data has an invalid size")
-        return data
+        return _data_url_chunks(data_url)
     raise ValueError("generated image has neither a saved path nor image data")
 
 
@@ -74,39 +116,51 @@ def store_generated_image(
     source_path: str | Path | None = None,
     data_url: str | None = None,
 ) -> PublishedImage:
-    """Copy validated image bytes into the campaign-owned media directory."""
-
-    data = _read_image(source_path, data_url)
-    detected = _image_format(data)
-    if detected is None:
-        raise ValueError("generated artifact is not a supported raster image")
-    extension, mime_type = detected
-    digest = hashlib.sha256(data).hexdigest()[:32]
-    filename = f"{digest}.{extension}"
+    """Copy validated image bytes into the campaign-owned media directory.
+
+    The image is decoded, hashed and written in ``CHUNK_BYTES`` pieces to a
+    temporary file that is renamed to its content address once complete, so
+    peak memory does not depend on the image size.
+    """
+
+    chunks = _image_chunks(source_path, data_url)
     media_dir = Path(campaign_dir) / MEDIA_DIRNAME
     media_dir.mkdir(parents=True, exist_ok=True)
-    destination = media_dir / filename
-    if not destination.exists():
-        fd, temporary_name = tempfile.mkstemp(
-            prefix=f".{digest}.",
-            suffix=".tmp",
-            dir=media_dir,
-        )
-        temporary = Path(temporary_name)
-        try:
-            with os.fdopen(fd, "wb") as handle:
-                handle.write(data)
-                handle.flush()
-                os.fsync(handle.fileno())
+    fd, temporary_name = tempfile.mkstemp(prefix=".incoming.", suffix=".tmp", dir=media_dir)
+    temporary = Path(temporary_name)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            hasher = hashlib.sha256()
+            head = b""
+            size = 0
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > MAX_IMAGE_BYTES:
+                    raise ValueError("generated image data has an invalid size")
+                if len(head) < _SNIFF_BYTES:
+                    head += chunk[:_SNIFF_BYTES - len(head)]
+                hasher.update(chunk)
+                handle.write(chunk)
+            if not size:
+                raise ValueError("generated image data has an invalid size")
+            detected = _image_format(head)
+            if detected is None:
+                raise ValueError("generated artifact is not a supported raster image")
+            handle.flush()
+            os.fsync(handle.fileno())
+        extension, mime_type = detected
+        filename = f"{hasher.hexdigest()[:32]}.{extension}"
+        destination = media_dir / filename
+        if destination.exists():
+            temporary.unlink()
+        else:
             os.replace(temporary, destination)
-        except BaseException:
-            try:
-                os.close(fd)
-            except OSError:
-                pass
-            temporary.unlink(missing_ok=True)
-            raise
-    return PublishedImage(filename=filename, mime_type=mime_type, size=len(data))
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    return PublishedImage(filename=filename, mime_type=mime_type, size=size)
 
 
 def resolve_campaign_media(campaign_dir: Path, filename: str) -> Path:
@@ -0,0 +1,281 @@
+"""Downscaled and modern-format variants of generated campaign images.
+
+Generated images are stored as the provider produced them, often multi-
+megabyte PNGs, and every chat replay loads each of them.  After an image is
+published, ``schedule_variants`` encodes WebP (and AVIF where Pillow
+supports it) copies at the ``VARIANT_WIDTHS`` that are smaller than the
+original, plus one at full size, on a background worker.  A variant is only
+kept when it is smaller than the original.  They live in ``media/variants``
+next to a ``<digest>.json`` manifest that ``select_variant`` reads to pick
+the best file for a request's ``Accept`` header and ``?w=`` size hint.
+Images that cannot be decoded get an empty manifest, so they are tried once.
+
+Pillow is optional: without it nothing is generated and the original is
+always served.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from backend.media import resolve_campaign_media
+from lib.metrics import histogram
+
+try:
+    from PIL import Image, features
+except ImportError:  # pragma: no cover - Pillow ships with matplotlib
+    Image = None
+    features = None
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIRNAME = "variants"
+VARIANT_WIDTHS = (480, 960, 1920)
+# Encoder settings per format, most preferred first.
+_FORMATS = {
+    "avif": ("image/avif", "AVIF", {"quality": 60, "speed": 8}),
+    "webp": ("image/webp", "WEBP", {"quality": 80, "method": 4}),
+}
+
+_VARIANT_SECONDS = histogram(
+    "dm_media_variant_seconds",
+    "Time to encode all variants of one generated image.",
+)
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_in_flight: set[Path] = set()
+
+
+@dataclass(frozen=True)
+class MediaVariant:
+    path: Path
+    mime_type: str
+
+
+@dataclass(frozen=True)
+class VariantSelection:
+    """``variant`` to serve (``None``: the original); ``pending`` while not yet encoded."""
+
+    variant: MediaVariant | None = None
+    pending: bool = False
+
+
+def _formats() -> list[str]:
+    if Image is None:
+        return []
+    return [name for name in _FORMATS if features.check(name)]
+
+
+def _variants_dir(media_path: Path) -> Path:
+    return media_path.parent / VARIANTS_DIRNAME
+
+
+def _manifest_path(media_path: Path) -> Path:
+    return _variants_dir(media_path) / f"{media_path.stem}.json"
+
+
+def _write_atomic(path: Path, write) -> None:
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            write(handle)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _write_manifest(media_path: Path, manifest: dict[str, Any]) -> None:
+    _variants_dir(media_path).mkdir(exist_ok=True)
+    _write_atomic(
+        _manifest_path(media_path),
+        lambda handle: handle.write(json.dumps(manifest).encode("utf-8")),
+    )
+
+
+def _prepare(image: Any) -> Any:
+    """RGB or RGBA copy: every encoder takes it and it resizes with filtering."""
+    has_alpha = image.mode in {"RGBA", "LA", "PA"} or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def generate_variants(media_path: Path) -> dict[str, Any] | None:
+    """Encode every variant of one stored image and write its manifest.
+
+    Returns the manifest, or ``None`` when Pillow is unavailable or the
+    image cannot be decoded.
+    """
+    formats = _formats()
+    if not formats:
+        return None
+    started = time.perf_counter()
+    original_size = media_path.stat().st_size
+    try:
+        with Image.open(media_path) as source:
+            source.seek(0)
+            source.load()
+            image = _prepare(source)
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        logger.warning("media variants skipped for %s: %s", media_path.name, exc)
+        # An empty manifest stops every request from re-queueing the decode.
+        _write_manifest(media_path, {"width": 0, "size": original_size, "variants": []})
+        return None
+    width, height = image.size
+    directory = _variants_dir(media_path)
+    directory.mkdir(exist_ok=True)
+    widths = sorted({target for target in VARIANT_WIDTHS if target < width} | {width})
+    variants = []
+    for target in widths:
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.Resampling.LANCZOS
+        )
+        for fmt in formats:
+            mime_type, encoder, options = _FORMATS[fmt]
+            path = directory / f"{media_path.stem}-{target}.{fmt}"
+            try:
+                _write_atomic(path, partial(resized.save, format=encoder, **options))
+            except (OSError, ValueError) as exc:
+                logger.warning("media variant %s failed: %s", path.name, exc)
+                continue
+            size = path.stat().st_size
+            if size >= original_size:
+                path.unlink(missing_ok=True)
+                continue
+            variants.append(
+                {"file": path.name, "width": target, "mime_type": mime_type, "size": size}
+            )
+    manifest = {
+        "width": width,
+        "size": original_size,
+        "variants": variants,
+    }
+    _write_manifest(media_path, manifest)
+    _VARIANT_SECONDS.observe(time.perf_counter() - started)
+    return manifest
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        # One worker: encoding is CPU-bound and must not crowd out turns.
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="media-variants")
+    return _executor
+
+
+def _run(media_path: Path) -> None:
+    try:
+        generate_variants(media_path)
+    except Exception:
+        logger.exception("media variants failed for %s", media_path)
+    finally:
+        with _lock:
+            _in_flight.discard(media_path)
+
+
+def schedule_variants(campaign_dir: Path, filename: str) -> bool:
+    """Queue variant generation for a published image; False if not queued."""
+    if not _formats():
+        return False
+    try:
+        media_path = resolve_campaign_media(campaign_dir, filename)
+    except FileNotFoundError:
+        return False
+    with _lock:
+        if media_path in _in_flight:
+            return False
+        _in_flight.add(media_path)
+        _get_executor().submit(_run, media_path)
+    return True
+
+
+def shutdown_variant_workers() -> None:
+    """Drop queued work; the next ``schedule_variants`` starts a fresh worker."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+        _in_flight.clear()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _quality(param: str) -> float | None:
+    name, _, value = param.partition("=")
+    if name.strip().lower() != "q":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _accepted(accept: str) -> set[str]:
+    """Media types an ``Accept`` header allows, ignoring ``q=0`` entries."""
+    accepted = set()
+    for part in accept.split(","):
+        media_type, *params = (piece.strip() for piece in part.split(";"))
+        if any(_quality(param) == 0 for param in params):
+            continue
+        if media_type:
+            accepted.add(media_type.lower())
+    return accepted
+
+
+def _read_manifest(media_path: Path) -> dict[str, Any] | None:
+    try:
+        manifest = json.loads(_manifest_path(media_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def select_variant(
+    campaign_dir: Path,
+    filename: str,
+    accept: str = "",
+    width: int | None = None,
+) -> VariantSelection:
+    """Best stored variant for a request, or the original.
+
+    With ``width`` the smallest candidate at least that wide wins, else the
+    widest; without it only full-size candidates qualify.  Ties go to the
+    smaller file.  Images without a manifest yet are queued for generation
+    and reported as ``pending``, so the original is not cached for good.
+    """
+    media_path = resolve_campaign_media(campaign_dir, filename)
+    manifest = _read_manifest(media_path)
+    if manifest is None:
+        schedule_variants(campaign_dir, filename)
+        return VariantSelection(pending=bool(_formats()))
+    accepted = _accepted(accept)
+    full_width = int(manifest.get("width") or 0)
+    candidates = [(full_width, int(manifest.get("size") or 0), None)]
+    for variant in manifest.get("variants") or []:
+        if variant.get("mime_type") in accepted:
+            candidates.append((int(variant["width"]), int(variant["size"]), variant))
+    if width is None:
+        pool = [candidate for candidate in candidates if candidate[0] >= full_width]
+    else:
+        wide_enough = [candidate for candidate in candidates if candidate[0] >= width]
+        widest = max(candidate[0] for candidate in candidates)
+        pool = wide_enough or [candidate for candidate in candidates if candidate[0] == widest]
+    _width, _size, chosen = min(pool, key=lambda candidate: (candidate[0], candidate[1]))
+    if chosen is None:
+        return VariantSelection()
+    path = _variants_dir(media_path) / Path(str(chosen["file"])).name
+    if not path.is_file():
+        return VariantSelection()
+    return VariantSelection(MediaVariant(path=path, mime_type=str(chosen["mime_type"])))
@@ -0,0 +1,130 @@
+"""Per-turn provider prompt-cache accounting.
+
+Providers cache the longest prompt prefix they have seen recently; cached
+input tokens are cheaper and shorten time to first token.  Each completed
+turn appends one row to ``prompt-cache.jsonl`` in the campaign directory
+with its input, cached and output token counts and its latency, so the
+hit ratio can be followed per turn and summarised per campaign.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable
+
+REPORT_FILENAME = "prompt-cache.jsonl"
+REPORT_RETENTION = 500
+# A turn counts as served from cache when most of its prompt was cached.
+WARM_CACHE_RATIO = 0.5
+# Trimming rewrites the file, so it only happens once it is well past the cap.
+_TRIM_BYTES = 256 * 1024
+
+
+def _report_path(campaign_dir: Path) -> Path:
+    return Path(campaign_dir) / REPORT_FILENAME
+
+
+def record_turn(campaign_dir: Path, row: dict[str, Any]) -> None:
+    """Append one turn's usage row, keeping the newest ``REPORT_RETENTION``."""
+    path = _report_path(campaign_dir)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+        size = handle.tell()
+    if size > _TRIM_BYTES:
+        _trim(path, REPORT_RETENTION)
+
+
+def _trim(path: Path, keep: int) -> None:
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)[-keep:]
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.writelines(lines)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def read_turns(campaign_dir: Path) -> list[dict[str, Any]]:
+    """Stored rows, oldest first; unreadable lines are skipped."""
+    try:
+        text = _report_path(campaign_dir).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    rows = []
+    for line in text.splitlines():
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(row, dict):
+            rows.append(row)
+    return rows
+
+
+def _median_ms(values: list[float]) -> float | None:
+    return round(statistics.median(values), 1) if values else None
+
+
+def summarize(rows: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Token totals, overall hit ratio and TTFT with a warm versus cold cache."""
+    turns = 0
+    input_tokens = cached_tokens = output_tokens = 0
+    warm_ttft: list[float] = []
+    cold_ttft: list[float] = []
+    for row in rows:
+        turns += 1
+        row_input = int(row.get("input_tokens") or 0)
+        row_cached = int(row.get("cached_input_tokens") or 0)
+        input_tokens += row_input
+        cached_tokens += row_cached
+        output_tokens += int(row.get("output_tokens") or 0)
+        ttft = row.get("ttft_ms")
+        if isinstance(ttft, (int, float)):
+            warm = bool(row_input) and row_cached / row_input >= WARM_CACHE_RATIO
+            (warm_ttft if warm else cold_ttft).append(float(ttft))
+    return {
+        "turns": turns,
+        "input_tokens": input_tokens,
+        "cached_input_tokens": cached_tokens,
+        "uncached_input_tokens": input_tokens - cached_tokens,
+        "output_tokens": output_tokens,
+        "cache_hit_ratio": round(cached_tokens / input_tokens, 4) if input_tokens else 0.0,
+        "median_ttft_ms": {
+            "warm_cache": _median_ms(warm_ttft),
+            "cold_cache": _median_ms(cold_ttft),
+        },
+    }
+
+
+def campaign_report(campaign_dir: Path, limit: int = 50) -> dict[str, Any]:
+    """Summary over every stored turn plus the newest ``limit`` rows."""
+    rows = read_turns(campaign_dir)
+    return {
+        "summary": summarize(rows),
+        "turns": list(reversed(rows[-limit:])) if limit > 0 else [],
+    }
+
+
+def all_campaigns_report(campaigns_dir: Path) -> dict[str, Any]:
+    """Per-campaign summaries and one across all campaigns."""
+    campaigns: dict[str, Any] = {}
+    every_row: list[dict[str, Any]] = []
+    try:
+        entries = sorted(Path(campaigns_dir).iterdir())
+    except FileNotFoundError:
+        entries = []
+    for entry in entries:
+        rows = read_turns(entry) if entry.is_dir() else []
+        if rows:
+            campaigns[entry.name] = summarize(rows)
+            every_row.extend(rows)
+    return {"summary": summarize(every_row), "campaigns": campaigns}
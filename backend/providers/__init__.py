@@ -2,9 +2,11 @@
 
 from backend.providers.claude_sdk import ClaudeSDKProvider
 from backend.providers.codex_cli import CodexAppServerProvider, CodexCLIProvider
+from backend.providers.replay import ReplayProvider
 
 __all__ = [
     "ClaudeSDKProvider",
     "CodexAppServerProvider",
     "CodexCLIProvider",
+    "ReplayProvider",
 ]
@@ -132,6 +132,42 @@ def _tool_result_events(block: ToolResultBlock) -> list[AgentEvent]:
     return events
 
 
+def _subprocess_pid(client: object) -> Optional[int]:
+    """PID behind a connected ``ClaudeSDKClient``, or None when unknown.
+
+    The SDK has no public accessor, so this reads the private
+    ``_transport._process`` of its subprocess transport.  Any other transport,
+    or an SDK release that moves those attributes, yields None instead of
+    breaking resource reporting.
+    """
+    try:
+        pid = client._transport._process.pid  # type: ignore[attr-defined]
+    except Exception:
+        return None
+    return pid if isinstance(pid, int) else None
+
+
+def _turn_usage_from_sdk(usage: object) -> dict[str, int]:
+    """Normalize a ResultMessage's usage to the provider-neutral turn keys.
+
+    Anthropic reports uncached, cache-read and cache-write input separately;
+    ``input_tokens`` in TurnUsage counts all of them.
+    """
+    if not isinstance(usage, Mapping):
+        return {}
+
+    def count(key: str) -> int:
+        value = usage.get(key)
+        return value if isinstance(value, int) and value > 0 else 0
+
+    cached = count("cache_read_input_tokens")
+    return {
+        "input_tokens": count("input_tokens") + cached + count("cache_creation_input_tokens"),
+        "cached_input_tokens": cached,
+        "output_tokens": count("output_tokens"),
+    }
+
+
 def _context_usage_from_sdk(raw: Mapping[str, object]) -> ContextUsage:
     """Preserve Claude Code's exact `/context` category breakdown."""
     breakdown: dict[str, int] = {}
@@ -181,6 +217,8 @@ class ClaudeSDKProvider:
         self.campaign_name = campaign_name
         self._client: Optional[ClaudeSDKClient] = None
         self._session_id: Optional[str] = resume_session_id
+        # A prewarmed client resumed a session nobody has queried yet.
+        self._unverified_resume = False
         self._environment = dict(environment or {})
         self._last_usage: Optional[dict] = None  # token counts from the latest ResultMessage
         self._last_context_usage: ContextUsage | None = None
@@ -246,7 +284,10 @@ class ClaudeSDKProvider:
         max_failures = 3
 
         while True:
-            resume_attempt = self._client is None and bool(self._session_id)
+            resume_attempt = bool(self._session_id) and (
+                self._client is None or self._unverified_resume
+            )
+            self._unverified_resume = False
             try:
                 if self._client is None:
                     self._client = await self._connect(model_name, system_prompt, mcp_servers)
@@ -354,7 +395,11 @@ class ClaudeSDKProvider:
                 yield AgentEvent(
                     "turn_end",
                     "Turn completed" if not msg.is_error else "Turn failed",
-                    {"ok": not msg.is_error, "stop_reason": "end_turn"},
+                    {
+                        "ok": not msg.is_error,
+                        "stop_reason": "end_turn",
+                        **_turn_usage_from_sdk(usage),
+                    },
                 )
                 return
 
@@ -365,11 +410,17 @@ class ClaudeSDKProvider:
             except Exception:
                 pass
             self._client = None
+        self._unverified_resume = False
 
     @property
     def session_id(self) -> str | None:
         return self._session_id
 
+    @property
+    def process_id(self) -> Optional[int]:
+        """PID of the connected CLI subprocess, for resource reporting."""
+        return _subprocess_pid(self._client)
+
     def get_context_usage(self) -> Optional[ContextUsage]:
         """Context footprint of the last turn, or None if no turn ran yet.
 
@@ -423,6 +474,12 @@ class ClaudeSDKProvider:
         self._last_usage = None
         self._last_context_usage = None
 
+    async def prewarm(self, system_prompt: str, mcp_servers: Optional[Dict] = None) -> None:
+        """Start the CLI subprocess now so the first turn only sends the query."""
+        if self._client is None:
+            self._client = await self._connect(self.model_name, system_prompt, mcp_servers)
+            self._unverified_resume = bool(self._session_id)
+
     async def reconnect(self, system_prompt: str, mcp_servers: Optional[Dict] = None) -> None:
         await self._disconnect()
         self._client = await self._connect(self.model_name, system_prompt, mcp_servers)
@@ -8,10 +8,13 @@ import logging
 import os
 import re
 import shutil
+import tempfile
 from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from backend.media import MAX_IMAGE_BYTES, IncrementalBase64Decoder
 from backend.runtime.events import AgentEvent, ContextUsage
 
 logger = logging.getLogger(__name__)
@@ -54,37 +57,306 @@ def _toml_string(value: str) -> str:
     return json.dumps(value, ensure_ascii=False)
 
 
+_TOKEN_COUNT_MARKER = b'"token_count"'
+_TAIL_CHUNK = 64 * 1024
+
+
+def _rollout_line_context(line: bytes) -> ContextUsage | None:
+    """Parse one rollout line if it is a usable ``token_count`` event."""
+    if _TOKEN_COUNT_MARKER not in line:
+        return None
+    try:
+        row = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(row, Mapping):
+        return None
+    payload = row.get("payload") or {}
+    if row.get("type") != "event_msg" or payload.get("type") != "token_count":
+        return None
+    info = payload.get("info") or {}
+    usage = info.get("last_token_usage") or {}
+    used = usage.get("input_tokens")
+    total = info.get("model_context_window")
+    cached = usage.get("cached_input_tokens", 0)
+    if not isinstance(used, int) or used < 0:
+        return None
+    if not isinstance(total, int) or total <= 0:
+        return None
+    return ContextUsage(
+        used_tokens=used,
+        total_tokens=total,
+        cached_input_tokens=cached if isinstance(cached, int) else 0,
+    )
+
+
+def _last_rollout_context(handle: Any, start: int, end: int) -> ContextUsage | None:
+    """Scan ``handle`` backwards from ``end`` to ``start`` for the newest usage."""
+    position = end
+    carry = b""
+    while position > start:
+        size = min(_TAIL_CHUNK, position - start)
+        position -= size
+        handle.seek(position)
+        lines = (handle.read(size) + carry).split(b"\n")
+        # The first piece may be the tail of a line that starts further back.
+        carry = lines.pop(0) if position > start else b""
+        for line in reversed(lines):
+            usage = _rollout_line_context(line)
+            if usage is not None:
+                return usage
+    return None
+
+
 def _read_rollout_context(path: Path) -> ContextUsage | None:
     """Read the latest model-call context as a fallback for older app-server builds."""
 
-    latest: ContextUsage | None = None
     try:
-        with path.open(encoding="utf-8", errors="replace") as handle:
-            for line in handle:
-                try:
-                    row = json.loads(line)
-                except (json.JSONDecodeError, TypeError):
-                    continue
-                payload = row.get("payload") or {}
-                if row.get("type") != "event_msg" or payload.get("type") != "token_count":
-                    continue
-                info = payload.get("info") or {}
-                usage = info.get("last_token_usage") or {}
-                used = usage.get("input_tokens")
-                total = info.get("model_context_window")
-                cached = usage.get("cached_input_tokens", 0)
-                if not isinstance(used, int) or used < 0:
-                    continue
-                if not isinstance(total, int) or total <= 0:
-                    continue
-                latest = ContextUsage(
-                    used_tokens=used,
-                    total_tokens=total,
-                    cached_input_tokens=cached if isinstance(cached, int) else 0,
-                )
-    except (FileNotFoundError, OSError):
+        with path.open("rb") as handle:
+            end = handle.seek(0, os.SEEK_END)
+            return _last_rollout_context(handle, 0, end)
+    except OSError:
         return None
-    return latest
+
+
+class _RolloutTail:
+    """Latest context usage of a growing rollout file, read incrementally.
+
+    The first read scans backwards from the end; later reads parse only the
+    bytes appended since, so each call costs O(new bytes).  The offset stops
+    at the last newline: an unterminated final line is parsed when it is
+    already valid JSON and read again once it is complete.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.offset = 0
+        self.latest: ContextUsage | None = None
+
+    def read(self) -> ContextUsage | None:
+        try:
+            with self.path.open("rb") as handle:
+                end = handle.seek(0, os.SEEK_END)
+                if end < self.offset:
+                    # Truncated or replaced: start over.
+                    self.offset, self.latest = 0, None
+                if end == self.offset:
+                    return self.latest
+                if self.offset == 0:
+                    self.latest = _last_rollout_context(handle, 0, end) or self.latest
+                    self.offset = _complete_length(handle, end)
+                    return self.latest
+                handle.seek(self.offset)
+                data = handle.read(end - self.offset)
+        except OSError:
+            return self.latest
+        complete = data.rfind(b"\n") + 1
+        for line in data.split(b"\n"):
+            usage = _rollout_line_context(line)
+            if usage is not None:
+                self.latest = usage
+        self.offset += complete
+        return self.latest
+
+
+def _complete_length(handle: Any, end: int) -> int:
+    """Length of ``handle`` up to and including its last newline."""
+    position = end
+    while position > 0:
+        size = min(_TAIL_CHUNK, position)
+        position -= size
+        handle.seek(position)
+        newline = handle.read(size).rfind(b"\n")
+        if newline >= 0:
+            return position + newline + 1
+    return 0
+
+
+_UUID_V7 = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-7[0-9a-f]{3}-[0-9a-f]{4}-[0-9a-f]{12}$")
+# thread id -> rollout path, shared by every provider in the process.
+_rollout_index: dict[str, Path] = {}
+
+
+def _thread_day_dirs(root: Path, thread_id: str) -> list[Path]:
+    """Date partitions (``YYYY/MM/DD``) that may hold a thread's rollout.
+
+    UUIDv7 thread ids embed their creation time; the rollout is filed under
+    that day in local time, so the neighbouring days cover any UTC offset.
+    Older ids fall back to every partition, newest first.
+    """
+    if _UUID_V7.match(thread_id):
+        created = datetime.fromtimestamp(int(thread_id[:8] + thread_id[9:13], 16) / 1000, timezone.utc)
+        days = [(created + timedelta(days=offset)).date() for offset in (0, -1, 1)]
+        return [root / f"{day:%Y}" / f"{day:%m}" / f"{day:%d}" for day in days]
+
+    def newest_first(directory: Path) -> list[Path]:
+        try:
+            return sorted(
+                (entry for entry in directory.iterdir() if entry.name.isdigit()),
+                key=lambda entry: entry.name,
+                reverse=True,
+            )
+        except OSError:
+            return []
+
+    return [
+        day
+        for year in newest_first(root)
+        for month in newest_first(year)
+        for day in newest_first(month)
+    ]
+
+
+def _locate_rollout(root: Path, thread_id: str) -> Path | None:
+    """Find a thread's rollout under ``root`` without walking every session."""
+    suffix = f"{thread_id}.jsonl"
+    for day in _thread_day_dirs(root, thread_id):
+        try:
+            matches = [entry for entry in day.iterdir() if entry.name.endswith(suffix)]
+        except OSError:
+            continue
+        if matches:
+            return max(matches, key=lambda path: path.name)
+    # Non-standard layouts (older Codex builds, custom CODEX_HOME trees).
+    try:
+        matches = list(root.glob(f"**/*{suffix}"))
+    except OSError:
+        return None
+    if not matches:
+        return None
+    try:
+        return max(matches, key=lambda path: path.stat().st_mtime)
+    except OSError:
+        return None
+
+
+_STDOUT_CHUNK = 64 * 1024
+# Once a pending message line is this long, its image data URL goes to disk.
+_SPOOL_THRESHOLD = 1024 * 1024
+# Without the slash, which JSON may escape.
+_IMAGE_MARKER = b'"data:image'
+_BASE64_MARKER = b";base64,"
+# How far past the image marker the ";base64," separator may appear.
+_DATA_URL_HEADER = 64
+
+
+class _MessageReader:
+    """Split app-server stdout into JSONL lines without buffering image data.
+
+    Stdout is read in ``_STDOUT_CHUNK`` pieces.  When the pending line grows
+    past ``_SPOOL_THRESHOLD``, a base64 image data URL in it is decoded
+    straight into a file under ``spool_dir()`` as it arrives and the JSON
+    string is replaced by ``{"spooledPath": "<file>"}``, so memory per image
+    stays bounded whatever its size.
+    """
+
+    def __init__(self, stream: Any, spool_dir: Callable[[], Path]) -> None:
+        self._stream = stream
+        self._spool_dir = spool_dir
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._eof = False
+        self._head = b""
+        self._spool_path: Path | None = None
+        self._spool_file: Any | None = None
+        self._decoder = IncrementalBase64Decoder()
+        self._spooled_bytes = 0
+        self._spool_failed = False
+
+    async def readline(self) -> bytes:
+        """Next line, the unterminated remainder at EOF, then ``b""``."""
+        while True:
+            if self._spool_path is not None:
+                self._drain_spool()
+            if self._spool_path is None:
+                newline = self._buffer.find(b"\n")
+                if newline >= 0:
+                    line = bytes(self._buffer[: newline + 1])
+                    del self._buffer[: newline + 1]
+                    self._scanned = 0
+                    return line
+                if len(self._buffer) > _SPOOL_THRESHOLD:
+                    self._start_spool()
+                    if self._spool_path is not None:
+                        continue
+            if self._eof:
+                self._discard_spool()
+                line = bytes(self._buffer)
+                self._buffer.clear()
+                return line
+            chunk = await self._stream.read(_STDOUT_CHUNK)
+            if chunk:
+                self._buffer += chunk
+            else:
+                self._eof = True
+
+    def _start_spool(self) -> None:
+        marker = self._buffer.find(_IMAGE_MARKER, self._scanned)
+        if marker < 0:
+            self._scanned = max(0, len(self._buffer) - len(_IMAGE_MARKER))
+            return
+        separator = self._buffer.find(_BASE64_MARKER, marker, marker + _DATA_URL_HEADER)
+        if separator < 0:
+            # Either the header is still arriving or this is not a data URL.
+            incomplete = len(self._buffer) - marker < _DATA_URL_HEADER
+            self._scanned = marker if incomplete else marker + 1
+            return
+        fd, name = tempfile.mkstemp(prefix="image-", suffix=".bin", dir=self._spool_dir())
+        self._spool_file = os.fdopen(fd, "wb")
+        self._spool_path = Path(name)
+        self._decoder = IncrementalBase64Decoder()
+        self._spooled_bytes = 0
+        self._spool_failed = False
+        self._head = bytes(self._buffer[:marker])
+        del self._buffer[: separator + len(_BASE64_MARKER)]
+
+    def _write_spool(self, data: bytes) -> None:
+        if self._spool_failed:
+            return
+        self._spooled_bytes += len(data)
+        if self._spooled_bytes > MAX_IMAGE_BYTES:
+            raise ValueError("generated image data has an invalid size")
+        self._spool_file.write(data)
+
+    def _drain_spool(self) -> None:
+        end = self._buffer.find(b'"')
+        available = len(self._buffer) if end < 0 else end
+        # JSON may escape "/" as "\/"; hold a trailing backslash for the next read.
+        if end < 0 and self._buffer.endswith(b"\\"):
+            available -= 1
+        text = bytes(self._buffer[:available]).replace(b"\\/", b"/")
+        try:
+            self._write_spool(self._decoder.feed(text))
+            if end >= 0:
+                self._write_spool(self._decoder.finish())
+        except (OSError, ValueError) as exc:
+            if not self._spool_failed:
+                logger.warning("Codex generated image could not be spooled: %s", exc)
+            self._spool_failed = True
+        if end < 0:
+            del self._buffer[:available]
+            return
+        path = self._spool_path
+        self._spool_file.close()
+        self._spool_file = None
+        self._spool_path = None
+        if self._spool_failed:
+            path.unlink(missing_ok=True)
+            value = b'""'
+        else:
+            value = json.dumps({"spooledPath": str(path)}).encode()
+        self._buffer[: end + 1] = self._head + value
+        self._scanned = len(self._head) + len(value)
+        self._head = b""
+
+    def _discard_spool(self) -> None:
+        if self._spool_path is None:
+            return
+        self._spool_file.close()
+        self._spool_path.unlink(missing_ok=True)
+        self._spool_file = None
+        self._spool_path = None
+        self._head = b""
 
 
 def _result_text(result: Any) -> str:
@@ -251,7 +523,12 @@ def normalize_codex_event(payload: Mapping[str, Any]) -> list[AgentEvent]:
         if item_type == "imageGeneration":
             status = str(item.get("status") or "")
             saved_path = str(item.get("savedPath") or "")
-            result = str(item.get("result") or "")
+            result = item.get("result") or ""
+            # Large payloads arrive already decoded to disk by _MessageReader.
+            spooled_path = (
+                str(result.get("spooledPath") or "") if isinstance(result, Mapping) else ""
+            )
+            result = "" if isinstance(result, Mapping) else str(result)
             revised_prompt = str(item.get("revisedPrompt") or "")
             events = [
                 AgentEvent(
@@ -259,17 +536,19 @@ def normalize_codex_event(payload: Mapping[str, Any]) -> list[AgentEvent]:
                     json.dumps(
                         {
                             "status": status,
-                            "generated": bool(saved_path or result),
+                            "generated": bool(saved_path or spooled_path or result),
                         },
                         ensure_ascii=False,
                     ),
                     {"tool_use_id": item_id, "is_error": status == "failed"},
                 )
             ]
-            if status != "failed" and (saved_path or result.startswith("data:image/")):
+            if status != "failed" and (
+                saved_path or spooled_path or result.startswith("data:image/")
+            ):
                 metadata = {
                     "tool_use_id": item_id,
-                    "source_path": saved_path,
+                    "source_path": saved_path or spooled_path,
                     "alt": "Cinematic campaign scene",
                 }
                 if result.startswith("data:image/"):
@@ -326,6 +605,7 @@ class CodexCLIProvider:
         self._process_factory = process_factory or asyncio.create_subprocess_exec
         self._rollout_root = rollout_root
         self._rollout_path: Path | None = None
+        self._rollout_tail: _RolloutTail | None = None
         self._proc: Any | None = None
         self._reader_task: asyncio.Task[None] | None = None
         self._stderr_task: asyncio.Task[None] | None = None
@@ -338,7 +618,10 @@ class CodexCLIProvider:
         self._disconnecting = False
         self._last_stderr = ""
         self._last_call_usage: dict[str, int] | None = None
+        # Summed over every model call of the current turn, for turn_end.
+        self._turn_usage: dict[str, int] | None = None
         self._context_window = CODEX_CONTEXT_LIMITS.get(model_name, 258_400)
+        self._spool_dir: Path | None = None
 
     @property
     def session_id(self) -> str | None:
@@ -348,6 +631,11 @@ class CodexCLIProvider:
     def is_alive(self) -> bool:
         return self._proc is not None and self._proc.returncode is None
 
+    @property
+    def process_id(self) -> int | None:
+        """PID of the app-server while it runs, for resource reporting."""
+        return self._proc.pid if self.is_alive else None
+
     def _mcp_config_args(self, servers: Mapping[str, Any] | None) -> list[str]:
         args: list[str] = []
         for name, raw_config in (servers or {}).items():
@@ -457,7 +745,6 @@ class CodexCLIProvider:
             stderr=asyncio.subprocess.PIPE,
             env=self._build_env(mcp_servers),
             cwd=str(self.project_root),
-            limit=16 * 1024 * 1024,
         )
         self._reader_task = asyncio.create_task(self._read_stdout())
         self._stderr_task = asyncio.create_task(self._drain_stderr())
@@ -512,10 +799,24 @@ class CodexCLIProvider:
                 raise RuntimeError("Codex app-server returned no thread id")
             self._thread_id = str(thread_id)
             self._rollout_path = None
+            rollout = thread.get("path")
+            if isinstance(rollout, str) and rollout:
+                # Newer app-server builds report where the rollout is written.
+                self._rollout_path = Path(rollout)
+                _rollout_index[self._thread_id] = self._rollout_path
         except BaseException:
             await self.close()
             raise
 
+    async def prewarm(
+        self,
+        system_prompt: str,
+        mcp_servers: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Spawn the app-server and open the thread ahead of the first turn."""
+        async with self._turn_lock:
+            await self._connect(system_prompt, mcp_servers)
+
     async def _start_turn(self, user_message: str) -> None:
         if not self._thread_id:
             raise RuntimeError("Codex thread is not initialized")
@@ -551,6 +852,7 @@ class CodexCLIProvider:
                 self.model_name = model_name
                 self._context_window = CODEX_CONTEXT_LIMITS.get(model_name, 258_400)
             self._last_call_usage = None
+            self._turn_usage = None
             try:
                 await self._connect(system_prompt, mcp_servers)
                 await self._start_turn(user_message)
@@ -612,7 +914,7 @@ class CodexCLIProvider:
                 if status == "failed" and isinstance(error, Mapping) and error.get("message"):
                     yield AgentEvent("error", str(error["message"]))
                 self._active_turn_id = None
-                usage = self._last_call_usage or {}
+                usage = self._turn_usage or {}
                 yield AgentEvent(
                     "turn_end",
                     f"Turn {status}",
@@ -651,6 +953,22 @@ class CodexCLIProvider:
 
             for event in normalize_codex_event(message):
                 yield event
+                if event.type == "image":
+                    self._discard_spooled(event.metadata.get("source_path"))
+
+    def _image_spool_dir(self) -> Path:
+        if self._spool_dir is None:
+            self._spool_dir = Path(tempfile.mkdtemp(prefix="codex-images-"))
+        return self._spool_dir
+
+    def _discard_spooled(self, path: Any) -> None:
+        """Remove a spooled image once the consumer has published it.
+
+        A spooled ``source_path`` is only valid until the consumer resumes
+        ``process_message``; it must be published before the next event.
+        """
+        if path and self._spool_dir is not None and Path(path).parent == self._spool_dir:
+            Path(path).unlink(missing_ok=True)
 
     async def _request(self, method: str, params: Mapping[str, Any]) -> dict[str, Any]:
         if not self.is_alive or not self._proc.stdin:
@@ -685,8 +1003,9 @@ class CodexCLIProvider:
         if not process or not process.stdout:
             return
         try:
+            reader = _MessageReader(process.stdout, self._image_spool_dir)
             while True:
-                raw = await process.stdout.readline()
+                raw = await reader.readline()
                 if not raw:
                     break
                 try:
@@ -791,6 +1110,10 @@ class CodexCLIProvider:
                 ),
                 "output_tokens": _nonnegative_int(last.get("outputTokens")),
             }
+            turn_usage = self._turn_usage or dict.fromkeys(self._last_call_usage, 0)
+            for key, value in self._last_call_usage.items():
+                turn_usage[key] += value
+            self._turn_usage = turn_usage
         window = usage.get("modelContextWindow")
         if isinstance(window, int) and window > 0:
             self._context_window = window
@@ -870,6 +1193,9 @@ class CodexCLIProvider:
         self._reader_task = None
         self._stderr_task = None
         self._active_turn_id = None
+        if self._spool_dir is not None:
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+            self._spool_dir = None
 
     async def reset(self) -> None:
         await self.close()
@@ -882,20 +1208,17 @@ class CodexCLIProvider:
             return None
         if self._rollout_path and self._rollout_path.is_file():
             return self._rollout_path
+        indexed = _rollout_index.get(self._thread_id)
+        if indexed is not None and indexed.is_file():
+            self._rollout_path = indexed
+            return indexed
         root = self._rollout_root
         if root is None:
             codex_home = Path(os.environ.get("CODEX_HOME", Path.home() / ".codex"))
             root = codex_home / "sessions"
-        try:
-            matches = list(root.glob(f"**/*{self._thread_id}.jsonl"))
-        except OSError:
-            return None
-        if not matches:
-            return None
-        try:
-            self._rollout_path = max(matches, key=lambda path: path.stat().st_mtime)
-        except OSError:
-            return None
+        self._rollout_path = _locate_rollout(root, self._thread_id)
+        if self._rollout_path is not None:
+            _rollout_index[self._thread_id] = self._rollout_path
         return self._rollout_path
 
     def get_context_usage(self) -> ContextUsage | None:
@@ -906,7 +1229,11 @@ class CodexCLIProvider:
                 cached_input_tokens=self._last_call_usage["cached_input_tokens"],
             )
         rollout = self._find_rollout()
-        return _read_rollout_context(rollout) if rollout else None
+        if rollout is None:
+            return None
+        if self._rollout_tail is None or self._rollout_tail.path != rollout:
+            self._rollout_tail = _RolloutTail(rollout)
+        return self._rollout_tail.read()
 
     @staticmethod
     def _classify_error(error: Mapping[str, Any]) -> str:
@@ -0,0 +1,201 @@
+"""Offline provider that replays a recorded event sequence for load testing.
+
+Each turn streams the same recording with its original inter-event delays,
+so the server's fan-out, persistence and media paths can be exercised at
+realistic pacing without model access.  A recording is JSONL with one
+provider event per line::
+
+    {"delay": 0.04, "type": "text_delta", "content": "The "}
+    {"delay": 1.2, "type": "tool_use", "content": "Bash: ...", "metadata": {...}}
+
+``delay`` is the pause before the event, in seconds.  ``BUILTIN_RECORDING``
+covers thinking, streamed text, a tool call, an image and a rate limit
+notice; ``connect_seconds`` simulates the cost of starting a provider
+process before the first turn or after hibernation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncIterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from backend.runtime.events import AgentEvent, ContextUsage
+
+REPLAY_CONTEXT_WINDOW = 200_000
+# 1x1 transparent PNG; enough for store_generated_image to publish.
+_PIXEL_PNG = (
+    "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk"
+    "+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+
+def _builtin_recording() -> list[tuple[float, AgentEvent]]:
+    words = (
+        "Rain hammers the slate roofs of the harbour district as you step "
+        "into the lamplight. Somewhere below, a bell tolls the hour and the "
+        "smugglers' boat scrapes against the pier. "
+    ).split(" ")
+    recording: list[tuple[float, AgentEvent]] = [
+        (0.8, AgentEvent("thinking", "Checking the party's position and the time.")),
+        (
+            0.6,
+            AgentEvent(
+                "tool_use",
+                'Bash: {"command": "bash tools/dm-time.sh advance 1"}',
+                {"tool_name": "Bash", "short_name": "Bash", "tool_use_id": "replay-tool-1"},
+            ),
+        ),
+        (
+            0.25,
+            AgentEvent("tool_result", "Time advanced to 22:00", {"tool_use_id": "replay-tool-1"}),
+        ),
+    ]
+    recording.extend((0.03, AgentEvent("text_delta", f"{word} ")) for word in words if word)
+    recording.extend(
+        [
+            (0.05, AgentEvent("text", " ".join(word for word in words if word))),
+            (
+                1.5,
+                AgentEvent(
+                    "image",
+                    "",
+                    {"tool_use_id": "replay-tool-2", "data_url": _PIXEL_PNG, "alt": "Harbour at night"},
+                ),
+            ),
+            (
+                0.1,
+                AgentEvent(
+                    "rate_limit",
+                    "Usage is approaching the session limit.",
+                    {"retry_after": 0, "status": "allowed_warning"},
+                ),
+            ),
+        ]
+    )
+    return recording
+
+
+BUILTIN_RECORDING = _builtin_recording()
+
+
+def load_recording(path: str | Path) -> list[tuple[float, AgentEvent]]:
+    """Parse a JSONL recording into ``(delay, event)`` pairs."""
+    recording = []
+    with Path(path).open(encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+                delay = max(0.0, float(raw.get("delay", 0.0)))
+                metadata = raw.get("metadata") or {}
+                if not isinstance(metadata, Mapping):
+                    raise ValueError("metadata must be an object")
+                event = AgentEvent(str(raw["type"]), str(raw.get("content", "")), dict(metadata))
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"{path}:{number}: invalid replay event: {exc}") from exc
+            recording.append((delay, event))
+    return recording
+
+
+class ReplayProvider:
+    """AgentProvider that replays ``recording`` on every turn."""
+
+    def __init__(
+        self,
+        model_name: str,
+        campaign_name: str | None = None,
+        *,
+        recording: list[tuple[float, AgentEvent]] | None = None,
+        speed: float = 1.0,
+        connect_seconds: float = 0.0,
+        resume_session_id: str | None = None,
+    ) -> None:
+        self.model_name = model_name
+        self.campaign_name = campaign_name
+        self.recording = BUILTIN_RECORDING if recording is None else recording
+        self.speed = speed if speed > 0 else 1.0
+        self.connect_seconds = max(0.0, connect_seconds)
+        self._session_id = resume_session_id
+        self._connected = False
+        self._turns = 0
+        self._interrupted = asyncio.Event()
+
+    @property
+    def session_id(self) -> str | None:
+        return self._session_id
+
+    async def _connect(self) -> None:
+        if not self._connected:
+            # Stands in for spawning a CLI / app-server process.
+            await asyncio.sleep(self.connect_seconds)
+            self._connected = True
+
+    async def prewarm(self, system_prompt: str, mcp_servers: Mapping[str, Any] | None = None) -> None:
+        await self._connect()
+
+    async def process_message(
+        self,
+        user_message: str,
+        system_prompt: str,
+        model_name: str,
+        mcp_servers: Mapping[str, Any] | None = None,
+    ) -> AsyncIterator[AgentEvent]:
+        self._interrupted.clear()
+        await self._connect()
+        if self._session_id is None:
+            self._session_id = f"replay-{uuid.uuid4().hex}"
+        for delay, event in self.recording:
+            if delay:
+                await asyncio.sleep(delay / self.speed)
+            if self._interrupted.is_set():
+                yield AgentEvent("turn_end", "Turn interrupted", {"ok": False})
+                return
+            yield event
+        prompt_tokens = self._prompt_tokens()
+        self._turns += 1
+        yield AgentEvent(
+            "turn_end",
+            "Turn complete",
+            {
+                "ok": True,
+                "session_id": self._session_id,
+                # Everything but the newest exchange is a cached prefix.
+                "input_tokens": prompt_tokens,
+                "cached_input_tokens": prompt_tokens - 1_500 if self._turns > 1 else 0,
+                "output_tokens": 400,
+            },
+        )
+
+    async def interrupt(self) -> bool:
+        self._interrupted.set()
+        return True
+
+    async def compact(self) -> bool:
+        return False
+
+    async def reset(self) -> None:
+        self._connected = False
+        self._session_id = None
+        self._turns = 0
+
+    async def close(self) -> None:
+        self._connected = False
+
+    def get_context_usage(self) -> ContextUsage | None:
+        if not self._turns:
+            return None
+        return ContextUsage(
+            used_tokens=self._prompt_tokens(), total_tokens=REPLAY_CONTEXT_WINDOW
+        )
+
+    def _prompt_tokens(self) -> int:
+        # Grows like a real conversation so usage events carry changing values.
+        return min(REPLAY_CONTEXT_WINDOW, 12_000 + self._turns * 1_500)
+
+    def get_provider_name(self) -> str:
+        return "Replay (recorded events)"
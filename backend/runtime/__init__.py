@@ -1,6 +1,6 @@
 """Provider-neutral runtime primitives."""
 
-from backend.runtime.events import AgentEvent, ContextUsage
+from backend.runtime.events import AgentEvent, ContextUsage, TurnUsage
 from backend.runtime.protocol import AgentProvider
 from backend.runtime.registry import (
     ModelDefinition,
@@ -9,6 +9,7 @@ from backend.runtime.registry import (
     RuntimeDefinition,
     RuntimeRegistry,
     create_default_registry,
+    register_replay_runtime,
 )
 from backend.runtime.session_store import (
     RuntimeSessionState,
@@ -26,7 +27,9 @@ __all__ = [
     "RuntimeCapabilities",
     "RuntimeDefinition",
     "RuntimeRegistry",
+    "TurnUsage",
     "create_default_registry",
+    "register_replay_runtime",
     "RuntimeSessionState",
     "clear_runtime_session",
     "load_runtime_session",
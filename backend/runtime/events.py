@@ -49,3 +49,44 @@ class ContextUsage:
         if self.breakdown:
             result["breakdown"] = dict(self.breakdown)
         return result
+
+
+def _token_count(value: Any) -> int:
+    return value if isinstance(value, int) and value > 0 else 0
+
+
+@dataclass(frozen=True)
+class TurnUsage:
+    """Prompt-side token totals of one turn, carried on its ``turn_end`` event.
+
+    ``input_tokens`` counts every prompt token sent, cached ones included, so
+    ``cached_input_tokens / input_tokens`` is the provider cache-hit ratio.
+    """
+
+    input_tokens: int
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        if self.input_tokens <= 0:
+            return 0.0
+        return min(1.0, self.cached_input_tokens / self.input_tokens)
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping[str, Any]) -> "TurnUsage | None":
+        """Read the usage keys of ``turn_end`` metadata, if the provider set them."""
+        if "input_tokens" not in metadata:
+            return None
+        return cls(
+            input_tokens=_token_count(metadata.get("input_tokens")),
+            cached_input_tokens=_token_count(metadata.get("cached_input_tokens")),
+            output_tokens=_token_count(metadata.get("output_tokens")),
+        )
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "output_tokens": self.output_tokens,
+        }
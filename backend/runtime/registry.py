@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from collections.abc import Callable, Mapping
 from dataclasses import dataclass, replace
 from pathlib import Path
@@ -194,8 +195,63 @@ CODEX_MODEL_DEFAULTS = {
 }
 
 
+def register_replay_runtime(
+    registry: RuntimeRegistry,
+    recording_path: str | None = None,
+    speed: float = 1.0,
+    connect_seconds: float = 0.0,
+) -> None:
+    """Add the offline ``replay`` runtime and its single model.
+
+    ``recording_path`` names a JSONL recording; ``None`` or ``"builtin"``
+    replays the built-in turn.  ``speed`` divides every recorded delay and
+    ``connect_seconds`` is the simulated provider start-up cost.
+    """
+    from backend.providers.replay import ReplayProvider, load_recording
+
+    recording = (
+        None if recording_path in (None, "", "builtin") else load_recording(recording_path)
+    )
+    registry.register_runtime(
+        RuntimeDefinition(
+            id="replay",
+            display_name="Replay (load testing)",
+            capabilities=RuntimeCapabilities(
+                event_stream="per_turn",
+                resume=False,
+                interrupt=True,
+                hibernate=False,
+                context_usage=True,
+                mcp=False,
+            ),
+            factory=lambda context: ReplayProvider(
+                model_name=context.model_name,
+                campaign_name=context.campaign_name,
+                recording=recording,
+                speed=speed,
+                connect_seconds=connect_seconds,
+                resume_session_id=context.resume_session_id,
+            ),
+        )
+    )
+    registry.register_model(
+        ModelDefinition(
+            id="replay",
+            display_name="Replay (recorded events)",
+            runtime_id="replay",
+            selected_reasoning_effort="provider_default",
+        )
+    )
+
+
 def create_default_registry() -> RuntimeRegistry:
-    """Create the built-in registry without requiring Codex at import time."""
+    """Create the built-in registry without requiring Codex at import time.
+
+    Setting ``DND_REPLAY_RECORDING`` (a JSONL path or ``builtin``) also
+    registers the offline ``replay`` runtime used by the load test harness;
+    ``DND_REPLAY_SPEED`` scales its pacing and ``DND_REPLAY_CONNECT_SECONDS``
+    sets its simulated start-up cost.
+    """
 
     from backend.providers.claude_sdk import ClaudeSDKProvider
     from backend.providers.codex_cli import CODEX_CONTEXT_LIMITS, CodexCLIProvider
@@ -279,4 +335,15 @@ def create_default_registry() -> RuntimeRegistry:
                 usage_limits=defaults["usage_limits"],
             )
         )
+    replay_recording = os.environ.get("DND_REPLAY_RECORDING")
+    if replay_recording:
+        try:
+            replay_speed = float(os.environ.get("DND_REPLAY_SPEED", "1"))
+        except ValueError:
+            replay_speed = 1.0
+        try:
+            replay_connect = float(os.environ.get("DND_REPLAY_CONNECT_SECONDS", "0"))
+        except ValueError:
+            replay_connect = 0.0
+        register_replay_runtime(registry, replay_recording, replay_speed, replay_connect)
     return registry
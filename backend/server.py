@@ -2,12 +2,14 @@
 
 import asyncio
 import json
+import math
 import re
 import sys
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
@@ -24,32 +26,123 @@ from lib.campaign_context import (
 )
 from backend.claude_dm import load_system_prompt
 from backend.auth import is_authenticated, login_page, handle_login
+from backend.blocking_io import run_blocking, shutdown_blocking_io
+from lib.campaign_catalog import close_catalogs
+from lib.metrics import histogram, render as render_metrics
 from backend.campaign_api import (
     list_campaigns,
     create_campaign,
     activate_campaign,
     delete_campaign,
 )
-from backend.event_log import append_event, read_current_session_events
+from backend.event_log import EVENT_LOG_FILENAME, append_event, read_current_session_events
 from backend.game_session import (
     close_all_sessions,
     get_or_create_session,
     get_runtime_registry,
+    max_live_providers,
     peek_session,
+    prewarm_on_connect,
+    prewarm_pool_size,
+    session_stats,
+    start_session_reaper,
 )
 from backend.live_broker import broker
 from backend.media import resolve_campaign_media
+from backend.media_variants import select_variant, shutdown_variant_workers
 from backend.cinematic_mcp import build_cinematic_mcp
-from backend.campaign_views import get_campaign_views
-from backend.map_view import get_map_snapshot
+from backend.campaign_views import (
+    SECTIONS as VIEW_SECTIONS,
+    get_campaign_view_section,
+    get_campaign_views,
+)
+from backend.map_view import (
+    MAX_ZOOM,
+    WORLD_TRAVEL_DATA,
+    get_map_snapshot,
+    get_map_viewport,
+)
+from backend.view_cache import (
+    campaign_etag,
+    etag_matches,
+    render_projection,
+    rendered_body,
+)
+from backend.turn_trace import list_traces, resolve_trace, trace_retention
+from backend.prompt_cache_report import all_campaigns_report, campaign_report
 from backend.wizard_prompt import load_wizard_system_prompt
-from backend.runtime import ProviderBuildContext, clear_runtime_session
+from backend.runtime import ProviderBuildContext, clear_runtime_session, load_runtime_session
 from backend.wizard_mcp import (
     WizardEvents,
     build_wizard_mcp,
     decode_wizard_events,
 )
 
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background(coro) -> None:
+    """Run ``coro`` detached, keeping a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _game_mcp(config, campaign: str, runtime_id: str) -> Optional[dict]:
+    """In-process MCP servers the game runtime is started with."""
+    if runtime_id != "claude":
+        return None
+    return {"cinematic": build_cinematic_mcp(config.project_root, campaign)}
+
+
+def _recent_campaigns(campaigns_dir: Path, limit: int) -> List[str]:
+    """Campaign names, most recently played (event log written) first."""
+    played = []
+    try:
+        entries = list(campaigns_dir.iterdir())
+    except FileNotFoundError:
+        return []
+    for entry in entries:
+        try:
+            played.append((entry.joinpath(EVENT_LOG_FILENAME).stat().st_mtime, entry.name))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    played.sort(reverse=True)
+    return [name for _mtime, name in played[:limit]]
+
+
+async def _prewarm_campaign(campaign: str) -> bool:
+    """Connect a campaign's provider before anyone opens it.
+
+    Only campaigns without a session are warmed, with the runtime and model
+    they last played (or the default), so a pool prewarm never switches a
+    player's provider.
+    """
+    if peek_session(campaign) is not None or not _valid_campaign_name(campaign):
+        return False
+    config = get_config()
+    campaign_dir = config.project_root / "world-state" / "campaigns" / campaign
+    stored = await run_blocking(None, load_runtime_session, campaign_dir)
+    models, model_name = _model_options()
+    if stored and stored.model_name in models:
+        model_name = stored.model_name
+    system_prompt = await run_blocking(None, load_system_prompt, campaign)
+    try:
+        session = get_or_create_session(campaign, config.project_root, model_name)
+        return await session.prewarm(
+            system_prompt, _game_mcp(config, campaign, session.runtime_id)
+        )
+    except (ValueError, RuntimeError) as exc:
+        print(f"⚠️ [{campaign}] prewarm skipped: {exc}")
+        return False
+
+
+async def _prewarm_recent_campaigns(limit: int) -> None:
+    campaigns = await run_blocking(None, _recent_campaigns, get_config().campaigns_dir, limit)
+    for campaign in campaigns:
+        await _prewarm_campaign(campaign)
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """Validate exposure and report the effective runtime configuration."""
@@ -63,10 +156,20 @@ async def lifespan(_app: FastAPI):
         print(f"Active campaign: {config.campaign_name}")
     else:
         print("No active campaign loaded")
+    start_session_reaper()
+    pool_size = min(prewarm_pool_size(), max_live_providers())
+    if pool_size:
+        print(f"Prewarming providers for up to {pool_size} recent campaign(s)")
+        _spawn_background(_prewarm_recent_campaigns(pool_size))
     try:
         yield
     finally:
+        for task in list(_background_tasks):
+            task.cancel()
         await close_all_sessions()
+        shutdown_blocking_io()
+        shutdown_variant_workers()
+        close_catalogs()
 
 
 app = FastAPI(
@@ -79,6 +182,10 @@ app = FastAPI(
 # Vanilla frontend lives in <project>/frontend — same origin, no CORS needed.
 FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
 
+_WS_SEND_SECONDS = histogram(
+    "dm_ws_send_seconds", "Time to hand one live event to a game WebSocket."
+).labels()
+
 
 # ─────────────────────────── Auth middleware ──────────────────────────────────
 
@@ -144,12 +251,74 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/api/sessions")
+async def get_sessions():
+    """Report live game sessions, their providers and resident memory."""
+    return await session_stats()
+
+
+@app.get("/api/prompt-cache")
+async def get_prompt_cache_report():
+    """Prompt-cache hit ratio and token totals per campaign."""
+    return await run_blocking(None, all_campaigns_report, get_config().campaigns_dir)
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Expose latency histograms and gauges in Prometheus text format."""
+    return Response(
+        content=render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+async def _conditional_json(
+    request: Request,
+    kind: str,
+    campaign_dir: Path,
+    build,
+    extra_files: tuple[str, ...] = (),
+    variant: Optional[str] = None,
+) -> Response:
+    """Serve a revision-validated JSON projection.
+
+    A matching ``If-None-Match`` short-circuits with 304 before any projection
+    work; otherwise the last body rendered for this ETag is reused.  Both steps
+    run on the blocking-I/O pool, and concurrent requests for the same ETag
+    share one projection.  Open-ended query variants (``variant``) share the
+    ETag of their URL's revision but are encoded per request, so they cannot
+    fill the rendered-body cache.
+    """
+    etag = await run_blocking(None, campaign_etag, kind, campaign_dir, extra_files)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if variant is None:
+        body = await run_blocking(
+            ("body", kind, str(campaign_dir), etag),
+            rendered_body,
+            kind,
+            campaign_dir,
+            etag,
+            build,
+        )
+    else:
+        body = await run_blocking(
+            ("body", kind, str(campaign_dir), etag, variant),
+            render_projection,
+            kind,
+            build,
+        )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/status")
-async def get_status(campaign: Optional[str] = None):
+async def get_status(request: Request, campaign: Optional[str] = None):
     """Get current character status for sidebar.
 
     Returns character stats, inventory, and location from world.json via WorldGraph.
-    Uses game_state cache to minimize disk operations.
+    Uses game_state cache to minimize disk operations. Responses carry a
+    revision ETag; a matching If-None-Match is answered with 304.
 
     Args:
         campaign: Campaign name (optional). If given, reads that campaign's
@@ -176,8 +345,16 @@ async def get_status(campaign: Optional[str] = None):
             )
         except (InvalidCampaignName, FileNotFoundError):
             return {"error": "Campaign not found"}
-    status = get_character_status(campaign_dir=campaign_dir)
-    return status
+    else:
+        campaign_dir = get_config().campaign_dir
+    if campaign_dir is None:
+        return await run_blocking(None, get_character_status)
+    return await _conditional_json(
+        request,
+        "status",
+        campaign_dir,
+        lambda: get_character_status(campaign_dir=campaign_dir),
+    )
 
 
 # ─────────────────────────── Pydantic Schemas ──────────────────────────────────
@@ -204,7 +381,7 @@ async def api_list_campaigns():
     Returns:
         list: Campaign list with fields name, active, created_at, genre, tone, description
     """
-    return list_campaigns()
+    return await run_blocking(None, list_campaigns)
 
 
 @app.post("/api/campaigns", status_code=201)
@@ -234,6 +411,9 @@ async def api_create_campaign(body: CreateCampaignRequest):
         status_code = 409 if "already exists" in error_msg else 400
         raise HTTPException(status_code=status_code, detail=error_msg)
 
+    if prewarm_pool_size():
+        # The creator usually opens the new campaign next.
+        _spawn_background(_prewarm_campaign(result["name"]))
     return result
 
 
@@ -310,25 +490,159 @@ def _campaign_path(name: str) -> Path:
         raise HTTPException(status_code=404, detail="Campaign not found") from exc
 
 
+def _view_sections(raw: Optional[str]) -> Optional[tuple[str, ...]]:
+    """Parse a comma-separated ``?sections=`` selection into canonical order.
+
+    Any permutation or repetition of the same sections yields one tuple, so
+    the selection cannot multiply cache keys or metric labels.
+    """
+    if raw is None:
+        return None
+    requested = {part.strip() for part in raw.split(",") if part.strip()}
+    unknown = sorted(requested.difference(VIEW_SECTIONS))
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown view sections: {', '.join(unknown) or raw!r}",
+        )
+    return tuple(section for section in VIEW_SECTIONS if section in requested)
+
+
 @app.get("/api/campaigns/{name}/views")
-async def api_campaign_views(name: str):
-    return get_campaign_views(_campaign_path(name))
+async def api_campaign_views(
+    name: str,
+    request: Request,
+    sections: Optional[str] = None,
+):
+    """Player-facing dashboard views; ``?sections=inventory,quests`` limits them."""
+    campaign_dir = _campaign_path(name)
+    selected = _view_sections(sections)
+    # ETags are compared as comma-separated lists, so keep commas out of them.
+    kind = "views" if selected is None else "views." + ".".join(selected)
+    return await _conditional_json(
+        request,
+        kind,
+        campaign_dir,
+        lambda: get_campaign_views(campaign_dir, selected),
+    )
+
+
+@app.get("/api/campaigns/{name}/views/{section}")
+async def api_campaign_view_section(name: str, section: str, request: Request):
+    """A single dashboard section, computed without the others."""
+    if section not in VIEW_SECTIONS:
+        raise HTTPException(status_code=404, detail="Unknown view section")
+    campaign_dir = _campaign_path(name)
+    return await _conditional_json(
+        request,
+        f"view-{section}",
+        campaign_dir,
+        lambda: get_campaign_view_section(campaign_dir, section),
+    )
+
+
+def _map_bbox(raw: Optional[str]) -> Optional[tuple[float, float, float, float]]:
+    """Parse ``?bbox=min_x,min_y,max_x,max_y`` in world coordinates."""
+    if raw is None:
+        return None
+    try:
+        values = tuple(float(part) for part in raw.split(","))
+    except ValueError:
+        values = ()
+    if (
+        len(values) != 4
+        or not all(math.isfinite(value) for value in values)
+        or values[0] > values[2]
+        or values[1] > values[3]
+    ):
+        raise HTTPException(
+            status_code=400, detail="bbox must be min_x,min_y,max_x,max_y"
+        )
+    return values
 
 
 @app.get("/api/campaigns/{name}/map")
-async def api_campaign_map(name: str):
-    return get_map_snapshot(_campaign_path(name))
+async def api_campaign_map(
+    name: str,
+    request: Request,
+    bbox: Optional[str] = None,
+    zoom: Optional[int] = Query(None, ge=0, le=MAX_ZOOM),
+):
+    """Map snapshot; ``?bbox=&zoom=`` returns only the viewport, clustered."""
+    campaign_dir = _campaign_path(name)
+    if bbox is None and zoom is None:
+        return await _conditional_json(
+            request,
+            "map",
+            campaign_dir,
+            lambda: get_map_snapshot(campaign_dir),
+            (WORLD_TRAVEL_DATA,),
+        )
+    viewport = _map_bbox(bbox)
+    return await _conditional_json(
+        request,
+        "map-view",
+        campaign_dir,
+        lambda: get_map_viewport(campaign_dir, viewport, zoom or 0),
+        (WORLD_TRAVEL_DATA,),
+        variant=f"{viewport}:{zoom or 0}",
+    )
 
 
 @app.get("/api/campaigns/{name}/media/{filename}")
-async def api_campaign_media(name: str, filename: str):
+async def api_campaign_media(
+    name: str,
+    filename: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=8192),
+):
+    """Serve a generated image, or its best variant for ``Accept`` and ``?w=``."""
+    campaign_dir = _campaign_path(name)
     try:
-        path = resolve_campaign_media(_campaign_path(name), filename)
+        path = resolve_campaign_media(campaign_dir, filename)
+        selection = await run_blocking(
+            None, select_variant, campaign_dir, filename, request.headers.get("accept", ""), w
+        )
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail="Campaign image not found") from exc
+    # While variants are still encoding, the original must not be cached for
+    # good under a URL that will soon have a smaller answer.
+    cache_control = (
+        "private, no-cache" if selection.pending else "private, max-age=31536000, immutable"
+    )
+    headers = {"Cache-Control": cache_control, "Vary": "Accept"}
+    variant = selection.variant
+    if variant is None:
+        return FileResponse(path, headers=headers)
+    return FileResponse(variant.path, media_type=variant.mime_type, headers=headers)
+
+
+@app.get("/api/campaigns/{name}/traces")
+async def api_campaign_traces(name: str):
+    """List the stored per-turn traces of a campaign, newest first."""
+    campaign_dir = _campaign_path(name)
+    traces = await run_blocking(None, list_traces, campaign_dir)
+    return {"traces": traces, "retention": trace_retention()}
+
+
+@app.get("/api/campaigns/{name}/prompt-cache")
+async def api_campaign_prompt_cache(name: str, limit: int = Query(50, ge=0, le=500)):
+    """Provider prompt-cache hit ratio of a campaign's turns, newest first."""
+    campaign_dir = _campaign_path(name)
+    return await run_blocking(None, campaign_report, campaign_dir, limit)
+
+
+@app.get("/api/campaigns/{name}/traces/{trace_id}")
+async def api_campaign_trace(name: str, trace_id: str):
+    """Download one turn trace (Chrome trace JSON, opens in Perfetto)."""
+    try:
+        path = resolve_trace(_campaign_path(name), trace_id)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Turn trace not found") from exc
     return FileResponse(
         path,
-        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+        media_type="application/json",
+        filename=f"{name}-{trace_id}.json",
     )
 
 
@@ -753,7 +1067,8 @@ async def game_websocket(websocket: WebSocket):
         return
 
     config = get_config()
-    system_prompt = load_system_prompt(campaign)  # scope rules/narrator to THIS campaign
+    # Scope rules/narrator to THIS campaign; a cache miss runs the rules compiler.
+    system_prompt = await run_blocking(None, load_system_prompt, campaign)
     # Optional model override from the client's model-select. Unknown/absent → config default.
     allowed, default_model = _model_options()
     requested_model = websocket.query_params.get("model")
@@ -775,11 +1090,10 @@ async def game_websocket(websocket: WebSocket):
         await websocket.close(code=1008)
         return
 
-    game_mcp = (
-        {"cinematic": build_cinematic_mcp(config.project_root, campaign)}
-        if requested_runtime == "claude"
-        else None
-    )
+    game_mcp = _game_mcp(config, campaign, requested_runtime)
+    if prewarm_on_connect():
+        # Start the provider while the player reads the history.
+        session.start_prewarm(system_prompt, mcp_servers=game_mcp)
     queue = broker.subscribe(campaign)
     try:
         # Subscribe before replay so events emitted while a large history is sent
@@ -812,7 +1126,9 @@ async def game_websocket(websocket: WebSocket):
             if queue_task in done:
                 receive_task.cancel()
                 event = queue_task.result()
+                started = time.perf_counter()
                 await websocket.send_text(json.dumps(event, ensure_ascii=False))
+                _WS_SEND_SECONDS.observe(time.perf_counter() - started)
 
     except WebSocketDisconnect:
         print(f"🔌 [{campaign}] WebSocket disconnected (turn keeps running if active)")
@@ -0,0 +1,246 @@
+"""Per-turn span recording exported as Chrome / Perfetto trace JSON.
+
+A turn's wall time is spread over the model, tool calls (``dm-*.sh``
+subprocesses run by the provider), event-log writes, image publishing and
+broadcasts.  ``TurnTrace`` records each of those as a span and
+``save_trace`` writes one ``traces/turn-<event id>.json`` per turn, which
+opens directly in ``chrome://tracing`` or https://ui.perfetto.dev.  Only the
+newest ``DND_TRACE_RETENTION`` traces per campaign are kept; ``0`` turns
+tracing off.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+TRACE_DIRNAME = "traces"
+DEFAULT_RETENTION = 50
+_TRACE_NAME = re.compile(r"^turn-\d+$")
+
+_PID = 1
+_TURN_TID = 1
+_TOOL_TID = 2
+
+
+def trace_retention() -> int:
+    """Traces kept per campaign from ``DND_TRACE_RETENTION``; 0 disables."""
+    try:
+        return max(0, int(os.environ.get("DND_TRACE_RETENTION", DEFAULT_RETENTION)))
+    except ValueError:
+        return DEFAULT_RETENTION
+
+
+class TurnTrace:
+    """Spans of one turn, timestamped in microseconds from its start."""
+
+    def __init__(self, trace_id: str, campaign: str, runtime_id: str, model_name: str):
+        self.trace_id = trace_id
+        self.campaign = campaign
+        self.runtime_id = runtime_id
+        self.model_name = model_name
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._events: list[dict[str, Any]] = []
+        self._open_tools: dict[str, tuple[float, str]] = {}
+        self._tool_seq = 0
+        self.stream_deltas = 0
+        self.stream_publish_seconds = 0.0
+
+    def _us(self, at: float) -> float:
+        return round((at - self._origin) * 1_000_000, 1)
+
+    def complete(self, name: str, cat: str, started: float, **args: Any) -> None:
+        """Record a span that began at ``started`` (a ``perf_counter`` value)."""
+        ended = time.perf_counter()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": self._us(started),
+            "dur": self._us(ended) - self._us(started),
+            "pid": _PID,
+            "tid": _TURN_TID,
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, cat: str, **args: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, started, **args)
+
+    def instant(self, name: str, cat: str, **args: Any) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "i",
+            "s": "t",
+            "ts": self._us(time.perf_counter()),
+            "pid": _PID,
+            "tid": _TURN_TID,
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def tool_started(self, tool_use_id: str, name: str, detail: str = "") -> None:
+        """Open an async span; tool calls may overlap, so they get their own track."""
+        if not tool_use_id:
+            self._tool_seq += 1
+            tool_use_id = f"anonymous-{self._tool_seq}"
+        self._open_tools[tool_use_id] = (time.perf_counter(), name)
+        event = {
+            "name": name,
+            "cat": "tool",
+            "ph": "b",
+            "id": tool_use_id,
+            "ts": self._us(self._open_tools[tool_use_id][0]),
+            "pid": _PID,
+            "tid": _TOOL_TID,
+        }
+        if detail:
+            event["args"] = {"input": detail[:500]}
+        self._events.append(event)
+
+    def tool_finished(self, tool_use_id: str, **args: Any) -> None:
+        if tool_use_id not in self._open_tools:
+            # Providers without result ids close the oldest open call.
+            if tool_use_id or not self._open_tools:
+                return
+            tool_use_id = next(iter(self._open_tools))
+        _started, name = self._open_tools.pop(tool_use_id)
+        event = {
+            "name": name,
+            "cat": "tool",
+            "ph": "e",
+            "id": tool_use_id,
+            "ts": self._us(time.perf_counter()),
+            "pid": _PID,
+            "tid": _TOOL_TID,
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def to_json(self, **turn_args: Any) -> dict[str, Any]:
+        """Return the trace, closing the turn span and any unfinished tools."""
+        for tool_use_id in list(self._open_tools):
+            self.tool_finished(tool_use_id, unfinished=True)
+        turn = {
+            "name": "turn",
+            "cat": "turn",
+            "ph": "X",
+            "ts": 0,
+            "dur": self._us(time.perf_counter()),
+            "pid": _PID,
+            "tid": _TURN_TID,
+            "args": {
+                "runtime": self.runtime_id,
+                "model": self.model_name,
+                "stream_deltas": self.stream_deltas,
+                "stream_publish_us": round(self.stream_publish_seconds * 1_000_000, 1),
+                **turn_args,
+            },
+        }
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": _PID, "args": {"name": self.campaign}},
+            {"name": "thread_name", "ph": "M", "pid": _PID, "tid": _TURN_TID, "args": {"name": "turn"}},
+            {"name": "thread_name", "ph": "M", "pid": _PID, "tid": _TOOL_TID, "args": {"name": "tools"}},
+        ]
+        return {
+            "traceEvents": [*metadata, turn, *self._events],
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "trace_id": self.trace_id,
+                "campaign": self.campaign,
+                "runtime": self.runtime_id,
+                "model": self.model_name,
+                "started_at": self.started_at,
+            },
+        }
+
+
+def _trace_dir(campaign_dir: Path) -> Path:
+    return Path(campaign_dir) / TRACE_DIRNAME
+
+
+def _turn_number(path: Path) -> int:
+    return int(path.stem.removeprefix("turn-"))
+
+
+def _trace_files(campaign_dir: Path) -> list[Path]:
+    """Stored traces, newest turn first."""
+    directory = _trace_dir(campaign_dir)
+    try:
+        paths = [
+            path for path in directory.iterdir()
+            if path.suffix == ".json" and _TRACE_NAME.fullmatch(path.stem)
+        ]
+    except FileNotFoundError:
+        return []
+    return sorted(paths, key=_turn_number, reverse=True)
+
+
+def save_trace(
+    campaign_dir: Path,
+    trace: TurnTrace,
+    retention: int | None = None,
+    **turn_args: Any,
+) -> Path | None:
+    """Write ``trace`` atomically and prune all but the newest ``retention``."""
+    retention = trace_retention() if retention is None else retention
+    if retention <= 0:
+        return None
+    directory = _trace_dir(campaign_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{trace.trace_id}.json"
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(trace.to_json(**turn_args), handle, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    for stale in _trace_files(campaign_dir)[retention:]:
+        try:
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+    return path
+
+
+def list_traces(campaign_dir: Path) -> list[dict[str, Any]]:
+    """Describe stored traces, newest first, without parsing them."""
+    traces = []
+    for path in _trace_files(campaign_dir):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        traces.append({"id": path.stem, "size": stat.st_size, "modified": stat.st_mtime})
+    return traces
+
+
+def resolve_trace(campaign_dir: Path, trace_id: str) -> Path:
+    """Resolve one stored trace without allowing traversal or arbitrary files."""
+    if not _TRACE_NAME.fullmatch(trace_id):
+        raise FileNotFoundError(trace_id)
+    path = _trace_dir(campaign_dir) / f"{trace_id}.json"
+    if not path.is_file():
+        raise FileNotFoundError(trace_id)
+    return path
@@ -0,0 +1,181 @@
+"""Revision-keyed validators and rendered-body cache for read-only endpoints.
+
+Dashboard polling hits ``/views``, ``/map`` and ``/api/status`` far more often
+than the world changes.  A strong ETag is derived from ``world.json``
+``meta.revision`` plus the stamps of the other files a projection reads, so an
+unchanged campaign costs a few ``stat`` calls: no flock, no projection and no
+JSON encoding.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+from lib.metrics import histogram
+
+FileStamp = tuple[int, int, int]
+
+_revision_lock = threading.Lock()
+_world_revisions: dict[str, tuple[FileStamp, int]] = {}
+
+# Latest body per (endpoint, campaign) in least-recently-used order.
+_BODY_LIMIT = 128
+_body_lock = threading.Lock()
+_rendered_bodies: "OrderedDict[tuple[str, str], tuple[str, bytes]]" = OrderedDict()
+
+_PROJECTION_SECONDS = histogram(
+    "dm_view_projection_seconds",
+    "Time to project and encode a read-only view on a cache miss.",
+    ("view",),
+)
+
+
+def file_stamp(path: Path) -> FileStamp | None:
+    """Return ``(inode, mtime_ns, size)`` or ``None`` for a missing file.
+
+    Writers replace files atomically, so the inode changes on every commit even
+    when two writes land within the filesystem's mtime granularity.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+_META_PREFIX = re.compile(r'\s*\{\s*"meta"\s*:\s*')
+_META_PROBE_BYTES = 64 * 1024
+
+
+def _read_meta(world_file: Path) -> dict:
+    """Decode only the leading ``meta`` object when the file starts with it.
+
+    WorldRepository always writes ``meta`` first, so the revision is found
+    without parsing the whole graph; other layouts fall back to a full parse.
+    """
+    with world_file.open(encoding="utf-8") as handle:
+        head = handle.read(_META_PROBE_BYTES)
+        match = _META_PREFIX.match(head)
+        if match:
+            try:
+                meta, _ = json.JSONDecoder().raw_decode(head, match.end())
+                return meta if isinstance(meta, dict) else {}
+            except json.JSONDecodeError:
+                pass
+        handle.seek(0)
+        return json.load(handle).get("meta", {})
+
+
+def world_revision(campaign_dir: Path | str) -> tuple[int, FileStamp | None]:
+    """Return ``(meta.revision, stamp)`` for a campaign's ``world.json``.
+
+    The file is parsed only when its stamp changes; readers never need the
+    repository lock because commits are published with ``os.replace``.
+    """
+    world_file = Path(campaign_dir) / "world.json"
+    stamp = file_stamp(world_file)
+    if stamp is None:
+        return 0, None
+    key = str(world_file)
+    with _revision_lock:
+        cached = _world_revisions.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1], stamp
+    try:
+        revision = int(_read_meta(world_file).get("revision", 0))
+    except (OSError, ValueError, TypeError, AttributeError):
+        revision = 0
+    with _revision_lock:
+        _world_revisions[key] = (stamp, revision)
+    return revision, stamp
+
+
+def campaign_etag(
+    kind: str,
+    campaign_dir: Path | str,
+    extra_files: tuple[str, ...] = (),
+) -> str:
+    """Build a strong ETag for one projection of one campaign.
+
+    ``extra_files`` are campaign-relative paths the projection also reads, for
+    example ``module-data/world-travel.json`` for the map.
+    """
+    campaign_path = Path(campaign_dir)
+    revision, world_stamp = world_revision(campaign_path)
+    parts = [kind, str(revision), repr(world_stamp)]
+    for relative in ("campaign-overview.json", *extra_files):
+        parts.append(f"{relative}={file_stamp(campaign_path / relative)!r}")
+    digest = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{kind}-{revision}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evaluate ``If-None-Match`` using the weak comparison RFC 9110 requires."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return etag in (value.removeprefix("W/") for value in candidates)
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode exactly like FastAPI's ``JSONResponse``."""
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def render_projection(kind: str, build: Callable[[], Any]) -> bytes:
+    """Build and encode one projection, recording how long it took."""
+    started = time.perf_counter()
+    body = encode_json(build())
+    _PROJECTION_SECONDS.labels(kind).observe(time.perf_counter() - started)
+    return body
+
+
+def rendered_body(
+    kind: str,
+    campaign_dir: Path | str,
+    etag: str,
+    build: Callable[[], Any],
+) -> bytes:
+    """Return the encoded body for ``etag``, building it only on a miss.
+
+    Only the most recent body per endpoint and campaign is kept; an older
+    revision can never be requested again once its ETag is superseded.  At
+    most ``_BODY_LIMIT`` bodies are held, evicting the least recently used.
+    """
+    key = (kind, str(campaign_dir))
+    with _body_lock:
+        cached = _rendered_bodies.get(key)
+        if cached and cached[0] == etag:
+            _rendered_bodies.move_to_end(key)
+            return cached[1]
+    body = render_projection(kind, build)
+    with _body_lock:
+        _rendered_bodies[key] = (etag, body)
+        _rendered_bodies.move_to_end(key)
+        while len(_rendered_bodies) > _BODY_LIMIT:
+            _rendered_bodies.popitem(last=False)
+    return body
+
+
+def clear_view_cache() -> None:
+    """Drop every cached revision and rendered body."""
+    with _revision_lock:
+        _world_revisions.clear()
+    with _body_lock:
+        _rendered_bodies.clear()
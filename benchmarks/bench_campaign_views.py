@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark CampaignViewProjector on a synthetic 10k-node world.
+
+Reports a cold projection (nothing cached), a warm projection (sections
+memoized for the current revision), an incremental projection after one quest
+changed (only the quests section is rebuilt) and, for reference,
+the cost of one uncached WorldGraph read, which the projector previously paid
+on every get_node/list_nodes/get_edges call.
+
+Usage:
+  uv run python benchmarks/bench_campaign_views.py [--nodes 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.campaign_views import clear_section_cache, get_campaign_views  # noqa: E402
+from backend.view_cache import clear_view_cache  # noqa: E402
+from lib.world_graph import WorldGraph  # noqa: E402
+
+WIKI_SHARE = ("item", "weapon", "spell", "potion", "material")
+
+
+def build_world(node_count: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    nodes = {
+        "player:active": {
+            "type": "player",
+            "name": "Bench",
+            "data": {"hp": {"current": 10, "max": 12}, "money": 500, "stats": {"str": 12}},
+            "inventory": {
+                "stackable": {f"Ration {i}": {"qty": 2, "weight": 0.5} for i in range(40)},
+                "unique": [f"Trinket {i} [0.1kg]" for i in range(20)],
+            },
+        }
+    }
+    edges = []
+    per_kind = max(1, (node_count - 1) // 5)
+    locations = [f"location:loc-{i}" for i in range(per_kind)]
+    for node_id in locations:
+        nodes[node_id] = {"type": "location", "name": node_id.title(), "data": {}}
+    for i in range(per_kind):
+        npc_id = f"npc:npc-{i}"
+        nodes[npc_id] = {
+            "type": "npc",
+            "name": f"Npc {i}",
+            "data": {"description": "Someone", "party_member": i < 4},
+        }
+        edges.append({"from": npc_id, "to": rng.choice(locations), "type": "at"})
+        if i % 3 == 0:
+            edges.append({"from": npc_id, "to": "player:active", "type": "known_by"})
+    for i in range(per_kind):
+        kind = WIKI_SHARE[i % len(WIKI_SHARE)]
+        node_id = f"{kind}:entry-{i}"
+        nodes[node_id] = {
+            "type": kind,
+            "name": f"Entry {i}",
+            "data": {"description": "Lore", "mechanics": {"dc": 12, "gm_notes": "x"}},
+        }
+        if i % 4 == 0:
+            edges.append({"from": "player:active", "to": node_id, "type": "trained"})
+    for i in range(per_kind):
+        nodes[f"quest:quest-{i}"] = {
+            "type": "quest",
+            "name": f"Quest {i}",
+            "data": {"status": "active", "objectives": [{"text": "Go", "done": i % 2 == 0}]},
+        }
+    while len(nodes) < node_count:
+        i = len(nodes)
+        nodes[f"consequence:c-{i}"] = {
+            "type": "consequence",
+            "name": f"Consequence {i}",
+            "data": {"status": rng.choice(["pending", "triggered"]), "description": "Later"},
+        }
+    return {"meta": {"version": 2, "schema": "graph", "revision": 1}, "nodes": nodes, "edges": edges}
+
+
+def timed(callable_, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callable_()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        campaign = Path(tmp) / "bench"
+        campaign.mkdir()
+        world = build_world(args.nodes)
+        (campaign / "world.json").write_text(json.dumps(world), encoding="utf-8")
+        (campaign / "campaign-overview.json").write_text(
+            json.dumps({"name": "bench"}), encoding="utf-8"
+        )
+        graph = WorldGraph(campaign_dir=campaign)
+
+        def cold():
+            clear_section_cache()
+            clear_view_cache()
+            get_campaign_views(campaign)
+
+        cold_ms = timed(cold, args.repeat)
+        get_campaign_views(campaign)
+        warm_ms = timed(lambda: get_campaign_views(campaign), args.repeat)
+
+        def after_quest_update():
+            graph.update_node("quest:quest-0", {"data": {"status": "completed"}})
+            started = time.perf_counter()
+            get_campaign_views(campaign)
+            return (time.perf_counter() - started) * 1000
+
+        incremental_ms = [after_quest_update() for _ in range(args.repeat)]
+        read_ms = timed(lambda: graph.list_nodes(node_type="quest"), args.repeat)
+
+    size_mb = len(json.dumps(world)) / 1e6
+    print(f"world: {len(world['nodes'])} nodes, {len(world['edges'])} edges, {size_mb:.1f} MB")
+    for label, samples in (
+        ("cold snapshot (load + index + 8 sections)", cold_ms),
+        ("warm snapshot (memoized by revision)", warm_ms),
+        ("snapshot after one quest update", incremental_ms),
+        ("one uncached WorldGraph read (reference)", read_ms),
+    ):
+        print(f"{label:<44} median {statistics.median(samples):9.2f} ms  min {min(samples):9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
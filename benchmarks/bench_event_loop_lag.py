@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Measure asyncio event-loop lag while campaign views are projected under load.
+
+A ticker coroutine sleeps 1 ms in a loop and records how late it wakes up;
+meanwhile concurrent clients poll /api/campaigns/{name}/views on a synthetic
+world whose revision is bumped between rounds, so every round needs a fresh
+projection.  The run is repeated with the handlers' blocking work executed
+inline on the loop (the previous behaviour) and on the blocking-I/O pool.
+
+Usage:
+  uv run python benchmarks/bench_event_loop_lag.py [--nodes 10000] [--clients 16] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import backend.server as server_module  # noqa: E402
+from backend.blocking_io import run_blocking, shutdown_blocking_io  # noqa: E402
+from backend.campaign_views import clear_section_cache  # noqa: E402
+from backend.view_cache import clear_view_cache  # noqa: E402
+from bench_campaign_views import build_world  # noqa: E402
+from lib.world_graph import WorldGraph  # noqa: E402
+
+
+async def run_inline(_key, func, *args):
+    return func(*args)
+
+
+async def measure(campaigns_dir: Path, clients: int, rounds: int, runner) -> dict:
+    server_module.run_blocking = runner
+    clear_section_cache()
+    clear_view_cache()
+    graph = WorldGraph(campaign_dir=campaigns_dir / "bench")
+    lags: list[float] = []
+    projections = 0
+    real_views = server_module.get_campaign_views
+
+    def counting_views(path, sections=None):
+        nonlocal projections
+        projections += 1
+        return real_views(path, sections)
+
+    server_module.get_campaign_views = counting_views
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - started) * 1000 - 1.0)
+
+    transport = httpx.ASGITransport(app=server_module.app)
+    tick_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for round_no in range(rounds):
+                # The write itself is not under test; keep it off the loop too.
+                await asyncio.to_thread(
+                    graph.update_node, "quest:quest-0", {"data": {"round": round_no}}
+                )
+                responses = await asyncio.gather(
+                    *(client.get("/api/campaigns/bench/views") for _ in range(clients))
+                )
+                assert all(response.status_code == 200 for response in responses)
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await tick_task
+        server_module.get_campaign_views = real_views
+    lags.sort()
+    return {
+        "p50": statistics.median(lags),
+        "p99": lags[int(len(lags) * 0.99) - 1],
+        "max": lags[-1],
+        "projections": projections,
+        "wall": elapsed * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        campaigns_dir = Path(tmp) / "campaigns"
+        campaign = campaigns_dir / "bench"
+        campaign.mkdir(parents=True)
+        (campaign / "world.json").write_text(
+            json.dumps(build_world(args.nodes)), encoding="utf-8"
+        )
+        (campaign / "campaign-overview.json").write_text(
+            json.dumps({"name": "bench"}), encoding="utf-8"
+        )
+
+        class BenchConfig:
+            project_root = PROJECT_ROOT
+            campaigns_dir = Path(tmp) / "campaigns"
+            campaign_dir = None
+
+        server_module.get_config = lambda: BenchConfig()
+        print(f"{args.nodes} nodes, {args.clients} concurrent clients, {args.rounds} revisions")
+        for label, runner in (("inline on event loop", run_inline), ("blocking-I/O pool", run_blocking)):
+            result = asyncio.run(measure(campaigns_dir, args.clients, args.rounds, runner))
+            print(
+                f"{label:<22} loop lag p50 {result['p50']:7.2f} ms  p99 {result['p99']:7.2f} ms"
+                f"  max {result['max']:7.2f} ms  projections {result['projections']:3d}"
+                f"  wall {result['wall']:8.1f} ms"
+            )
+        shutdown_blocking_io()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Measure the per-sample cost of metrics instrumentation.
+
+Times ``observe()`` on a histogram child and ``inc()`` on a counter child,
+alone and together with the two ``perf_counter()`` calls every instrumented
+hot path makes, from one thread and from several concurrent threads.
+
+Usage:
+  uv run python benchmarks/bench_metrics.py [--samples 1000000] [--threads 4]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.metrics import MetricsRegistry  # noqa: E402
+
+
+def per_sample_ns(body, samples: int) -> float:
+    started = time.perf_counter()
+    body(samples)
+    return (time.perf_counter() - started) / samples * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    child = registry.histogram("bench_seconds", "Bench.", ("stage",)).labels("load")
+    calls = registry.counter("bench_calls", "Bench.").labels()
+    clock = time.perf_counter
+
+    def observe(samples):
+        for _ in range(samples):
+            child.observe(0.003)
+
+    def timed(samples):
+        for _ in range(samples):
+            started = clock()
+            child.observe(clock() - started)
+
+    def increment(samples):
+        for _ in range(samples):
+            calls.inc()
+
+    def empty(samples):
+        for _ in range(samples):
+            pass
+
+    loop = per_sample_ns(empty, args.samples)
+    for label, body in (
+        ("histogram observe", observe),
+        ("perf_counter x2 + observe", timed),
+        ("counter inc", increment),
+    ):
+        print(f"{label:<28} {per_sample_ns(body, args.samples) - loop:7.1f} ns/sample")
+
+    share = args.samples // args.threads
+    workers = [threading.Thread(target=timed, args=(share,)) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = (time.perf_counter() - started) / (share * args.threads) * 1e9
+    print(f"{'timed, ' + str(args.threads) + ' threads':<28} {elapsed - loop:7.1f} ns/sample (wall)")
+
+
+if __name__ == "__main__":
+    main()
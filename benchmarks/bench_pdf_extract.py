@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark page-parallel PDF text extraction.
+
+Writes a synthetic text PDF (``--pages`` pages of dense prose) and times
+``PDFExtractor.extract`` with a cold page cache for each ``--workers``
+count, then once more with the page cache warm.  Also reports how soon the
+first page reaches ``iter_pages`` consumers, which is when the ingest
+pipeline can start chunking and embedding.
+
+Speed-up is bounded by the CPUs actually available; the CPU count is printed
+next to the results.
+
+Usage:
+  uv run python benchmarks/bench_pdf_extract.py [--pages 500] [--workers 1 4 8]
+                                                [--library pdfplumber]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.content_extractor import PDFExtractor  # noqa: E402
+
+WORDS = (
+    "the drowned abbey bell tolls beneath grey water while smugglers count "
+    "their silver and the lighthouse keeper watches the reef for lanterns"
+).split()
+
+
+def write_pdf(path: Path, pages: int, lines_per_page: int = 45, seed: int = 3):
+    """Minimal uncompressed PDF with Helvetica text, one content stream per page."""
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page in range(pages):
+        lines = [f"Chapter {page + 1}"] + [
+            " ".join(rng.choice(WORDS) for _ in range(14)) for _ in range(lines_per_page)
+        ]
+        text = "".join(f"({line}) Tj T* " for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 800 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref
+    )
+    path.write_bytes(bytes(out))
+
+
+def timed_extract(pdf: Path, workers: int, cache_dir: Path, library: str) -> tuple:
+    extractor = PDFExtractor(workers=workers, cache_dir=str(cache_dir))
+    if library == "pypdf2":
+        extractor.pdfplumber_available = False
+    started = time.perf_counter()
+    first_page = None
+    chars = 0
+    for piece in extractor.iter_pages(str(pdf)):
+        if first_page is None:
+            first_page = time.perf_counter() - started
+        chars += len(piece)
+    return time.perf_counter() - started, first_page, chars
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--library", choices=["pdfplumber", "pypdf2"], default="pdfplumber")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = Path(tmp) / "bench.pdf"
+        write_pdf(pdf, args.pages)
+        print(
+            f"{args.pages}-page PDF ({pdf.stat().st_size / 1e6:.1f} MB), {args.library}, "
+            f"{os.cpu_count()} CPUs available"
+        )
+        baseline = None
+        for workers in args.workers:
+            cache_dir = Path(tmp) / f"cache-{workers}"
+            wall, first_page, chars = timed_extract(pdf, workers, cache_dir, args.library)
+            baseline = baseline or wall
+            print(
+                f"  {workers} worker(s)  cold {wall:7.2f}s  first page {first_page:6.2f}s  "
+                f"speed-up {baseline / wall:4.2f}x  ({chars:,} chars)"
+            )
+        wall, first_page, _ = timed_extract(pdf, args.workers[-1], cache_dir, args.library)
+        print(f"  page cache warm  {wall:7.2f}s  first page {first_page:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compare first-turn time-to-first-token with and without provider prewarm.
+
+Cold: the player opens a campaign, reads for ``--think`` seconds and sends a
+message; the provider process is started by that first turn.  Prewarmed:
+the same, but ``GameSession.start_prewarm`` runs when the campaign opens
+(what ``DND_PREWARM=1`` does on ``/ws/game``), so the start-up overlaps the
+player's reading time.
+
+The replay runtime stands in for a provider with ``--connect`` seconds of
+start-up cost.  ``--model`` with a real model id (e.g. claude-sonnet-5 or
+gpt-5.6-terra) measures the actual CLI instead; that needs the CLI and a
+login.
+
+Usage:
+  uv run python benchmarks/bench_prewarm.py [--runs 5] [--connect 2.0] [--think 3.0]
+                                            [--model replay]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import backend.game_session as game_session  # noqa: E402
+from backend.live_broker import broker  # noqa: E402
+from backend.runtime import create_default_registry, register_replay_runtime  # noqa: E402
+
+SYSTEM_PROMPT = "You are the game master."
+
+
+async def first_turn_ttft(root: Path, campaign: str, model: str, prewarm: bool, think: float) -> float:
+    campaign_dir = root / "world-state" / "campaigns" / campaign
+    campaign_dir.mkdir(parents=True)
+    (campaign_dir / "campaign-overview.json").write_text(json.dumps({"name": campaign}))
+    session = game_session.get_or_create_session(campaign, root, model)
+    queue = broker.subscribe(campaign)
+    try:
+        if prewarm:
+            session.start_prewarm(SYSTEM_PROMPT)
+        await asyncio.sleep(think)
+        sent = time.perf_counter()
+        session.send("I look around the harbour.", SYSTEM_PROMPT)
+        while True:
+            event = await queue.get()
+            if event.get("type") in {"stream", "text"}:
+                ttft = time.perf_counter() - sent
+                break
+        await session._turn_task
+    finally:
+        broker.unsubscribe(campaign, queue)
+    await session.provider.close()
+    game_session._sessions.pop(campaign, None)
+    return ttft
+
+
+def _summary(values: list[float]) -> str:
+    return (
+        f"median {statistics.median(values) * 1000:8.1f} ms  "
+        f"min {min(values) * 1000:8.1f} ms  max {max(values) * 1000:8.1f} ms"
+    )
+
+
+async def run(args) -> dict[str, list[float]]:
+    registry = create_default_registry()
+    if args.model == "replay":
+        register_replay_runtime(registry, speed=args.speed, connect_seconds=args.connect)
+    game_session._registry = registry
+    results: dict[str, list[float]] = {"cold": [], "prewarmed": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for run_index in range(args.runs):
+            for mode in results:
+                campaign = f"bench-{mode}-{run_index}"
+                results[mode].append(
+                    await first_turn_ttft(
+                        Path(tmp), campaign, args.model, mode == "prewarmed", args.think
+                    )
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--model", default="replay", help="model id; 'replay' simulates start-up")
+    parser.add_argument("--connect", type=float, default=2.0, help="replay start-up seconds")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed-up")
+    parser.add_argument("--think", type=float, default=3.0, help="seconds before the first message")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    detail = f", simulated start-up {args.connect:g}s" if args.model == "replay" else ""
+    print(f"first-turn TTFT, model {args.model}, {args.runs} runs, {args.think:g}s think time{detail}")
+    for mode, values in results.items():
+        print(f"  {mode:<10} {_summary(values)}")
+    saved = statistics.median(results["cold"]) - statistics.median(results["prewarmed"])
+    print(f"  prewarm saves {saved * 1000:.1f} ms at the median")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of /ws/game against the offline replay runtime.
+
+Starts the real server in a subprocess on a throwaway world-state with the
+``replay`` runtime enabled, opens N WebSocket clients spread over M
+campaigns and has one client per campaign play a number of turns while the
+others watch.  Every turn replays the same recorded provider events
+(streamed text, a tool call, an image and a rate-limit notice) with their
+recorded pacing.
+
+Reported:
+  throughput      turns and delivered events per second of wall time
+  delivery lag    arrival of each persisted event minus its recorded offset
+                  from the moment the turn was sent (server + fan-out cost)
+  fan-out spread  arrival of an event at a subscriber minus its first arrival
+  memory          server RSS growth per live session (campaign)
+
+Usage:
+  uv run python benchmarks/load_test.py [--clients 40] [--campaigns 10] [--turns 5]
+                                        [--speed 4] [--recording builtin]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+PERSISTED_TYPES = {"text", "error", "image", "tool_use", "tool_result", "thinking", "file_change", "activity"}
+
+
+def serve(root: Path, port: int) -> None:
+    """Child process: the real app, scoped to ``root`` and the replay model."""
+    import uvicorn
+
+    import backend.server as server_module
+
+    class LoadTestConfig:
+        project_root = root
+        campaigns_dir = root / "world-state" / "campaigns"
+        model_name = "replay"
+        backend_host = "127.0.0.1"
+        backend_port = port
+        campaign_name = None
+        campaign_dir = None
+
+    server_module.get_config = lambda: LoadTestConfig()
+    server_module.load_system_prompt = lambda *_args, **_kwargs: "You are the game master."
+    uvicorn.run(server_module.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status", encoding="utf-8") as handle:
+        for line in handle:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _percentiles(values: list[float]) -> str:
+    if not values:
+        return "n/a"
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(len(values) * q))]  # noqa: E731
+    return (
+        f"p50 {pick(0.50) * 1000:7.2f} ms  p95 {pick(0.95) * 1000:7.2f} ms  "
+        f"p99 {pick(0.99) * 1000:7.2f} ms  max {values[-1] * 1000:7.2f} ms"
+    )
+
+
+def _persisted_offsets(recording, speed: float) -> list[float]:
+    """Seconds from turn start at which each persisted event is emitted."""
+    offsets, elapsed = [], 0.0
+    for delay, event in recording:
+        elapsed += delay / speed
+        if event.type in PERSISTED_TYPES:
+            offsets.append(elapsed)
+    return offsets
+
+
+async def _wait_for_server(port: int, process: subprocess.Popen) -> None:
+    import httpx
+
+    async with httpx.AsyncClient() as client:
+        for _ in range(200):
+            if process.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            try:
+                if (await client.get(f"http://127.0.0.1:{port}/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+async def run_load(args, port: int, server_pid: int, offsets: list[float]) -> dict:
+    import websockets
+
+    campaigns = [f"loadtest-{index:03d}" for index in range(args.campaigns)]
+    arrivals: dict[tuple[str, int], list[float]] = defaultdict(list)
+    delivery_lags: list[float] = []
+    delivered = 0
+    turn_seconds: list[float] = []
+    baseline_rss = _rss_kib(server_pid)
+
+    async def connect(campaign: str):
+        socket_ = await websockets.connect(
+            f"ws://127.0.0.1:{port}/ws/game?campaign={campaign}&model=replay",
+            max_size=None,
+        )
+        while json.loads(await socket_.recv()).get("type") != "agent_status":
+            pass
+        return socket_
+
+    sockets = await asyncio.gather(
+        *(connect(campaigns[index % len(campaigns)]) for index in range(args.clients))
+    )
+    by_campaign: dict[str, list] = defaultdict(list)
+    for index, socket_ in enumerate(sockets):
+        by_campaign[campaigns[index % len(campaigns)]].append(socket_)
+
+    async def watch(campaign: str, socket_, turn_started: dict) -> None:
+        nonlocal delivered
+        while True:
+            message = json.loads(await socket_.recv())
+            now = time.perf_counter()
+            delivered += 1
+            kind = message.get("type")
+            if kind == "done":
+                return
+            if "id" in message and kind in PERSISTED_TYPES:
+                arrivals[(campaign, message["id"])].append(now)
+                ordinal = message["id"] - turn_started["user_event_id"] - 1
+                if 0 <= ordinal < len(offsets):
+                    delivery_lags.append(now - turn_started["at"] - offsets[ordinal])
+
+    async def play(campaign: str) -> None:
+        members = by_campaign[campaign]
+        driver = members[0]
+        next_user_event_id = 1
+        for turn in range(args.turns):
+            turn_started = {"at": time.perf_counter(), "user_event_id": next_user_event_id}
+            watchers = [asyncio.create_task(watch(campaign, member, turn_started)) for member in members]
+            await driver.send(f"Turn {turn}: I look around.")
+            await asyncio.gather(*watchers)
+            turn_seconds.append(time.perf_counter() - turn_started["at"])
+            # user message + every persisted event of the recording
+            next_user_event_id += 1 + len(offsets)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(play(campaign) for campaign in campaigns))
+    wall = time.perf_counter() - started
+    loaded_rss = _rss_kib(server_pid)
+    for socket_ in sockets:
+        await socket_.close()
+
+    spreads = [
+        stamp - min(stamps)
+        for stamps in arrivals.values()
+        for stamp in stamps
+    ]
+    return {
+        "wall": wall,
+        "turns": len(turn_seconds),
+        "delivered": delivered,
+        "turn_seconds": turn_seconds,
+        "delivery_lags": delivery_lags,
+        "spreads": spreads,
+        "rss_per_session_kib": (loaded_rss - baseline_rss) / max(1, len(campaigns)),
+        "baseline_rss_kib": baseline_rss,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=40, help="WebSocket clients (N)")
+    parser.add_argument("--campaigns", type=int, default=10, help="campaigns (M)")
+    parser.add_argument("--turns", type=int, default=5, help="turns per campaign")
+    parser.add_argument("--speed", type=float, default=4.0, help="replay speed-up")
+    parser.add_argument("--recording", default="builtin", help="JSONL recording or 'builtin'")
+    parser.add_argument("--serve", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+    if args.clients < args.campaigns:
+        parser.error("--clients must be at least --campaigns")
+
+    from backend.providers.replay import BUILTIN_RECORDING, load_recording
+
+    recording = BUILTIN_RECORDING if args.recording == "builtin" else load_recording(args.recording)
+    offsets = _persisted_offsets(recording, args.speed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for index in range(args.campaigns):
+            campaign = root / "world-state" / "campaigns" / f"loadtest-{index:03d}"
+            campaign.mkdir(parents=True)
+            (campaign / "campaign-overview.json").write_text(
+                json.dumps({"name": campaign.name}), encoding="utf-8"
+            )
+        port = _free_port()
+        env = {
+            **os.environ,
+            "DND_REPLAY_RECORDING": str(args.recording),
+            "DND_REPLAY_SPEED": str(args.speed),
+        }
+        env.pop("DND_AUTH_PASSWORD", None)
+        process = subprocess.Popen(
+            [sys.executable, __file__, "--serve", str(root), "--port", str(port)],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(_wait_for_server(port, process))
+            result = asyncio.run(run_load(args, port, process.pid, offsets))
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    ideal = sum(delay for delay, _event in recording) / args.speed
+    print(
+        f"{args.clients} clients, {args.campaigns} campaigns, {args.turns} turns each, "
+        f"replay x{args.speed:g} (ideal turn {ideal * 1000:.0f} ms)"
+    )
+    print(
+        f"throughput      {result['turns'] / result['wall']:8.2f} turns/s  "
+        f"{result['delivered'] / result['wall']:9.1f} events/s delivered"
+    )
+    print(f"turn wall time  {_percentiles(result['turn_seconds'])}")
+    print(f"delivery lag    {_percentiles(result['delivery_lags'])}")
+    print(f"fan-out spread  {_percentiles(result['spreads'])}")
+    print(
+        f"memory          {result['rss_per_session_kib'] / 1024:8.2f} MiB RSS per session "
+        f"(server baseline {result['baseline_rss_kib'] / 1024:.1f} MiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
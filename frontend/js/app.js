@@ -620,7 +620,11 @@ function addImageMessage(content, metadata = {}, timestamp = null) {
   link.target = '_blank';
   link.rel = 'noopener';
   const image = document.createElement('img');
-  image.src = url;
+  // The server picks WebP/AVIF by Accept and the nearest width variant; the
+  // link keeps the full-size original.
+  image.src = `${url}?w=960`;
+  image.srcset = [480, 960, 1920].map((width) => `${url}?w=${width} ${width}w`).join(', ');
+  image.sizes = '(max-width: 900px) 100vw, min(920px, 82vw)';
   image.alt = content || ui('Кинематографический кадр сцены', 'Cinematic scene frame');
   image.loading = 'lazy';
   image.decoding = 'async';
@@ -6,12 +6,13 @@ Manages concurrent agent extraction from D&D modules
 Uses RAG-based semantic extraction for document categorization.
 """
 
+import os
 import sys
 import json
 import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any
 
 from lib.json_ops import JsonOperations
 from lib.validators import Validators
@@ -128,18 +129,22 @@ class AgentExtractor:
         # Initialize RAG extractor for this campaign
         self._rag_extractor = RAGExtractor(str(self.extraction_dir))
 
-        # Extract and vectorize document (no categorization - all chunks stored uniformly)
-        rag_metadata = self._rag_extractor.extract_from_document(filepath, clear_existing=True)
-
-        # Save the full text for reference
-        from lib.content_extractor import ContentExtractor
-        extractor = ContentExtractor()
-        full_text = extractor.extract_text(filepath)
-        (self.extraction_dir / "current-document.txt").write_text(full_text)
-
-        # Write chunks to files for extraction agents to read
-        chunks = self._rag_extractor._split_into_chunks(full_text)
-        self._write_chunk_files(chunks)
+        # Extract, vectorize and write chunk files in one streaming pass
+        # (no categorization - all chunks stored uniformly)
+        # The previous document text survives until the new one is complete.
+        document_path = self.extraction_dir / "current-document.txt"
+        partial_path = document_path.with_name(".current-document.txt.tmp")
+        try:
+            with partial_path.open("w") as document:
+                rag_metadata = self._rag_extractor.extract_from_document(
+                    filepath,
+                    clear_existing=True,
+                    on_text=document.write,
+                    chunk_writer=self._write_chunk_files,
+                )
+            os.replace(partial_path, document_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
 
         # Create metadata
         metadata = {
@@ -597,25 +602,34 @@ class AgentExtractor:
 
         return review
 
-    def _write_chunk_files(self, chunks: list) -> Dict:
-        """Write chunks to files for extraction agents to read."""
+    def _write_chunk_files(self, chunks: Iterable) -> Dict:
+        """
+        Write chunks to files for extraction agents to read.
+
+        Accepts chunk texts or (index, text) pairs.  The "of N" headers need
+        the total, so chunks are buffered until the stream ends.
+        """
         chunk_dir = self.extraction_dir / "chunks"
         chunk_dir.mkdir(exist_ok=True)
 
+        buffered = [
+            chunk if isinstance(chunk, tuple) else (position, chunk)
+            for position, chunk in enumerate(chunks)
+        ]
         chunk_files = []
-        for idx, chunk_text in enumerate(chunks):
+        for idx, chunk_text in buffered:
             filename = f"chunk_{idx:03d}.txt"
             filepath = chunk_dir / filename
 
             # Add header to chunk
-            header = f"# Chunk {idx + 1} of {len(chunks)}\n"
+            header = f"# Chunk {idx + 1} of {len(buffered)}\n"
             header += "---\n\n"
 
             filepath.write_text(header + chunk_text)
             chunk_files.append(str(filepath))
 
         print(f"  Wrote {len(chunk_files)} chunk files to {chunk_dir}")
-        return {"chunk_files": chunk_files, "total_chunks": len(chunks)}
+        return {"chunk_files": chunk_files, "total_chunks": len(buffered)}
 
     def _save_chunks(self, categorized: Dict) -> Dict:
         """Save chunks to files for agent processing (legacy format)"""
@@ -0,0 +1,287 @@
+"""In-memory catalog of campaign summaries kept current by filesystem events.
+
+Listing campaigns used to walk ``world-state/campaigns`` and parse every
+overview (and, for the CLI, every ``world.json``) on each call.  The catalog
+keeps one summary per campaign together with the stamps of the files it was
+built from and only rebuilds campaigns whose files changed.
+
+On Linux changes are learned from inotify.  Events are queued by the kernel
+before the writing syscall returns, so draining the queue at the start of a
+read is enough to observe every completed write: an unchanged catalog costs
+one non-blocking ``read``.  Elsewhere, or when watches cannot be added, the
+catalog falls back to polling: campaigns appearing or disappearing are seen
+on the next read through the root directory's mtime, and file stamps are
+re-checked at most once per poll interval.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+FileStamp = tuple[int, int, int]
+Summarize = Callable[[Path], dict]
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_ROOT_MASK = (
+    IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_CAMPAIGN_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _file_stamp(path: Path) -> FileStamp | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class _Inotify:
+    """Minimal non-blocking inotify binding over libc via ctypes."""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is Linux-only")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), str(path))
+        return wd
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """Return every queued ``(wd, mask, name)`` without blocking."""
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class CampaignCatalog:
+    """Summaries of every campaign directory under ``campaigns_dir``.
+
+    ``summarize(campaign_dir)`` builds one campaign's entry from ``files``
+    (campaign-relative names); it is re-run only when one of their stamps
+    changes.  Summaries are shared, so callers must copy before mutating.
+    """
+
+    def __init__(
+        self,
+        campaigns_dir: Path,
+        files: Iterable[str],
+        summarize: Summarize,
+        *,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        self.campaigns_dir = Path(campaigns_dir)
+        self.files = tuple(files)
+        self._summarize = summarize
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[tuple, dict]] = {}
+        self._names: list[str] | None = None
+        self._dirty: set[str] = set()
+        self._last_scan = 0.0
+        self._root_stamp: FileStamp | None = None
+        self._inotify: _Inotify | None = None
+        self._root_wd: int | None = None
+        self._campaign_wds: dict[int, str] = {}
+        if use_inotify:
+            self._start_inotify()
+
+    @property
+    def watching(self) -> bool:
+        """True while inotify, rather than polling, keeps the catalog current."""
+        return self._inotify is not None
+
+    def _start_inotify(self) -> None:
+        try:
+            self._inotify = _Inotify()
+            self.campaigns_dir.mkdir(parents=True, exist_ok=True)
+            self._root_wd = self._inotify.add_watch(self.campaigns_dir, _ROOT_MASK)
+        except (OSError, AttributeError):
+            self._stop_inotify()
+
+    def _stop_inotify(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+        self._inotify = None
+        self._root_wd = None
+        self._campaign_wds.clear()
+
+    def _watch_campaign(self, name: str) -> None:
+        try:
+            wd = self._inotify.add_watch(self.campaigns_dir / name, _CAMPAIGN_MASK)
+        except OSError as exc:
+            if exc.errno in (errno.ENOENT, errno.ENOTDIR):
+                return
+            # Out of watches (ENOSPC) or similar: polling is always correct.
+            self._stop_inotify()
+            return
+        self._campaign_wds[wd] = name
+
+    def _list_names(self) -> list[str]:
+        try:
+            entries = sorted(self.campaigns_dir.iterdir())
+        except FileNotFoundError:
+            return []
+        return [entry.name for entry in entries if entry.is_dir()]
+
+    def _rescan(self) -> None:
+        """Re-list the root and revalidate every campaign's stamps."""
+        self._root_stamp = _file_stamp(self.campaigns_dir)
+        self._names = self._list_names()
+        if self._inotify is not None:
+            watched = set(self._campaign_wds.values())
+            for name in self._names:
+                if name not in watched:
+                    self._watch_campaign(name)
+                    if self._inotify is None:
+                        break
+        self._entries = {
+            name: entry for name, entry in self._entries.items() if name in self._names
+        }
+        self._dirty = set(self._names)
+        self._last_scan = time.monotonic()
+
+    def _drain_events(self) -> None:
+        try:
+            events = self._inotify.read_events()
+        except OSError:
+            self._stop_inotify()
+            self._names = None
+            return
+        for wd, mask, name in events:
+            if wd == self._root_wd and mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # The watched root is gone; a recreated one is found by polling.
+                self._stop_inotify()
+            elif mask & IN_Q_OVERFLOW:
+                self._names = None
+            elif wd == self._root_wd:
+                if not mask & IN_ISDIR or self._names is None:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_campaign(name)
+                    if name not in self._names:
+                        self._names = sorted([*self._names, name])
+                    self._dirty.add(name)
+                else:
+                    self._names = [known for known in self._names if known != name]
+                    self._entries.pop(name, None)
+            elif mask & IN_IGNORED:
+                self._campaign_wds.pop(wd, None)
+            elif name in self.files and wd in self._campaign_wds:
+                self._dirty.add(self._campaign_wds[wd])
+            if self._inotify is None:
+                self._names = None
+                return
+
+    def _stamps(self, name: str) -> tuple:
+        campaign_dir = self.campaigns_dir / name
+        return tuple(_file_stamp(campaign_dir / relative) for relative in self.files)
+
+    def _refresh_dirty(self) -> None:
+        known = set(self._names)
+        for name in sorted(self._dirty & known):
+            stamps = self._stamps(name)
+            cached = self._entries.get(name)
+            if cached is None or cached[0] != stamps:
+                self._entries[name] = (stamps, self._summarize(self.campaigns_dir / name))
+        self._dirty.clear()
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Force a re-check of one campaign, or a full rescan when ``None``."""
+        with self._lock:
+            if name is None:
+                self._names = None
+            else:
+                self._dirty.add(name)
+
+    def summaries(self) -> list[dict]:
+        """Return one summary per campaign directory, sorted by name."""
+        with self._lock:
+            if self._inotify is not None:
+                self._drain_events()
+            elif (
+                time.monotonic() - self._last_scan >= self.poll_interval
+                or _file_stamp(self.campaigns_dir) != self._root_stamp
+            ):
+                self._names = None
+            if self._names is None:
+                self._rescan()
+            if self._dirty:
+                self._refresh_dirty()
+            return [self._entries[name][1] for name in self._names]
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop_inotify()
+
+
+_catalog_lock = threading.Lock()
+_catalogs: dict[tuple[str, Any], CampaignCatalog] = {}
+
+
+def shared_catalog(
+    campaigns_dir: Path, files: Iterable[str], summarize: Summarize
+) -> CampaignCatalog:
+    """Return the process-wide catalog for ``campaigns_dir`` and ``summarize``."""
+    key = (str(Path(campaigns_dir).resolve()), summarize)
+    with _catalog_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = CampaignCatalog(campaigns_dir, files, summarize)
+            _catalogs[key] = catalog
+        return catalog
+
+
+def close_catalogs() -> None:
+    """Release every shared catalog and its inotify descriptor."""
+    with _catalog_lock:
+        catalogs = list(_catalogs.values())
+        _catalogs.clear()
+    for catalog in catalogs:
+        catalog.close()
@@ -14,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from colors import tag_success, tag_error, tag_warning
 from world_graph import WorldGraph
+from campaign_catalog import shared_catalog
 from campaign_context import (
     InvalidCampaignName,
     resolve_campaign_dir,
@@ -39,6 +40,42 @@ def _get_player_node(campaign_dir: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
+_LISTING_FILES = ("campaign-overview.json", "world.json")
+
+
+def _campaign_listing(campaign_dir: Path) -> Dict[str, Any]:
+    """Build one list_campaigns entry; cached until its files change."""
+    campaign_info = {
+        "name": campaign_dir.name,
+        "path": str(campaign_dir),
+    }
+
+    # Try to read campaign overview for more info
+    overview_file = campaign_dir / "campaign-overview.json"
+    if overview_file.exists():
+        try:
+            with open(overview_file, 'r', encoding='utf-8') as f:
+                overview = json.load(f)
+            campaign_info["campaign_name"] = overview.get("campaign_name", "Unnamed")
+            campaign_info["current_location"] = overview.get("player_position", {}).get("current_location")
+            campaign_info["session_count"] = overview.get("session_count", 0)
+        except (json.JSONDecodeError, IOError):
+            campaign_info["campaign_name"] = "Unknown"
+
+    # Try to read character info from WorldGraph
+    player = _get_player_node(campaign_dir)
+    if player:
+        data = player.get("data", {})
+        campaign_info["character"] = {
+            "name": player.get("name", "Unknown"),
+            "race": data.get("race", "?"),
+            "class": data.get("class", "?"),
+            "level": data.get("level", 1)
+        }
+
+    return campaign_info
+
+
 class CampaignManager:
     """Manage multiple D&D campaigns"""
 
@@ -55,43 +92,8 @@ class CampaignManager:
         List all campaigns with their metadata
         Returns list of dicts with name, path, character info
         """
-        campaigns = []
-
-        for campaign_dir in sorted(self.campaigns_dir.iterdir()):
-            if not campaign_dir.is_dir():
-                continue
-
-            campaign_info = {
-                "name": campaign_dir.name,
-                "path": str(campaign_dir),
-            }
-
-            # Try to read campaign overview for more info
-            overview_file = campaign_dir / "campaign-overview.json"
-            if overview_file.exists():
-                try:
-                    with open(overview_file, 'r', encoding='utf-8') as f:
-                        overview = json.load(f)
-                    campaign_info["campaign_name"] = overview.get("campaign_name", "Unnamed")
-                    campaign_info["current_location"] = overview.get("player_position", {}).get("current_location")
-                    campaign_info["session_count"] = overview.get("session_count", 0)
-                except (json.JSONDecodeError, IOError):
-                    campaign_info["campaign_name"] = "Unknown"
-
-            # Try to read character info from WorldGraph
-            player = _get_player_node(campaign_dir)
-            if player:
-                data = player.get("data", {})
-                campaign_info["character"] = {
-                    "name": player.get("name", "Unknown"),
-                    "race": data.get("race", "?"),
-                    "class": data.get("class", "?"),
-                    "level": data.get("level", 1)
-                }
-
-            campaigns.append(campaign_info)
-
-        return campaigns
+        catalog = shared_catalog(self.campaigns_dir, _LISTING_FILES, _campaign_listing)
+        return [dict(info) for info in catalog.summaries()]
 
     def get_active(self) -> Optional[str]:
         """
@@ -4,18 +4,142 @@ Content extractors for various document formats.
 Extract plain text from PDFs, Word documents, Markdown, and text files.
 """
 
+import hashlib
+import json
+import multiprocessing
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+
+def default_page_cache_dir() -> Optional[Path]:
+    """PDF page cache root from DND_PDF_PAGE_CACHE; "off" disables caching."""
+    configured = os.environ.get("DND_PDF_PAGE_CACHE", "").strip()
+    if configured.lower() in {"0", "off", "false", "no"}:
+        return None
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "dm-claude" / "pdf-pages"
+
+
+def default_pdf_workers() -> int:
+    """Extraction processes from DND_PDF_WORKERS (default: one per CPU)."""
+    try:
+        configured = int(os.environ.get("DND_PDF_WORKERS", "0"))
+    except ValueError:
+        configured = 0
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+def file_digest(filepath: str) -> str:
+    """sha256 of a file's bytes, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_page_range(
+    filepath: str,
+    library: str,
+    start: int,
+    stop: int,
+) -> List[Tuple[int, Optional[str]]]:
+    """Extract pages start..stop-1 (0-based) in a worker process."""
+    return list(_iter_page_range(filepath, library, start, stop))
+
+
+def _iter_page_range(
+    filepath: str,
+    library: str,
+    start: int,
+    stop: int,
+) -> Iterator[Tuple[int, Optional[str]]]:
+    """
+    Yield (page_num, text) for pages start..stop-1 (0-based).
+
+    Page numbers are 1-based; text is None for a page that failed, so it is
+    neither yielded nor cached.
+    """
+    if library == "pdfplumber":
+        import pdfplumber
+
+        with pdfplumber.open(filepath) as pdf:
+            for index in range(start, stop):
+                yield index + 1, _page_text(pdf.pages[index], index + 1)
+                # pdfplumber keeps parsed layout objects per page otherwise.
+                pdf.pages[index].close()
+    else:
+        import PyPDF2
+
+        with open(filepath, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for index in range(start, stop):
+                yield index + 1, _page_text(pdf_reader.pages[index], index + 1)
+
+
+def _page_text(page, page_num: int) -> Optional[str]:
+    try:
+        return page.extract_text() or ""
+    except Exception as e:
+        print(f"Error extracting page {page_num}: {e}")
+        return None
+
+
+class PageCache:
+    """Extracted page texts for one PDF, keyed by file hash and library."""
+
+    def __init__(self, root: Path, digest: str, library: str):
+        self.directory = Path(root) / f"{digest}-{library}"
+
+    def page_count(self) -> Optional[int]:
+        try:
+            return int(json.loads((self.directory / "pages.json").read_text())["pages"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set_page_count(self, count: int):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write(self.directory / "pages.json", json.dumps({"pages": count}))
+
+    def get(self, page_num: int) -> Optional[str]:
+        try:
+            return (self.directory / f"{page_num:05d}.txt").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(self, page_num: int, text: str):
+        self._write(self.directory / f"{page_num:05d}.txt", text)
+
+    @staticmethod
+    def _write(path: Path, text: str):
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
 
 
 class PDFExtractor:
     """Extract text content from PDF files."""
 
-    def __init__(self):
-        """Initialize PDF extractor."""
+    # Pages per worker task: enough to amortize opening the PDF in the worker.
+    MIN_PAGES_PER_TASK = 8
+    TASKS_PER_WORKER = 4
+
+    def __init__(self, workers: Optional[int] = None, cache_dir: Optional[str] = None):
+        """
+        Initialize PDF extractor.
+
+        Args:
+            workers: Extraction processes (default DND_PDF_WORKERS, else one per CPU)
+            cache_dir: Page text cache root (default DND_PDF_PAGE_CACHE)
+        """
         self.pypdf_available = False
         self.pdfplumber_available = False
+        self.workers = workers or default_pdf_workers()
+        self.cache_dir = Path(cache_dir) if cache_dir else default_page_cache_dir()
 
         try:
             import PyPDF2
@@ -44,62 +168,135 @@ class PDFExtractor:
         Returns:
             Extracted text content
         """
+        return ''.join(self.iter_pages(filepath))
+
+    def iter_pages(self, filepath: str) -> Iterator[str]:
+        """
+        Yield page texts in order while later pages are still being extracted.
+
+        Page ranges are extracted in a process pool; pages found in the page
+        cache are not extracted again.  Each non-empty page is yielded as
+        "--- Page N ---" followed by its text.
+
+        Args:
+            filepath: Path to the PDF file
+
+        Yields:
+            Text of each page, in page order
+        """
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"PDF file not found: {filepath}")
 
         # Try pdfplumber first (better for complex layouts)
+        libraries = []
         if self.pdfplumber_available:
-            try:
-                return self._extract_with_pdfplumber(filepath)
-            except Exception as e:
-                print(f"pdfplumber extraction failed: {e}")
-                if self.pypdf_available:
-                    print("Falling back to PyPDF2...")
-
-        # Fall back to PyPDF2
+            libraries.append("pdfplumber")
         if self.pypdf_available:
+            libraries.append("pypdf2")
+
+        for position, library in enumerate(libraries):
+            pages = self._iter_pages_with(filepath, library)
             try:
-                return self._extract_with_pypdf2(filepath)
+                first = next(pages, None)
             except Exception as e:
-                print(f"PyPDF2 extraction failed: {e}")
+                print(f"{library} extraction failed: {e}")
+                if position + 1 < len(libraries):
+                    print("Falling back to PyPDF2...")
+                continue
+            if first is not None:
+                yield first
+            yield from pages
+            return
 
         raise RuntimeError("No PDF extraction library available. Install PyPDF2 or pdfplumber.")
 
-    def _extract_with_pdfplumber(self, filepath: str) -> str:
-        """Extract text using pdfplumber."""
-        text = []
-        with self.pdfplumber.open(filepath) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(f"--- Page {page_num} ---\n")
-                        text.append(page_text)
-                        text.append("\n\n")
-                except Exception as e:
-                    print(f"Error extracting page {page_num}: {e}")
-
-        return ''.join(text)
-
-    def _extract_with_pypdf2(self, filepath: str) -> str:
-        """Extract text using PyPDF2."""
-        text = []
-        with open(filepath, 'rb') as file:
-            pdf_reader = self.PyPDF2.PdfReader(file)
-            num_pages = len(pdf_reader.pages)
+    def _iter_pages_with(self, filepath: str, library: str) -> Iterator[str]:
+        """Yield formatted pages extracted with one library, using the page cache."""
+        cache = None
+        if self.cache_dir is not None:
+            cache = PageCache(self.cache_dir, file_digest(filepath), library)
+        page_count = cache.page_count() if cache else None
+        if page_count is None:
+            page_count = self._page_count(filepath, library)
+            if cache:
+                cache.set_page_count(page_count)
+
+        cached = {}
+        missing = []
+        for page_num in range(1, page_count + 1):
+            text = cache.get(page_num) if cache else None
+            if text is None:
+                missing.append(page_num)
+            else:
+                cached[page_num] = text
+
+        if self.workers > 1 and len(missing) > self.MIN_PAGES_PER_TASK:
+            extracted = self._extract_in_pool(filepath, library, missing)
+        else:
+            extracted = (
+                page
+                for start, stop in self._page_ranges(missing, len(missing))
+                for page in _iter_page_range(str(filepath), library, start, stop)
+            )
 
-            for page_num in range(num_pages):
-                try:
-                    page = pdf_reader.pages[page_num]
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(f"--- Page {page_num + 1} ---\n")
-                        text.append(page_text)
-                        text.append("\n\n")
-                except Exception as e:
-                    print(f"Error extracting page {page_num + 1}: {e}")
+        try:
+            for page_num in range(1, page_count + 1):
+                while page_num not in cached:
+                    extracted_num, text = next(extracted, (page_num, None))
+                    if text is not None and cache:
+                        cache.put(extracted_num, text)
+                    cached[extracted_num] = text
+                text = cached.pop(page_num)
+                if text:
+                    yield f"--- Page {page_num} ---\n{text}\n\n"
+        finally:
+            extracted.close()
+
+    def _extract_in_pool(
+        self,
+        filepath: str,
+        library: str,
+        page_nums: List[int],
+    ) -> Iterator[Tuple[int, Optional[str]]]:
+        """Fan page ranges out to worker processes; yield (page_num, text) in order."""
+        per_task = max(
+            self.MIN_PAGES_PER_TASK,
+            -(-len(page_nums) // (self.workers * self.TASKS_PER_WORKER)),
+        )
+        ranges = self._page_ranges(page_nums, per_task)
+        # Spawned, not forked: the ingest pipeline calls this from a thread.
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.workers, len(ranges)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        try:
+            futures = [
+                executor.submit(_extract_page_range, str(filepath), library, start, stop)
+                for start, stop in ranges
+            ]
+            for future in futures:
+                yield from future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _page_count(self, filepath: str, library: str) -> int:
+        if library == "pdfplumber":
+            with self.pdfplumber.open(filepath) as pdf:
+                return len(pdf.pages)
+        with open(filepath, 'rb') as file:
+            return len(self.PyPDF2.PdfReader(file).pages)
 
-        return ''.join(text)
+    @staticmethod
+    def _page_ranges(page_nums: List[int], per_task: int) -> List[Tuple[int, int]]:
+        """Group 1-based page numbers into 0-based [start, stop) runs of up to per_task."""
+        ranges = []
+        for page_num in page_nums:
+            last = ranges[-1] if ranges else None
+            if last and last[1] == page_num - 1 and last[1] - last[0] < per_task:
+                last[1] = page_num
+            else:
+                ranges.append([page_num - 1, page_num])
+        return [(start, stop) for start, stop in ranges]
 
 
 class MarkdownExtractor:
@@ -269,6 +466,13 @@ class ContentExtractor:
         """Extract text from any supported file type."""
         return extract_content(filepath)
 
+    def iter_text(self, filepath: str) -> Iterator[str]:
+        """Yield the text in document order; joined, the pieces equal extract_text()."""
+        if Path(filepath).suffix.lower() == '.pdf':
+            yield from PDFExtractor().iter_pages(filepath)
+        else:
+            yield extract_content(filepath)
+
 
 def main():
     """Test the extractors."""
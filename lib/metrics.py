@@ -0,0 +1,279 @@
+"""Process-wide metrics registry with Prometheus text exposition.
+
+Instrumented code keeps a reference to a metric child (``labels(...)`` is
+looked up once, not per sample) and records with ``observe``/``inc``; a
+sample is a dict lookup, a bucket search and two additions to a list only
+the recording thread writes.
+Nothing is formatted until ``render()`` is called by ``/api/metrics``.
+Gauges read their value through a callback at render time, so they cost
+nothing on the hot path at all.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+import threading
+from bisect import bisect_left
+from threading import get_ident
+from typing import Callable, Iterable
+
+# Seconds; spans fsync-bound appends (sub-ms) up to full LLM turns (minutes).
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+GaugeCallback = Callable[[], Iterable[tuple[tuple[str, ...], float]]]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Sharded:
+    """Per-thread accumulators, merged only when read.
+
+    Each thread writes to its own list, so recording needs neither a lock
+    (which alone costs more than the rest of a sample) nor atomic updates.
+    Thread ids are reused by the interpreter, which bounds the shard count
+    by the number of threads alive at once.
+    """
+
+    __slots__ = ("_shards", "_width", "_lock")
+
+    def __init__(self, width: int):
+        self._shards: dict[int, list] = {}
+        self._width = width
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> list:
+        shard = [0] * self._width
+        with self._lock:
+            return self._shards.setdefault(get_ident(), shard)
+
+    def _merged(self) -> list:
+        with self._lock:
+            shards = list(self._shards.values())
+        totals = [0] * self._width
+        for shard in shards:
+            for index, value in enumerate(shard):
+                totals[index] += value
+        return totals
+
+
+class _HistogramChild(_Sharded):
+    """Bucket counts followed by the running sum, in one list per thread."""
+
+    __slots__ = ("_bounds",)
+
+    def __init__(self, bounds: tuple[float, ...]):
+        super().__init__(len(bounds) + 2)
+        self._bounds = bounds
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.get(get_ident()) or self._new_shard()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> tuple[list[int], float]:
+        merged = self._merged()
+        return merged[:-1], merged[-1]
+
+
+class _CounterChild(_Sharded):
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        shard = self._shards.get(get_ident()) or self._new_shard()
+        shard[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._merged()[0]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: object):
+        """Return the child for these label values, creating it once."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {key}"
+                )
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self) -> list[tuple[tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record on the unlabelled child; labelled metrics use ``labels()``."""
+        self.labels().observe(value)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for values, child in self._items():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_label_text(self.labelnames, values, le)} {cumulative}"
+                )
+            labels = _label_text(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for values, child in self._items():
+            lines.append(
+                f"{self.name}_total{_label_text(self.labelnames, values)} "
+                f"{_format_value(child.value)}"
+            )
+        return lines
+
+
+class Gauge(_Metric):
+    """A value sampled from ``callback`` when metrics are rendered."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: GaugeCallback | None = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        samples = sorted(self.callback()) if self.callback else []
+        for values, value in samples:
+            lines.append(
+                f"{self.name}{_label_text(self.labelnames, tuple(map(str, values)))} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"metric {metric.name} already registered differently")
+                if isinstance(metric, Gauge) and metric.callback is not None:
+                    existing.callback = metric.callback
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, callback))
+
+    def render(self) -> str:
+        """Prometheus text exposition format, version 0.0.4."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+histogram = REGISTRY.histogram
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+render = REGISTRY.render
+
+# lib/ modules are imported both as ``lib.<name>`` and, through the sys.path
+# entry the CLI tools add, as ``<name>``.  Alias both spellings to this module
+# so the process keeps exactly one registry.
+sys.modules.setdefault("metrics", sys.modules[__name__])
+sys.modules.setdefault("lib.metrics", sys.modules[__name__])
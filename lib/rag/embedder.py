@@ -7,11 +7,15 @@ Uses sentence-transformers with all-MiniLM-L6-v2 (22MB, fast) for local vectoriz
 
 import os
 import sys
+import time
 import warnings
 import logging
-from typing import List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional
 import numpy as np
 
+from lib.rag.embedding_cache import EmbeddingCache, default_cache_dir, text_digest
+
 # Suppress HuggingFace and transformers warnings
 os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -26,16 +30,24 @@ class LocalEmbedder:
 
     DEFAULT_MODEL = "all-MiniLM-L6-v2"
 
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, cache_dir: str = None, use_cache: bool = True):
         """
         Initialize the local embedder.
 
         Args:
             model_name: The sentence-transformers model to use.
                        Defaults to all-MiniLM-L6-v2 (22MB, fast, good quality).
+            cache_dir: Embedding cache root (default: DND_EMBEDDING_CACHE or
+                       ~/.cache/dm-claude/embeddings).
+            use_cache: Whether embed_batch reuses vectors of unchanged texts.
         """
         self.model_name = model_name or self.DEFAULT_MODEL
         self._model = None
+        self._cache_root = None
+        if use_cache:
+            self._cache_root = Path(cache_dir) if cache_dir else default_cache_dir()
+        self._cache: Optional[EmbeddingCache] = None
+        self.last_batch_stats: Dict = {}
 
     @staticmethod
     def is_available() -> bool:
@@ -83,14 +95,67 @@ class LocalEmbedder:
 
         Returns:
             Array of embedding vectors (n_texts x embedding_dim).
+
+        Texts already in the embedding cache are not sent to the model; hit
+        rate and estimated time saved are left in `last_batch_stats`.
         """
-        self._ensure_model()
-        return self._model.encode(
-            texts,
-            batch_size=batch_size,
-            show_progress_bar=show_progress,
-            convert_to_numpy=True
-        )
+        cache = self._get_cache()
+        if cache is None or not texts:
+            self._ensure_model()
+            return self._model.encode(
+                texts,
+                batch_size=batch_size,
+                show_progress_bar=show_progress,
+                convert_to_numpy=True
+            )
+
+        digests = [text_digest(text) for text in texts]
+        vectors = cache.lookup(digests)
+        hits = len(vectors)
+
+        # One model call per distinct missing text, duplicates share it
+        missing: Dict[bytes, List[int]] = {}
+        for position, digest in enumerate(digests):
+            if position not in vectors:
+                missing.setdefault(digest, []).append(position)
+
+        seconds_embedding = 0.0
+        if missing:
+            self._ensure_model()
+            started = time.perf_counter()
+            computed = self._model.encode(
+                [texts[positions[0]] for positions in missing.values()],
+                batch_size=batch_size,
+                show_progress_bar=show_progress,
+                convert_to_numpy=True
+            )
+            seconds_embedding = time.perf_counter() - started
+            try:
+                cache.store(list(missing), computed, seconds_embedding / len(missing))
+            except OSError as e:
+                print(f"  Warning: embedding cache not updated: {e}")
+            # Round like a later cache hit would, so re-imports give identical vectors
+            computed = np.asarray(computed).astype(np.float16).astype(np.float32)
+            for row, positions in enumerate(missing.values()):
+                for position in positions:
+                    vectors[position] = computed[row]
+
+        seconds_per_text = cache.seconds_per_text or 0.0
+        self.last_batch_stats = {
+            "texts": len(texts),
+            "cache_hits": hits,
+            "cache_misses": len(texts) - hits,
+            "hit_rate": hits / len(texts),
+            "seconds_embedding": seconds_embedding,
+            "seconds_saved": hits * seconds_per_text,
+        }
+        return np.stack([vectors[position] for position in range(len(texts))])
+
+    def _get_cache(self) -> Optional[EmbeddingCache]:
+        """Open the embedding cache for this model on first use."""
+        if self._cache is None and self._cache_root is not None:
+            self._cache = EmbeddingCache(self._cache_root, self.model_name)
+        return self._cache
 
     def similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Content-addressed Embedding Cache for RAG Ingestion
+
+Re-importing a book re-embeds chunks whose text has not changed.  This cache
+stores one float16 vector per (model name, sha256 of chunk text) so only new
+or edited chunks reach the model.
+
+Layout per model, under DND_EMBEDDING_CACHE (default ~/.cache/dm-claude/embeddings):
+    meta.json     model name, dimension, measured seconds per embedded text
+    keys.bin      32-byte sha256 digests, one per row, append-only
+    vectors.f16   float16 rows aligned with keys.bin, read via np.memmap
+
+Rows are appended under an exclusive flock; vectors are written before their
+keys, so a crash never leaves a key pointing at a missing vector.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DIGEST_SIZE = 32
+VECTOR_DTYPE = np.float16
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Cache root from DND_EMBEDDING_CACHE; "off" disables caching."""
+    configured = os.environ.get("DND_EMBEDDING_CACHE", "").strip()
+    if configured.lower() in {"0", "off", "false", "no"}:
+        return None
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "dm-claude" / "embeddings"
+
+
+def text_digest(text: str) -> bytes:
+    """sha256 of the chunk text, the cache key within one model."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """Memory-mapped float16 vectors for one embedding model."""
+
+    def __init__(self, root: Path, model_name: str):
+        """
+        Open (or lazily create) the cache for a model.
+
+        Args:
+            root: Cache root shared by all models.
+            model_name: Embedding model name; each model gets its own directory.
+        """
+        self.model_name = model_name
+        self.directory = Path(root) / re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self._meta_path = self.directory / "meta.json"
+        self._keys_path = self.directory / "keys.bin"
+        self._vectors_path = self.directory / "vectors.f16"
+        self._lock_path = self.directory / ".lock"
+        self.dimension: Optional[int] = None
+        self.seconds_per_text: Optional[float] = None
+        self._rows: Dict[bytes, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._load()
+
+    def _load(self):
+        """Read meta and the key index; vectors stay on disk until looked up."""
+        try:
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if meta.get("model") != self.model_name or not meta.get("dimension"):
+            return
+        self.dimension = int(meta["dimension"])
+        self.seconds_per_text = meta.get("seconds_per_text")
+        try:
+            keys = self._keys_path.read_bytes()
+        except OSError:
+            return
+        rows = min(len(keys) // DIGEST_SIZE, self._vector_rows())
+        self._rows = {
+            keys[row * DIGEST_SIZE:(row + 1) * DIGEST_SIZE]: row for row in range(rows)
+        }
+        self._vectors = None
+
+    def _vector_rows(self) -> int:
+        try:
+            size = self._vectors_path.stat().st_size
+        except OSError:
+            return 0
+        return size // (self.dimension * np.dtype(VECTOR_DTYPE).itemsize)
+
+    def _matrix(self) -> np.memmap:
+        if self._vectors is None:
+            self._vectors = np.memmap(
+                self._vectors_path,
+                dtype=VECTOR_DTYPE,
+                mode="r",
+                shape=(max(self._rows.values()) + 1, self.dimension),
+            )
+        return self._vectors
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def lookup(self, digests: List[bytes]) -> Dict[int, np.ndarray]:
+        """
+        Find cached vectors.
+
+        Args:
+            digests: Chunk digests from text_digest().
+
+        Returns:
+            Dict mapping position in `digests` to its float32 vector, hits only.
+        """
+        positions = [
+            (position, self._rows[digest])
+            for position, digest in enumerate(digests)
+            if digest in self._rows
+        ]
+        if not positions:
+            return {}
+        matrix = self._matrix()
+        return {
+            position: np.asarray(matrix[row], dtype=np.float32)
+            for position, row in positions
+        }
+
+    def store(
+        self,
+        digests: List[bytes],
+        vectors: np.ndarray,
+        seconds_per_text: Optional[float] = None,
+    ):
+        """
+        Append vectors for new digests.
+
+        Args:
+            digests: Chunk digests, one per row of `vectors`.
+            vectors: Embeddings (n x dimension).
+            seconds_per_text: Measured model time per text, kept for reporting.
+        """
+        vectors = np.asarray(vectors, dtype=VECTOR_DTYPE)
+        if not digests or vectors.ndim != 2:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            if self.dimension not in (None, vectors.shape[1]):
+                # The model changed shape under the same name: start over.
+                self._keys_path.unlink(missing_ok=True)
+                self._vectors_path.unlink(missing_ok=True)
+                self._rows = {}
+            self.dimension = vectors.shape[1]
+            if seconds_per_text is not None:
+                self.seconds_per_text = seconds_per_text
+            self._meta_path.write_text(
+                json.dumps({
+                    "model": self.model_name,
+                    "dimension": self.dimension,
+                    "seconds_per_text": self.seconds_per_text,
+                }),
+                encoding="utf-8",
+            )
+            # Another process may have appended since we loaded; a partial
+            # row from a crash is cut off so keys and vectors line up again.
+            try:
+                key_rows = self._keys_path.stat().st_size // DIGEST_SIZE
+            except FileNotFoundError:
+                key_rows = 0
+            rows = min(key_rows, self._vector_rows())
+            row_bytes = self.dimension * np.dtype(VECTOR_DTYPE).itemsize
+            with open(self._vectors_path, "ab") as handle:
+                handle.truncate(rows * row_bytes)
+                handle.write(vectors.tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+            with open(self._keys_path, "ab") as handle:
+                handle.truncate(rows * DIGEST_SIZE)
+                handle.write(b"".join(digests))
+                handle.flush()
+                os.fsync(handle.fileno())
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        for offset, digest in enumerate(digests):
+            self._rows[digest] = rows + offset
+        self._vectors = None
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Threaded Streaming Pipeline for Document Ingestion
+
+Each stage is a function from an iterator of inputs to an iterator of
+outputs and runs on its own thread, so extraction, chunking, embedding and
+storage overlap instead of running one after another.  Stages are joined by
+bounded queues: a slow stage applies back-pressure rather than letting the
+stages before it buffer the whole book in memory.
+
+Every stage reports how long it was busy (time inside the stage function,
+excluding waits on its neighbours), how long it waited for input, and how
+many items went in and out.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+DEFAULT_QUEUE_SIZE = 8
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class PipelineCancelled(Exception):
+    """Raised inside a stage when another stage has failed."""
+
+
+class StageStats:
+    """Counters for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.busy_seconds = 0.0
+        self.input_wait_seconds = 0.0
+        self.output_wait_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Stats as plain values, with throughput in output items per busy second."""
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "input_wait_seconds": round(self.input_wait_seconds, 4),
+            "output_wait_seconds": round(self.output_wait_seconds, 4),
+            "items_per_second": (
+                round(self.items_out / self.busy_seconds, 2) if self.busy_seconds > 0 else None
+            ),
+        }
+
+
+def _put(channel: queue.Queue, item: Any, cancelled: threading.Event):
+    while True:
+        if cancelled.is_set():
+            raise PipelineCancelled()
+        try:
+            channel.put(item, timeout=_POLL_SECONDS)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(channel: queue.Queue, cancelled: threading.Event) -> Any:
+    while True:
+        if cancelled.is_set():
+            raise PipelineCancelled()
+        try:
+            return channel.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+
+
+def _run_stage(
+    transform: Callable[[Iterator[Any]], Iterable[Any]],
+    inbound: queue.Queue,
+    outbound: queue.Queue,
+    stats: StageStats,
+    cancelled: threading.Event,
+    errors: List[BaseException],
+):
+    def inputs() -> Iterator[Any]:
+        while True:
+            started = time.perf_counter()
+            item = _get(inbound, cancelled)
+            stats.input_wait_seconds += time.perf_counter() - started
+            if item is _DONE:
+                return
+            stats.items_in += 1
+            yield item
+
+    try:
+        outputs = iter(transform(inputs()))
+        running = 0.0
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(outputs)
+            except StopIteration:
+                running += time.perf_counter() - started
+                break
+            running += time.perf_counter() - started
+            stats.items_out += 1
+            started = time.perf_counter()
+            _put(outbound, item, cancelled)
+            stats.output_wait_seconds += time.perf_counter() - started
+        # Input waits happen inside next(outputs); they are not work.
+        stats.busy_seconds = max(0.0, running - stats.input_wait_seconds)
+        _put(outbound, _DONE, cancelled)
+    except PipelineCancelled:
+        pass
+    except BaseException as exc:
+        errors.append(exc)
+        cancelled.set()
+
+
+def run_pipeline(
+    stages: List[Tuple[str, Callable[[Iterator[Any]], Iterable[Any]]]],
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Run stages concurrently, each feeding the next.
+
+    Args:
+        stages: (name, transform) pairs in order.  The first stage receives an
+            empty iterator and acts as the source.
+        queue_size: Maximum items buffered between two stages.
+
+    Returns:
+        Tuple of (outputs of the last stage, report dict with per-stage stats
+        under "stages" and overall "wall_seconds").
+
+    Raises:
+        The first exception raised by any stage, after all stages stop.
+    """
+    cancelled = threading.Event()
+    errors: List[BaseException] = []
+    channels = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    channels[0].put(_DONE)
+    stats = [StageStats(name) for name, _ in stages]
+    threads = [
+        threading.Thread(
+            target=_run_stage,
+            args=(transform, channels[i], channels[i + 1], stats[i], cancelled, errors),
+            name=f"ingest-{name}",
+            daemon=True,
+        )
+        for i, (name, transform) in enumerate(stages)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    results = []
+    try:
+        while True:
+            item = _get(channels[-1], cancelled)
+            if item is _DONE:
+                break
+            results.append(item)
+    except PipelineCancelled:
+        pass
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.perf_counter() - started
+
+    if errors:
+        raise errors[0]
+
+    return results, {
+        "wall_seconds": round(wall_seconds, 4),
+        "stages": {stage.name: stage.as_dict() for stage in stats},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """Human-readable lines for a run_pipeline report."""
+    lines = [f"  Pipeline wall time: {report['wall_seconds']:.2f}s"]
+    for name, stage in report["stages"].items():
+        rate = stage["items_per_second"]
+        lines.append(
+            f"    {name:<8} {stage['items_out']:>6} out  busy {stage['busy_seconds']:>7.2f}s  "
+            f"waiting {stage['input_wait_seconds']:>7.2f}s  "
+            + (f"{rate:,.1f}/s" if rate is not None else "-")
+        )
+    return lines
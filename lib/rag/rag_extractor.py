@@ -2,7 +2,7 @@
 """
 RAG Extractor - Document Vectorization for /enhance
 
-Simple pipeline:
+Streaming pipeline (lib/rag/pipeline.py), each stage on its own thread:
 1. Extract text from document
 2. Split into chunks
 3. Embed chunks locally
@@ -13,12 +13,19 @@ No categorization - all chunks are stored uniformly and queried by semantic simi
 
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from lib.rag.embedder import LocalEmbedder
+from lib.rag.pipeline import format_report, run_pipeline
 from lib.rag.vector_store import CampaignVectorStore
 
+EMBED_BATCH_SIZE = 32
+# Without a header to cut at, the streaming chunker flushes at a paragraph
+# break once it buffers this many chunks' worth of text.
+STREAM_FLUSH_CHUNKS = 8
+HEADER_PATTERN = r'^(?:#{1,3}\s+.+|[A-Z][A-Z\s]+:|Chapter \d+|PART [IVX]+)'
+
 
 class RAGExtractor:
     """Document vectorization for semantic search."""
@@ -53,17 +60,26 @@ class RAGExtractor:
     def extract_from_document(
         self,
         filepath: str,
-        clear_existing: bool = False
+        clear_existing: bool = False,
+        on_text: Optional[Callable[[str], None]] = None,
+        chunk_writer: Optional[Callable[[Iterator[Tuple[int, str]]], Any]] = None,
     ) -> Dict[str, Any]:
         """
         Extract text from a document and store as vectors.
 
+        Extraction, chunking, embedding and storage run as one streaming
+        pipeline, each stage on its own thread, so the document is read once
+        and later stages start on the first pieces of text.
+
         Args:
             filepath: Path to the document (PDF, DOCX, TXT, etc.)
             clear_existing: Whether to clear existing vectors first (default: False)
+            on_text: Optional callback for each extracted piece of text, in order
+            chunk_writer: Optional final stage; receives (index, chunk) pairs
+                once each chunk is stored
 
         Returns:
-            Dict with extraction stats
+            Dict with extraction stats, including per-stage timings under "pipeline"
         """
         filepath = Path(filepath)
         self._document_name = filepath.stem
@@ -80,28 +96,61 @@ class RAGExtractor:
             if existing_count > 0:
                 print(f"Preserving {existing_count} existing vectors (use clear_existing=True to reset)")
 
-        # Step 1: Extract raw text
-        print("Step 1: Extracting text from document...")
-        raw_text = self._extract_text(filepath)
-        print(f"  Extracted {len(raw_text):,} characters")
-
-        # Step 2: Split into chunks
-        print("Step 2: Splitting into chunks...")
-        chunks = self._split_into_chunks(raw_text)
-        print(f"  Created {len(chunks)} chunks")
-
-        # Step 3: Embed all chunks
-        print("Step 3: Embedding chunks...")
-        embeddings = self.embedder.embed_batch(
-            chunks,
-            batch_size=32,
-            show_progress=True
-        )
-        print(f"  Embedded {len(embeddings)} chunks")
-
-        # Step 4: Store in vector database
-        print("Step 4: Storing in vector database...")
-        self._store_chunks(chunks, embeddings)
+        print("Extracting, chunking, embedding and storing in one pass...")
+        total_chars = 0
+        cache_stats: Dict[str, Any] = {}
+
+        def extract(_inputs):
+            nonlocal total_chars
+            for piece in self._iter_text(filepath):
+                total_chars += len(piece)
+                if on_text:
+                    on_text(piece)
+                yield piece
+
+        def embed(chunks):
+            for batch in _batched(enumerate(chunks), EMBED_BATCH_SIZE):
+                embeddings = self.embedder.embed_batch(
+                    [text for _, text in batch],
+                    batch_size=EMBED_BATCH_SIZE,
+                    show_progress=False
+                )
+                _add_cache_stats(cache_stats, getattr(self.embedder, "last_batch_stats", None))
+                for (index, text), embedding in zip(batch, embeddings, strict=True):
+                    yield index, text, embedding
+
+        def store(embedded):
+            for batch in _batched(embedded, EMBED_BATCH_SIZE):
+                self._store_chunks(
+                    [(index, text) for index, text, _ in batch],
+                    [embedding for _, _, embedding in batch]
+                )
+                for index, text, _ in batch:
+                    yield index, text
+
+        stages = [
+            ("extract", extract),
+            ("chunk", self.iter_chunks),
+            ("embed", embed),
+            ("store", store),
+        ]
+        if chunk_writer:
+            def write(stored):
+                chunk_writer(stored)
+                return ()
+
+            stages.append(("write", write))
+        _, pipeline = run_pipeline(stages)
+        total_chunks = pipeline["stages"]["store"]["items_out"]
+
+        print(f"  Extracted {total_chars:,} characters into {total_chunks} chunks")
+        for line in format_report(pipeline):
+            print(line)
+        if cache_stats:
+            print(
+                f"  Embedding cache: {cache_stats['cache_hits']}/{cache_stats['texts']} hits "
+                f"({cache_stats['hit_rate']:.0%}), ~{cache_stats['seconds_saved']:.1f}s saved"
+            )
 
         stats = self.vector_store.get_stats()
         print(f"  Stored {stats['total_chunks']} chunks total")
@@ -111,9 +160,11 @@ class RAGExtractor:
             "source_file": str(filepath),
             "document_name": self._document_name,
             "extraction_date": datetime.now().isoformat(),
-            "total_chars": len(raw_text),
-            "total_chunks": len(chunks),
+            "total_chars": total_chars,
+            "total_chunks": total_chunks,
             "chunk_size": self.chunk_size,
+            "embedding_cache": cache_stats,
+            "pipeline": pipeline,
         }
 
         print("\nExtraction complete!")
@@ -163,49 +214,99 @@ class RAGExtractor:
             "extraction": self._extraction_metadata,
         }
 
-    def _extract_text(self, filepath: Path) -> str:
-        """Extract text from a document file."""
+    def _iter_text(self, filepath: Path) -> Iterator[str]:
+        """Yield the text of a document file in order."""
         from lib.content_extractor import ContentExtractor
 
         extractor = ContentExtractor()
-        return extractor.extract_text(str(filepath))
+        return extractor.iter_text(str(filepath))
 
     def _split_into_chunks(self, text: str) -> List[str]:
         """Split text into chunks of approximately chunk_size characters."""
-        chunks = []
+        return list(self.iter_chunks([text]))
+
+    def iter_chunks(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        Chunk a stream of text pieces as they arrive.
 
-        # Try to split by headers first (markdown or common patterns)
-        header_pattern = r'^(?:#{1,3}\s+.+|[A-Z][A-Z\s]+:|Chapter \d+|PART [IVX]+)'
-        sections = re.split(f'({header_pattern})', text, flags=re.MULTILINE)
+        The text is split by headers (markdown or common patterns) and the
+        sections are packed into chunks of about chunk_size characters.  The
+        buffer is cut at the last header seen, so the chunks match splitting
+        the joined text in one go; a header-less stretch longer than
+        STREAM_FLUSH_CHUNKS chunks is cut at a paragraph break instead.
 
-        current_chunk = ""
+        Args:
+            pieces: Text in document order (pages, or the whole document)
+
+        Yields:
+            Chunk texts in order
+        """
+        header = re.compile(HEADER_PATTERN, re.MULTILINE)
+        flush_at = self.chunk_size * STREAM_FLUSH_CHUNKS
+        buffer = ""
+        current = ""
+        total_chars = 0
+        # The first chunk waits for a second one: a document that yields a
+        # single chunk falls back to paragraph splitting of the whole text.
+        held: List[str] = []
+        seen: Optional[List[str]] = []
+
+        for piece in pieces:
+            if not piece:
+                continue
+            total_chars += len(piece)
+            if seen is not None:
+                seen.append(piece)
+            buffer += piece
+
+            cut = max((match.start() for match in header.finditer(buffer)), default=0)
+            if not cut and len(buffer) > max(flush_at, len(piece)):
+                cut = buffer.rfind('\n\n') + 2 if '\n\n' in buffer else 0
+            if not cut:
+                continue
+
+            chunks, current = self._pack_sections(buffer[:cut], current)
+            buffer = buffer[cut:]
+            held.extend(chunks)
+            if len(held) > 1:
+                seen = None
+                yield from held
+                held = []
+
+        chunks, current = self._pack_sections(buffer, current)
+        held.extend(chunks)
+        if current.strip():
+            held.append(current.strip())
+
+        # If we got very few chunks, fall back to paragraph splitting
+        if seen is not None and len(held) <= 1 and total_chars > self.chunk_size:
+            held = self._split_by_paragraphs("".join(seen))
+        yield from held
+
+    def _pack_sections(self, text: str, current: str) -> Tuple[List[str], str]:
+        """Pack the header sections of text onto current; returns (full chunks, new current)."""
+        chunks = []
+        sections = re.split(f'({HEADER_PATTERN})', text, flags=re.MULTILINE)
 
         for section in sections:
             if not section.strip():
                 continue
 
-            if len(current_chunk) + len(section) > self.chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
+            if len(current) + len(section) > self.chunk_size:
+                if current:
+                    chunks.append(current.strip())
 
                 # If section itself is too large, split it further
                 if len(section) > self.chunk_size:
                     sub_chunks = self._split_by_paragraphs(section)
                     chunks.extend(sub_chunks[:-1])  # Add all but last
-                    current_chunk = sub_chunks[-1] if sub_chunks else ""
+                    current = sub_chunks[-1] if sub_chunks else ""
                 else:
-                    current_chunk = section
+                    current = section
             else:
-                current_chunk += section
-
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+                current += section
 
-        # If we got very few chunks, fall back to paragraph splitting
-        if len(chunks) <= 1 and len(text) > self.chunk_size:
-            chunks = self._split_by_paragraphs(text)
-
-        return chunks
+        return chunks, current
 
     def _split_by_paragraphs(self, text: str) -> List[str]:
         """Split text by paragraphs, respecting chunk size."""
@@ -227,24 +328,44 @@ class RAGExtractor:
 
         return chunks
 
-    def _store_chunks(self, chunks: List[str], embeddings):
-        """Store chunks in the vector store with basic metadata."""
+    def _store_chunks(self, indexed_chunks: List[Tuple[int, str]], embeddings):
+        """Store (index, text) chunks in the vector store with basic metadata."""
         metadatas = []
-        for i in range(len(chunks)):
+        for i, _ in indexed_chunks:
             metadatas.append({
                 "chunk_index": i,
                 "document": self._document_name or "unknown",
             })
 
-        # Store all chunks
         self.vector_store.add_chunks(
-            chunks=chunks,
+            chunks=[text for _, text in indexed_chunks],
             embeddings=[emb.tolist() for emb in embeddings],
             metadatas=metadatas,
-            ids=[f"doc_{i:04d}" for i in range(len(chunks))]
+            ids=[f"doc_{i:04d}" for i, _ in indexed_chunks]
         )
 
 
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of up to size items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _add_cache_stats(totals: Dict[str, Any], batch: Optional[Dict[str, Any]]):
+    """Fold one embed_batch call's cache stats into running totals."""
+    if not batch:
+        return
+    for key in ("texts", "cache_hits", "cache_misses", "seconds_embedding", "seconds_saved"):
+        totals[key] = totals.get(key, 0) + batch.get(key, 0)
+    totals["hit_rate"] = totals["cache_hits"] / totals["texts"] if totals["texts"] else 0.0
+
+
 def main():
     """CLI for RAG extraction."""
     import sys
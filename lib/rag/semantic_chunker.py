@@ -6,13 +6,34 @@ Pre-computes query embeddings and scores chunks against categories
 via cosine similarity with threshold-based assignment.
 """
 
+import hashlib
+import os
+import tempfile
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 
+from lib.rag import extraction_queries
 from lib.rag.embedder import LocalEmbedder
+from lib.rag.embedding_cache import default_cache_dir
 from lib.rag.extraction_queries import EXTRACTION_QUERIES, get_all_types
 
 
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so a dot product is a cosine similarity."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k best scores per row, best first."""
+    k = min(k, scores.shape[-1])
+    top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(top, order, axis=-1)
+
+
 class SemanticChunker:
     """Categorize text chunks using semantic similarity."""
 
@@ -21,7 +42,8 @@ class SemanticChunker:
     def __init__(
         self,
         embedder: Optional[LocalEmbedder] = None,
-        threshold: float = None
+        threshold: float = None,
+        table_dir: str = None
     ):
         """
         Initialize the semantic chunker.
@@ -29,54 +51,157 @@ class SemanticChunker:
         Args:
             embedder: LocalEmbedder instance. Creates one if not provided.
             threshold: Minimum similarity score to assign a category.
+            table_dir: Where query embedding tables are kept (default:
+                       query-tables/ under the embedding cache root).
         """
         self.embedder = embedder or LocalEmbedder()
         self.threshold = threshold or self.DEFAULT_THRESHOLD
+        if table_dir:
+            self.table_dir: Optional[Path] = Path(table_dir)
+        else:
+            cache_root = default_cache_dir()
+            self.table_dir = cache_root / "query-tables" if cache_root else None
         self._query_embeddings: Dict[str, np.ndarray] = {}
         self._category_embeddings: Dict[str, np.ndarray] = {}
+        # Unit-length centroids (one row per category) stacked above every
+        # query, so one matmul scores a batch against both
+        self._categories: List[str] = []
+        self._scoring_matrix: Optional[np.ndarray] = None
+        self._query_starts: Optional[np.ndarray] = None
+        self._query_counts: Optional[np.ndarray] = None
         self._initialized = False
 
     def _ensure_initialized(self):
-        """Lazy-initialize query embeddings on first use."""
+        """Lazy-initialize query embeddings on first use.
+
+        The embeddings come from a stored table when one matches the model and
+        the current extraction_queries.py, so the model is not loaded at all.
+        """
         if self._initialized:
             return
 
-        print("Initializing semantic chunker (computing query embeddings)...")
+        if not self._load_query_table():
+            print("Initializing semantic chunker (computing query embeddings)...")
+
+            # Embed all queries for each category
+            for content_type, queries in EXTRACTION_QUERIES.items():
+                # Embed each individual query
+                embeddings = self.embedder.embed_batch(queries)
+                self._query_embeddings[content_type] = embeddings
 
-        # Embed all queries for each category
-        for content_type, queries in EXTRACTION_QUERIES.items():
-            # Embed each individual query
-            embeddings = self.embedder.embed_batch(queries)
-            self._query_embeddings[content_type] = embeddings
+                # Also compute a centroid (average) embedding for the category
+                self._category_embeddings[content_type] = embeddings.mean(axis=0)
 
-            # Also compute a centroid (average) embedding for the category
-            self._category_embeddings[content_type] = embeddings.mean(axis=0)
+            self._save_query_table()
+            print(f"  Initialized {len(self._query_embeddings)} categories")
 
+        self._build_scoring_matrix()
         self._initialized = True
-        print(f"  Initialized {len(self._query_embeddings)} categories")
 
-    def score_chunk(self, chunk_text: str) -> Dict[str, float]:
+    def _query_table_path(self) -> Optional[Path]:
+        """Table file keyed by model name and a hash of extraction_queries.py."""
+        model_name = getattr(self.embedder, "model_name", None)
+        if self.table_dir is None or not model_name:
+            return None
+        digest = hashlib.sha256(model_name.encode("utf-8"))
+        digest.update(Path(extraction_queries.__file__).read_bytes())
+        return self.table_dir / f"{digest.hexdigest()[:32]}.npz"
+
+    def _load_query_table(self) -> bool:
+        """Fill the query and centroid embeddings from a stored table."""
+        path = self._query_table_path()
+        if path is None:
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as table:
+                categories = table["categories"].tolist()
+                counts = table["query_counts"]
+                queries = table["queries"]
+                centroids = table["centroids"]
+        except (OSError, KeyError, ValueError):
+            return False
+        if len(centroids) != len(categories) or int(counts.sum()) != len(queries):
+            return False
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        for column, content_type in enumerate(categories):
+            start = int(starts[column])
+            self._query_embeddings[content_type] = queries[start:start + int(counts[column])]
+            self._category_embeddings[content_type] = centroids[column]
+        return True
+
+    def _save_query_table(self):
+        """Store the query and centroid embeddings for later processes."""
+        path = self._query_table_path()
+        if path is None:
+            return
+        categories = list(self._category_embeddings)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(suffix=".npz", dir=path.parent)
+        except OSError as e:
+            print(f"  Warning: query table not saved: {e}")
+            return
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(
+                    handle,
+                    categories=np.array(categories),
+                    query_counts=np.array([len(self._query_embeddings[cat]) for cat in categories]),
+                    queries=np.vstack([self._query_embeddings[cat] for cat in categories]),
+                    centroids=np.stack([self._category_embeddings[cat] for cat in categories]),
+                )
+            os.replace(tmp_name, path)
+        except OSError as e:
+            Path(tmp_name).unlink(missing_ok=True)
+            print(f"  Warning: query table not saved: {e}")
+
+    def _build_scoring_matrix(self):
+        """Stack normalized centroids and queries into one (C + Q) x dim matrix."""
+        self._categories = list(self._category_embeddings)
+        counts = [len(self._query_embeddings[cat]) for cat in self._categories]
+        self._query_counts = np.array(counts)
+        self._query_starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(int)
+        self._scoring_matrix = _normalize_rows(np.vstack(
+            [np.stack([self._category_embeddings[cat] for cat in self._categories])]
+            + [self._query_embeddings[cat] for cat in self._categories]
+        ))
+
+    def score_embeddings(self, chunk_embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Score a chunk against all content type categories.
+        Score chunk embeddings against every category centroid and query at once.
 
         Args:
-            chunk_text: The text to score.
+            chunk_embeddings: Array of chunk embeddings (n_chunks x embedding_dim).
 
         Returns:
-            Dict mapping content type to similarity score.
+            (centroid_scores, query_scores): n_chunks x n_categories cosine
+            similarities to the category centroids, and n_chunks x n_queries
+            similarities to each query (columns grouped by category).
         """
         self._ensure_initialized()
+        chunks = _normalize_rows(np.atleast_2d(chunk_embeddings))
+        similarities = chunks @ self._scoring_matrix.T
+        n_categories = len(self._categories)
+        return similarities[:, :n_categories], similarities[:, n_categories:]
 
-        # Embed the chunk
-        chunk_embedding = self.embedder.embed(chunk_text)
+    def _detailed(self, query_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-category max and mean of the query similarities."""
+        maxima = np.maximum.reduceat(query_scores, self._query_starts, axis=1)
+        means = np.add.reduceat(query_scores, self._query_starts, axis=1) / self._query_counts
+        return maxima, means
 
-        scores = {}
-        for content_type, category_embedding in self._category_embeddings.items():
-            # Compute similarity to category centroid
-            similarity = self.embedder.similarity(chunk_embedding, category_embedding)
-            scores[content_type] = float(similarity)
+    def score_chunk(self, chunk_text: str) -> Dict[str, float]:
+        """
+        Score a chunk against all content type categories.
 
-        return scores
+        Args:
+            chunk_text: The text to score.
+
+        Returns:
+            Dict mapping content type to similarity score.
+        """
+        centroid_scores, _ = self.score_embeddings(self.embedder.embed_batch([chunk_text]))
+        return dict(zip(self._categories, centroid_scores[0].tolist(), strict=True))
 
     def score_chunk_detailed(self, chunk_text: str) -> Dict[str, Dict]:
         """
@@ -88,25 +213,20 @@ class SemanticChunker:
         Returns:
             Dict with 'scores' (category -> score) and 'details' (category -> query scores)
         """
-        self._ensure_initialized()
-
-        chunk_embedding = self.embedder.embed(chunk_text)
+        _, query_scores = self.score_embeddings(self.embedder.embed_batch([chunk_text]))
+        maxima, means = self._detailed(query_scores)
 
         scores = {}
         details = {}
-
-        for content_type, query_embeddings in self._query_embeddings.items():
-            # Compute similarity to each query in the category
-            sims = self.embedder.similarities(chunk_embedding, query_embeddings)
+        for column, content_type in enumerate(self._categories):
+            start = self._query_starts[column]
+            sims = query_scores[0, start:start + self._query_counts[column]]
 
             # Use max similarity as the category score
-            max_sim = float(sims.max())
-            avg_sim = float(sims.mean())
-
-            scores[content_type] = max_sim
+            scores[content_type] = float(maxima[0, column])
             details[content_type] = {
-                "max_similarity": max_sim,
-                "avg_similarity": avg_sim,
+                "max_similarity": float(maxima[0, column]),
+                "avg_similarity": float(means[0, column]),
                 "query_similarities": sims.tolist()
             }
 
@@ -128,24 +248,22 @@ class SemanticChunker:
         Returns:
             List of (category, score) tuples, sorted by score descending.
         """
-        scores = self.score_chunk(chunk_text)
+        centroid_scores, _ = self.score_embeddings(self.embedder.embed_batch([chunk_text]))
+        row = centroid_scores[0]
 
         if allow_multiple:
             # Return all categories above threshold
-            matches = [
-                (cat, score) for cat, score in scores.items()
-                if score >= self.threshold
+            ranked = _top_k(row[np.newaxis, :], len(self._categories))[0]
+            return [
+                (self._categories[column], float(row[column]))
+                for column in ranked
+                if row[column] >= self.threshold
             ]
-        else:
-            # Return only the best match if above threshold
-            best_cat = max(scores, key=scores.get)
-            if scores[best_cat] >= self.threshold:
-                matches = [(best_cat, scores[best_cat])]
-            else:
-                matches = [("general", scores[best_cat])]
 
-        # Sort by score descending
-        return sorted(matches, key=lambda x: x[1], reverse=True)
+        # Return only the best match if above threshold
+        best = int(_top_k(row[np.newaxis, :], 1)[0, 0])
+        category = self._categories[best] if row[best] >= self.threshold else "general"
+        return [(category, float(row[best]))]
 
     def categorize_chunks(
         self,
@@ -155,6 +273,9 @@ class SemanticChunker:
         """
         Categorize multiple chunks into content type buckets.
 
+        All chunks are embedded in one batch and scored with a single matrix
+        product, so the cost per chunk is a row of that product.
+
         Args:
             chunks: List of text chunks to categorize.
             show_progress: Whether to show progress.
@@ -168,32 +289,27 @@ class SemanticChunker:
         """
         self._ensure_initialized()
 
+        # Initialize result buckets
+        categorized = {cat: [] for cat in get_all_types()}
+        categorized["general"] = []
+        if not chunks:
+            return categorized
+
         # Embed all chunks in batch
         if show_progress:
             print(f"Embedding {len(chunks)} chunks...")
         chunk_embeddings = self.embedder.embed_batch(chunks, show_progress=show_progress)
 
-        # Initialize result buckets
-        categorized = {cat: [] for cat in get_all_types()}
-        categorized["general"] = []
-
-        # Score and categorize each chunk
-        for idx, (chunk_text, chunk_emb) in enumerate(
-            zip(chunks, chunk_embeddings, strict=False)
-        ):
-            # Score against all categories
-            scores = {}
-            for content_type, category_embedding in self._category_embeddings.items():
-                similarity = self.embedder.similarity(chunk_emb, category_embedding)
-                scores[content_type] = float(similarity)
+        centroid_scores, _ = self.score_embeddings(chunk_embeddings)
+        best = _top_k(centroid_scores, 1)[:, 0]
+        confidences = centroid_scores[np.arange(len(chunks)), best]
 
-            # Find best category
-            best_cat = max(scores, key=scores.get)
-            confidence = scores[best_cat]
+        for idx, chunk_text in enumerate(chunks):
+            confidence = float(confidences[idx])
 
             # Assign to category or general
             if confidence >= self.threshold:
-                category = best_cat
+                category = self._categories[best[idx]]
             else:
                 category = "general"
 
@@ -201,7 +317,9 @@ class SemanticChunker:
                 "index": idx,
                 "text": chunk_text,
                 "confidence": confidence,
-                "all_scores": scores
+                "all_scores": dict(
+                    zip(self._categories, centroid_scores[idx].tolist(), strict=True)
+                ),
             })
 
         return categorized
@@ -217,7 +335,7 @@ class SemanticChunker:
                 cat: len(embeddings)
                 for cat, embeddings in self._query_embeddings.items()
             },
-            "embedding_dimension": self.embedder.embedding_dimension
+            "embedding_dimension": int(self._scoring_matrix.shape[1])
         }
 
 
@@ -12,6 +12,7 @@ import json
 import random
 import re
 import sys
+import time
 import argparse
 from contextlib import contextmanager
 from datetime import datetime, timezone
@@ -28,6 +29,7 @@ except ImportError:
         RESET = RS = B = C = G = R = Y = DIM = DM = MAGENTA = BOLD_GREEN = BOLD_RED = BOLD_CYAN = BOLD_YELLOW = CYAN = ""
 
 from world_repository import ConcurrentWriteError, WorldRepository
+from metrics import histogram
 from combat_rules import first_present, node_mechanics
 from campaign_context import (
     InvalidCampaignName,
@@ -35,6 +37,19 @@ from campaign_context import (
     scoped_campaign_name,
 )
 
+_TICK_STAGE_SECONDS = histogram(
+    "dm_tick_stage_seconds", "Time spent in each stage of a world tick.", ("stage",)
+)
+
+
+def _timed_stage(stage: str, func, *args):
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        _TICK_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - started)
+
+
 NODE_TYPES = [
     "player", "npc", "location", "item", "creature",
     "fact", "quest", "consequence", "spell", "technique",
@@ -1946,19 +1961,19 @@ class WorldGraph:
 
     def tick(self, elapsed_hours: float, sleeping: bool = False) -> dict:
         B, RS, C, G, R, Y, DM = Colors.B, Colors.RESET, Colors.C, Colors.G, Colors.R, Colors.Y, Colors.DIM
-        w = self._load()
-
-        stat_changes_list = self._tick_custom_stats(w, elapsed_hours, sleeping)
-        expired_effects = self._tick_timed_effects(w, elapsed_hours)
-        production = self._tick_production(w, elapsed_hours)
-        self._tick_consequences_elapsed(w, elapsed_hours)
-        expenses = self._tick_expenses_from_world(w, elapsed_hours)
-        income = self._tick_income_from_world(w, elapsed_hours)
-        events = self._tick_random_events_from_world(w, elapsed_hours)
-        threshold_warnings = self._check_stat_thresholds(w)
-        self._save(w)
-
-        consequences_triggered = self.consequence_tick(elapsed_hours)
+        w = _timed_stage("load", self._load)
+
+        stat_changes_list = _timed_stage("custom_stats", self._tick_custom_stats, w, elapsed_hours, sleeping)
+        expired_effects = _timed_stage("timed_effects", self._tick_timed_effects, w, elapsed_hours)
+        production = _timed_stage("production", self._tick_production, w, elapsed_hours)
+        _timed_stage("consequences_elapsed", self._tick_consequences_elapsed, w, elapsed_hours)
+        expenses = _timed_stage("expenses", self._tick_expenses_from_world, w, elapsed_hours)
+        income = _timed_stage("income", self._tick_income_from_world, w, elapsed_hours)
+        events = _timed_stage("random_events", self._tick_random_events_from_world, w, elapsed_hours)
+        threshold_warnings = _timed_stage("thresholds", self._check_stat_thresholds, w)
+        _timed_stage("save", self._save, w)
+
+        consequences_triggered = _timed_stage("consequence_triggers", self.consequence_tick, elapsed_hours)
 
         stat_changes: dict = {ch["stat"]: ch for ch in stat_changes_list}
 
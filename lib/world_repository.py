@@ -7,15 +7,58 @@ import fcntl
 import json
 import os
 import tempfile
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Callable, Iterator
 
+try:
+    from metrics import histogram
+except ImportError:  # imported as ``lib.world_repository`` without lib/ on sys.path
+    from lib.metrics import histogram
+
+
+_LOAD_SECONDS = histogram(
+    "dm_world_load_seconds", "Time to lock and parse world.json."
+).labels()
+_SAVE_SECONDS = histogram(
+    "dm_world_save_seconds", "Time to write, fsync and replace world.json."
+).labels()
+
 
 class ConcurrentWriteError(RuntimeError):
     """Raised when a stale world snapshot attempts to replace newer state."""
 
 
+CommitListener = Callable[[Path, int], None]
+_commit_listeners: list[CommitListener] = []
+
+
+def add_commit_listener(listener: CommitListener) -> None:
+    """Call ``listener(world_file, revision)`` after every in-process commit.
+
+    Readers that cache projections use this to drop entries immediately;
+    commits made by other processes are still detected by their revision.
+    """
+    if listener not in _commit_listeners:
+        _commit_listeners.append(listener)
+
+
+def remove_commit_listener(listener: CommitListener) -> None:
+    if listener in _commit_listeners:
+        _commit_listeners.remove(listener)
+
+
+def _notify_commit(world_file: Path, revision: int) -> None:
+    for listener in list(_commit_listeners):
+        try:
+            listener(world_file, revision)
+        except Exception:
+            # The write is already durable; a broken cache hook must not
+            # turn it into a failure for the writer.
+            pass
+
+
 class WorldRepository:
     """Load and atomically commit the authoritative world state.
 
@@ -58,11 +101,16 @@ class WorldRepository:
                 fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
 
     def load(self) -> dict:
+        started = time.perf_counter()
         with self._lock(exclusive=False):
-            return self._read_unlocked()
+            data = self._read_unlocked()
+        _LOAD_SECONDS.observe(time.perf_counter() - started)
+        return data
 
     def _write_unlocked(self, data: dict, base_revision: int) -> None:
-        data.setdefault("meta", {})["revision"] = base_revision + 1
+        started = time.perf_counter()
+        revision = base_revision + 1
+        data.setdefault("meta", {})["revision"] = revision
         fd, tmp_name = tempfile.mkstemp(
             prefix=f".{self.world_file.name}.",
             suffix=".tmp",
@@ -85,6 +133,8 @@ class WorldRepository:
             except FileNotFoundError:
                 pass
             raise
+        _SAVE_SECONDS.observe(time.perf_counter() - started)
+        _notify_commit(self.world_file, revision)
 
     def save(self, data: dict, expected_revision: int | None = None) -> bool:
         if expected_revision is None:
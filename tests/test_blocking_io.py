@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend import blocking_io
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    blocking_io.shutdown_blocking_io()
+    yield
+    blocking_io.shutdown_blocking_io()
+
+
+def test_concurrent_calls_with_one_key_share_a_computation():
+    calls = []
+    release = threading.Event()
+
+    def project():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        return {"revision": 3}
+
+    async def scenario():
+        waiters = [
+            asyncio.create_task(blocking_io.run_blocking(("views", "camp", 3), project))
+            for _ in range(8)
+        ]
+        await asyncio.sleep(0.05)
+        assert blocking_io.in_flight_count() == 1
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert calls[0].startswith("campaign-io")
+    assert all(result is results[0] for result in results)
+    assert blocking_io.in_flight_count() == 0
+
+
+def test_unkeyed_calls_and_new_revisions_are_not_coalesced():
+    calls = []
+
+    def read(tag):
+        calls.append(tag)
+        return tag
+
+    async def scenario():
+        return await asyncio.gather(
+            blocking_io.run_blocking(None, read, "a"),
+            blocking_io.run_blocking(None, read, "b"),
+            blocking_io.run_blocking(("views", 1), read, 1),
+            blocking_io.run_blocking(("views", 2), read, 2),
+        )
+
+    assert asyncio.run(scenario()) == ["a", "b", 1, 2]
+    assert sorted(map(str, calls)) == ["1", "2", "a", "b"]
+
+
+def test_errors_reach_every_waiter_and_clear_the_flight():
+    release = threading.Event()
+
+    def broken():
+        release.wait(5)
+        raise ValueError("bad world")
+
+    async def scenario():
+        waiters = [
+            asyncio.create_task(blocking_io.run_blocking("k", broken)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert blocking_io.in_flight_count() == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_computation():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "done"
+
+    async def scenario():
+        first = asyncio.create_task(blocking_io.run_blocking("k", slow))
+        second = asyncio.create_task(blocking_io.run_blocking("k", slow))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        release.set()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ("done", True)
+
+
+def test_blocking_work_does_not_stall_the_event_loop():
+    def project():
+        time.sleep(0.3)
+        return "view"
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await blocking_io.run_blocking("k", project)
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+
+    assert result == "view"
+    assert ticks >= 10
@@ -0,0 +1,97 @@
+import json
+import shutil
+
+import pytest
+
+from lib.campaign_catalog import CampaignCatalog
+
+
+def _write_overview(campaigns_dir, name, **overview):
+    campaign = campaigns_dir / name
+    campaign.mkdir(exist_ok=True)
+    (campaign / "campaign-overview.json").write_text(json.dumps(overview))
+    return campaign
+
+
+@pytest.fixture
+def summarized():
+    calls = []
+
+    def summarize(campaign_dir):
+        calls.append(campaign_dir.name)
+        overview_file = campaign_dir / "campaign-overview.json"
+        overview = json.loads(overview_file.read_text()) if overview_file.exists() else {}
+        return {"name": campaign_dir.name, "genre": overview.get("genre", "")}
+
+    return calls, summarize
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_catalog_rebuilds_only_campaigns_whose_files_changed(
+    tmp_path, summarized, use_inotify
+):
+    calls, summarize = summarized
+    _write_overview(tmp_path, "alpha", genre="noir")
+    _write_overview(tmp_path, "beta", genre="space")
+    catalog = CampaignCatalog(
+        tmp_path,
+        ("campaign-overview.json",),
+        summarize,
+        poll_interval=0.0,
+        use_inotify=use_inotify,
+    )
+    if use_inotify and not catalog.watching:
+        pytest.skip("inotify is not available here")
+
+    assert [entry["genre"] for entry in catalog.summaries()] == ["noir", "space"]
+    assert catalog.summaries() == catalog.summaries()
+    assert sorted(calls) == ["alpha", "beta"]
+
+    _write_overview(tmp_path, "beta", genre="western")
+    (tmp_path / "alpha" / "session-log.md").write_text("unrelated")
+    assert [entry["genre"] for entry in catalog.summaries()] == ["noir", "western"]
+    assert sorted(calls) == ["alpha", "beta", "beta"]
+    catalog.close()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_catalog_tracks_created_and_removed_campaigns(
+    tmp_path, summarized, use_inotify
+):
+    _calls, summarize = summarized
+    _write_overview(tmp_path, "alpha")
+    # A long poll interval: directory changes must still be seen immediately.
+    catalog = CampaignCatalog(
+        tmp_path,
+        ("campaign-overview.json",),
+        summarize,
+        poll_interval=3600,
+        use_inotify=use_inotify,
+    )
+    assert [entry["name"] for entry in catalog.summaries()] == ["alpha"]
+
+    _write_overview(tmp_path, "gamma", genre="horror")
+    (tmp_path / "not-a-campaign.txt").write_text("x")
+    assert [entry["name"] for entry in catalog.summaries()] == ["alpha", "gamma"]
+
+    shutil.rmtree(tmp_path / "alpha")
+    assert [entry["name"] for entry in catalog.summaries()] == ["gamma"]
+    catalog.close()
+
+
+def test_watched_catalog_reads_are_served_from_memory(tmp_path, summarized, monkeypatch):
+    _calls, summarize = summarized
+    for index in range(20):
+        _write_overview(tmp_path, f"campaign-{index:02d}")
+    catalog = CampaignCatalog(tmp_path, ("campaign-overview.json",), summarize)
+    if not catalog.watching:
+        pytest.skip("inotify is not available here")
+    catalog.summaries()
+
+    def no_stat(*_args, **_kwargs):
+        raise AssertionError("an unchanged catalog must not touch the tree")
+
+    monkeypatch.setattr("lib.campaign_catalog._file_stamp", no_stat)
+    monkeypatch.setattr(CampaignCatalog, "_list_names", no_stat)
+    assert len(catalog.summaries()) == 20
+    catalog.close()
@@ -95,3 +95,19 @@ def test_concurrent_campaign_creation_keeps_the_winning_directory(tmp_path):
     campaign = tmp_path / "world-state" / "campaigns" / "same-name"
     assert (campaign / "world.json").is_file()
     assert (campaign / "campaign-overview.json").is_file()
+
+
+def test_list_campaigns_follows_world_changes(world_state):
+    from lib.world_graph import WorldGraph
+
+    manager = CampaignManager(str(world_state))
+    graph = WorldGraph(world_state / "campaigns" / "test")
+    graph.ensure_initialized()
+    graph.add_node("player:active", "player", "Mira", {"class": "Rogue", "level": 2})
+
+    listed = manager.list_campaigns()
+    assert listed[0]["campaign_name"] == "Test"
+    assert listed[0]["character"]["name"] == "Mira"
+
+    graph.update_node("player:active", {"data": {"level": 3}})
+    assert manager.list_campaigns()[0]["character"]["level"] == 3
@@ -398,3 +398,114 @@ def test_metadata_location_is_last_resort(tmp_path):
     (campaign / "world.json").write_text(json.dumps(world), encoding="utf-8")
 
     assert CampaignViewProjector(campaign).character()["location"] == "Metadata fallback"
+
+
+def test_projector_loads_world_once_and_memoizes_sections_by_revision(
+    tmp_path, monkeypatch
+):
+    from lib import world_graph
+
+    campaign = _write_campaign(tmp_path)
+    loads = []
+    real_load = world_graph.WorldRepository.load
+
+    def counting_load(self):
+        loads.append(self.world_file)
+        return real_load(self)
+
+    monkeypatch.setattr(world_graph.WorldRepository, "load", counting_load)
+
+    first = get_campaign_views(campaign)
+    assert len(loads) == 1
+    assert get_campaign_views(campaign) == first
+    assert len(loads) == 1
+
+    world_graph.WorldGraph(campaign_dir=campaign).update_node(
+        "player:active", {"name": "Eve"}
+    )
+    loads.clear()
+    updated = get_campaign_views(campaign)
+    assert updated["character"]["name"] == "Eve"
+    assert len(loads) == 1
+
+
+def test_section_contract_rejects_non_json_values(tmp_path):
+    import pytest
+
+    from backend.campaign_views import _check_contract
+
+    _check_contract({"a": [1, 2.5, None, True, {"b": "c"}]})
+    with pytest.raises(TypeError):
+        _check_contract({"a": {1, 2}})
+    with pytest.raises(ValueError):
+        _check_contract([float("nan")])
+
+
+def test_sections_are_lazy_and_invalidated_by_their_own_inputs(tmp_path, monkeypatch):
+    from lib.world_graph import WorldGraph
+
+    campaign = _write_campaign(tmp_path)
+    built = []
+    for name in ("quests", "wiki"):
+        real = getattr(CampaignViewProjector, f"_project_{name}")
+
+        def counting(self, _real=real, _name=name):
+            built.append(_name)
+            return _real(self)
+
+        monkeypatch.setattr(CampaignViewProjector, f"_project_{name}", counting)
+
+    partial = get_campaign_views(campaign, sections=["quests"])
+    assert set(partial) == {"visibility_policy", "quests"}
+    assert built == ["quests"]
+
+    get_campaign_views(campaign)
+    assert built == ["quests", "wiki"]
+
+    WorldGraph(campaign_dir=campaign).update_node(
+        "quest:visible", {"data": {"status": "completed"}}
+    )
+    snapshot = get_campaign_views(campaign)
+    assert snapshot["quests"][0]["status"] == "completed"
+    assert built == ["quests", "wiki", "quests"]
+
+
+def test_unknown_section_is_rejected(tmp_path):
+    import pytest
+
+    from backend.campaign_views import get_campaign_view_section
+
+    campaign = _write_campaign(tmp_path)
+    assert get_campaign_view_section(campaign, "quests")[0]["name"] == "Visible Quest"
+    with pytest.raises(ValueError):
+        get_campaign_view_section(campaign, "secrets")
+
+
+def test_player_knowledge_is_reused_until_the_world_changes(tmp_path, monkeypatch):
+    from backend import campaign_views
+    from lib import world_graph
+
+    campaign = _write_campaign(tmp_path)
+    knowledge = campaign_views.CampaignViewProjector(campaign).knowledge
+
+    assert knowledge.knows("npc:contact")
+    assert knowledge.knows("weapon:any", "RIFLE")
+    assert not knowledge.knows("item:stale")
+
+    builds = []
+    real_build = campaign_views.PlayerKnowledge.build
+    monkeypatch.setattr(
+        campaign_views.PlayerKnowledge,
+        "build",
+        lambda *args: builds.append(1) or real_build(*args),
+    )
+    assert campaign_views.CampaignViewProjector(campaign).knowledge is knowledge
+    assert builds == []
+    assert not list(campaign.glob(".player-knowledge*"))
+
+    graph = world_graph.WorldGraph(campaign_dir=campaign)
+    with graph.transaction():
+        graph.add_node("spell:shield", "spell", "Shield")
+        graph.add_edge("player:active", "spell:shield", "trained")
+    assert campaign_views.CampaignViewProjector(campaign).knowledge.knows("spell:shield")
+    assert builds == [1]
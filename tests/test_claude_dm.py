@@ -61,6 +61,77 @@ def test_prompt_has_current_campaign_context(tmp_path):
     assert "do NOT list campaigns" in ctx
 
 
+def _prompt_tree(tmp_path, monkeypatch):
+    """A project root whose rules compiler counts its runs."""
+    import json
+
+    from backend import claude_dm
+
+    infrastructure = tmp_path / ".claude" / "additional" / "infrastructure"
+    infrastructure.mkdir(parents=True)
+    compiler = infrastructure / "dm-active-modules-rules.sh"
+    compiler.write_text(
+        'echo run >> "$(dirname "$0")/../../../runs.log"\n'
+        'echo "# DM Rules for $DM_ACTIVE_CAMPAIGN"\n',
+        encoding="utf-8",
+    )
+    (tmp_path / ".claude" / "additional" / "modules" / "mass-combat").mkdir(parents=True)
+    campaign = tmp_path / "world-state" / "campaigns" / "keep"
+    campaign.mkdir(parents=True)
+    (campaign / "campaign-overview.json").write_text(
+        json.dumps({"genre": "grim", "modules": {"mass-combat": False}}), encoding="utf-8"
+    )
+    monkeypatch.setattr(claude_dm, "PROJECT_ROOT", tmp_path)
+    claude_dm.clear_prompt_cache()
+    runs = tmp_path / "runs.log"
+    return campaign, lambda: len(runs.read_text().splitlines()) if runs.exists() else 0
+
+
+def test_stable_prompt_prefix_is_compiled_once_until_inputs_change(tmp_path, monkeypatch):
+    import json
+    import os
+
+    from backend.claude_dm import load_system_prompt_parts
+
+    campaign, compiler_runs = _prompt_tree(tmp_path, monkeypatch)
+
+    stable, volatile = load_system_prompt_parts("keep")
+    assert "# DM Rules for keep" in stable
+    assert "Current Campaign" in volatile and "Current Campaign" not in stable
+    assert load_system_prompt_parts("keep")[0] == stable
+    assert compiler_runs() == 1
+
+    # Gameplay rewrites the overview (clock, date) without touching the prefix.
+    overview = json.loads((campaign / "campaign-overview.json").read_text())
+    overview["precise_time"] = "22:00"
+    overview["genre"] = "grimmer"
+    (campaign / "campaign-overview.json").write_text(json.dumps(overview))
+    _stable, volatile = load_system_prompt_parts("keep")
+    assert "grimmer" in volatile
+    assert compiler_runs() == 1
+
+    rules = campaign / "campaign-rules.md"
+    rules.write_text("No resurrection.", encoding="utf-8")
+    assert "No resurrection." in load_system_prompt_parts("keep")[0]
+    assert compiler_runs() == 2
+
+    rules.write_text("No resurrection!", encoding="utf-8")
+    os.utime(rules, ns=(1, 1))
+    assert "No resurrection!" in load_system_prompt_parts("keep")[0]
+    assert compiler_runs() == 3
+
+    overview["modules"] = {"mass-combat": True}
+    (campaign / "campaign-overview.json").write_text(json.dumps(overview))
+    load_system_prompt_parts("keep")
+    assert compiler_runs() == 4
+
+    module_rules = tmp_path / ".claude" / "additional" / "modules" / "mass-combat" / "rules.md"
+    module_rules.write_text("Armies clash.", encoding="utf-8")
+    load_system_prompt_parts("keep")
+    load_system_prompt_parts("keep")
+    assert compiler_runs() == 5
+
+
 def test_cinematic_context_exposes_provider_neutral_tool_contract(tmp_path):
     import json
 
@@ -245,6 +316,26 @@ def test_rate_limit_info_classifies():
     assert _rate_limit_info(Exception("connection refused")) is None
 
 
+def test_claude_turn_usage_counts_cache_reads_and_writes_as_input():
+    from backend.providers.claude_sdk import _turn_usage_from_sdk
+    from backend.runtime import TurnUsage
+
+    usage = TurnUsage.from_metadata(
+        _turn_usage_from_sdk(
+            {
+                "input_tokens": 200,
+                "cache_read_input_tokens": 15_000,
+                "cache_creation_input_tokens": 800,
+                "output_tokens": 450,
+            }
+        )
+    )
+
+    assert usage == TurnUsage(input_tokens=16_000, cached_input_tokens=15_000, output_tokens=450)
+    assert usage.cache_hit_ratio == 15_000 / 16_000
+    assert _turn_usage_from_sdk(None) == {}
+
+
 def test_claude_context_usage_keeps_provider_breakdown():
     from backend.providers.claude_sdk import _context_usage_from_sdk
 
@@ -280,3 +371,64 @@ def test_campaign_name_validation_matches_creation():
     assert not _valid_campaign_name("a/b")          # separator
     assert not _valid_campaign_name(".hidden")      # leading dot
     assert not _valid_campaign_name("")             # empty
+
+
+def test_claude_stale_resume_after_prewarm_reconnects_with_handoff(tmp_path):
+    import asyncio
+
+    from backend.providers.claude_sdk import ClaudeSDKProvider
+
+    class FakeClient:
+        def __init__(self, stale):
+            self.stale = stale
+
+        async def query(self, _message):
+            if self.stale:
+                raise RuntimeError("session id not found")
+
+        async def receive_messages(self):
+            if False:
+                yield None
+
+        async def disconnect(self):
+            return None
+
+    provider = ClaudeSDKProvider(tmp_path, resume_session_id="session-stale")
+    attempts = []
+
+    async def fake_connect(_model, system_prompt, _mcp):
+        attempts.append((provider.session_id, system_prompt))
+        return FakeClient(stale=len(attempts) == 1)
+
+    provider._connect = fake_connect
+    handoff_prompt = "SYSTEM\n<provider_handoff>recent scene</provider_handoff>"
+
+    async def scenario():
+        await provider.prewarm(handoff_prompt)
+        return [
+            event
+            async for event in provider.process_message("continue", handoff_prompt, "claude-sonnet-5")
+        ]
+
+    assert asyncio.run(scenario()) == []
+    assert attempts == [("session-stale", handoff_prompt), (None, handoff_prompt)]
+
+
+def test_claude_process_id_is_none_without_a_known_subprocess(tmp_path):
+    from types import SimpleNamespace
+
+    from backend.providers.claude_sdk import ClaudeSDKProvider
+
+    provider = ClaudeSDKProvider(tmp_path)
+    assert provider.process_id is None
+
+    # A custom transport, or an SDK that renames its private attributes.
+    provider._client = SimpleNamespace(_transport=SimpleNamespace())
+    assert provider.process_id is None
+    provider._client = SimpleNamespace(_transport=SimpleNamespace(_process=None))
+    assert provider.process_id is None
+
+    provider._client = SimpleNamespace(
+        _transport=SimpleNamespace(_process=SimpleNamespace(pid=4242))
+    )
+    assert provider.process_id == 4242
@@ -1,5 +1,7 @@
+import base64
 import asyncio
 import json
+from pathlib import Path
 
 import pytest
 
@@ -49,6 +51,7 @@ class FakeAppServerProcess:
         turn_status="completed",
         turn_error=None,
         usage=None,
+        model_calls=1,
         exit_after_turn_start=False,
         reject_resume=False,
     ):
@@ -65,6 +68,7 @@ class FakeAppServerProcess:
             "cachedInputTokens": 80,
             "outputTokens": 20,
         }
+        self.model_calls = model_calls
         self.exit_after_turn_start = exit_after_turn_start
         self.reject_resume = reject_resume
         self.requests = []
@@ -152,20 +156,21 @@ class FakeAppServerProcess:
                         },
                     }
                 )
-                self.stdout.feed_json(
-                    {
-                        "method": "thread/tokenUsage/updated",
-                        "params": {
-                            "threadId": self.thread_id,
-                            "turnId": turn_id,
-                            "tokenUsage": {
-                                "last": self.usage,
-                                "total": self.usage,
-                                "modelContextWindow": 200,
+                for _call in range(self.model_calls):
+                    self.stdout.feed_json(
+                        {
+                            "method": "thread/tokenUsage/updated",
+                            "params": {
+                                "threadId": self.thread_id,
+                                "turnId": turn_id,
+                                "tokenUsage": {
+                                    "last": self.usage,
+                                    "total": self.usage,
+                                    "modelContextWindow": 200,
+                                },
                             },
-                        },
-                    }
-                )
+                        }
+                    )
                 turn = {"id": turn_id, "status": self.turn_status}
                 if self.turn_error:
                     turn["error"] = self.turn_error
@@ -498,6 +503,22 @@ def test_spark_uses_native_reasoning_profile(tmp_path):
     assert not any("model_reasoning_effort" in value for value in command)
 
 
+def test_turn_end_usage_sums_every_model_call_of_the_turn(tmp_path):
+    process = FakeAppServerProcess(model_calls=3)
+
+    async def factory(*_command, **_options):
+        return process
+
+    provider = CodexCLIProvider(tmp_path, process_factory=factory)
+    end = collect(provider)[-1]
+
+    assert end.metadata["input_tokens"] == 300
+    assert end.metadata["cached_input_tokens"] == 240
+    assert end.metadata["output_tokens"] == 60
+    # Context occupancy is still that of the latest call.
+    assert provider.get_context_usage().used_tokens == 100
+
+
 def test_malformed_usage_is_normalized_without_crashing(tmp_path):
     process = FakeAppServerProcess(
         usage={
@@ -699,3 +720,178 @@ def test_context_usage_locates_thread_rollout(tmp_path):
 
     assert usage is not None
     assert usage.to_dict()["percent"] == 25
+
+
+def _token_count_row(input_tokens, window=1_000):
+    return json.dumps(
+        {
+            "type": "event_msg",
+            "payload": {
+                "type": "token_count",
+                "info": {
+                    "last_token_usage": {"input_tokens": input_tokens},
+                    "model_context_window": window,
+                },
+            },
+        }
+    )
+
+
+def test_rollout_tail_reads_backwards_then_only_appended_bytes(tmp_path, monkeypatch):
+    import backend.providers.codex_cli as codex_module
+
+    monkeypatch.setattr(codex_module, "_TAIL_CHUNK", 64)
+    rollout = tmp_path / "rollout.jsonl"
+    filler = json.dumps({"type": "response_item", "payload": {"text": "x" * 300}})
+    rollout.write_text(
+        "\n".join([_token_count_row(10), filler, _token_count_row(20), filler, filler]) + "\n",
+        encoding="utf-8",
+    )
+    tail = codex_module._RolloutTail(rollout)
+
+    assert tail.read().used_tokens == 20
+    assert tail.offset == rollout.stat().st_size
+
+    with rollout.open("a", encoding="utf-8") as handle:
+        handle.write(_token_count_row(30) + "\n" + _token_count_row(40)[:25])
+    assert tail.read().used_tokens == 30
+    with rollout.open("a", encoding="utf-8") as handle:
+        handle.write(_token_count_row(40)[25:] + "\n")
+    assert tail.read().used_tokens == 40
+    assert tail.offset == rollout.stat().st_size
+
+    rollout.write_text(_token_count_row(5) + "\n", encoding="utf-8")
+    assert tail.read().used_tokens == 5
+
+
+def test_rollout_lookup_uses_the_thread_date_partition(tmp_path, monkeypatch):
+    import backend.providers.codex_cli as codex_module
+
+    # UUIDv7 for 2026-03-14T12:00:00Z.
+    thread_id = f"{1773489600000:012x}"
+    thread_id = f"{thread_id[:8]}-{thread_id[8:]}-7abc-8def-0123456789ab"
+    day = tmp_path / "2026" / "03" / "14"
+    day.mkdir(parents=True)
+    rollout = day / f"rollout-2026-03-14T12-00-00-{thread_id}.jsonl"
+    rollout.write_text(_token_count_row(250) + "\n", encoding="utf-8")
+    (tmp_path / "2026" / "03" / "15").mkdir()
+
+    def no_walk(*_args, **_kwargs):
+        raise AssertionError("whole sessions tree walked")
+
+    monkeypatch.setattr(Path, "glob", no_walk)
+    monkeypatch.setattr(codex_module, "_rollout_index", {})
+
+    provider = CodexCLIProvider(tmp_path, resume_thread_id=thread_id, rollout_root=tmp_path)
+
+    assert provider.get_context_usage().used_tokens == 250
+    assert codex_module._rollout_index[thread_id] == rollout
+
+
+def test_legacy_thread_ids_search_partitions_newest_first(tmp_path, monkeypatch):
+    import backend.providers.codex_cli as codex_module
+
+    monkeypatch.setattr(codex_module, "_rollout_index", {})
+    for day in ("2025/12/31", "2026/01/02"):
+        (tmp_path / day).mkdir(parents=True)
+    rollout = tmp_path / "2025" / "12" / "31" / "rollout-legacy-thread.jsonl"
+    rollout.write_text(_token_count_row(75) + "\n", encoding="utf-8")
+
+    assert codex_module._locate_rollout(tmp_path, "legacy-thread") == rollout
+
+
+def test_large_image_payload_is_spooled_to_disk_as_it_arrives(tmp_path):
+    import backend.providers.codex_cli as codex_module
+
+    image = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 12_000
+    data_url = "data:image/png;base64," + base64.b64encode(image).decode()
+    line = json.dumps(
+        {
+            "method": "item/completed",
+            "params": {"item": {"id": "image-1", "type": "imageGeneration", "status": "completed", "result": data_url}},
+        }
+    ).replace("/", "\\/") + "\n"
+    assert len(line) > codex_module._SPOOL_THRESHOLD
+    stream = QueueStream()
+    encoded = line.encode() + b'{"method": "turn/completed"}\n'
+    for offset in range(0, len(encoded), 4093):
+        stream.feed(encoded[offset:offset + 4093])
+    stream.feed(b"")
+    reader = codex_module._MessageReader(stream, lambda: tmp_path)
+
+    async def scenario():
+        first = await reader.readline()
+        second = await reader.readline()
+        return first, second, await reader.readline()
+
+    first, second, end = asyncio.run(scenario())
+
+    assert len(first) < 1024
+    assert json.loads(second) == {"method": "turn/completed"}
+    assert end == b""
+    events = normalize_codex_event(json.loads(first))
+    assert [event.type for event in events] == ["tool_result", "image"]
+    spooled = Path(events[1].metadata["source_path"])
+    assert spooled.parent == tmp_path
+    assert spooled.read_bytes() == image
+    assert "data_url" not in events[1].metadata
+
+
+def test_cinematic_render_publishes_spooled_image_before_provider_cleanup(tmp_path, monkeypatch):
+    import backend.providers.codex_cli as codex_module
+    from backend.cinematic_mcp import render_cinematic_scene
+
+    image = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 12_000
+    data_url = "data:image/png;base64," + base64.b64encode(image).decode()
+
+    class ImageAppServerProcess(FakeAppServerProcess):
+        def handle(self, request):
+            if request.get("method") != "turn/start":
+                return super().handle(request)
+            self.requests.append(request)
+            self._response(request, {"turn": {"id": "turn-1"}})
+            line = json.dumps(
+                {
+                    "method": "item/completed",
+                    "params": {
+                        "threadId": self.thread_id,
+                        "turnId": "turn-1",
+                        "item": {
+                            "id": "image-1",
+                            "type": "imageGeneration",
+                            "status": "completed",
+                            "result": data_url,
+                        },
+                    },
+                }
+            )
+            assert len(line) > codex_module._SPOOL_THRESHOLD
+            encoded = (line + "\n").encode()
+            for offset in range(0, len(encoded), 4093):
+                self.stdout.feed(encoded[offset:offset + 4093])
+            self.stdout.feed_json(
+                {
+                    "method": "turn/completed",
+                    "params": {
+                        "threadId": self.thread_id,
+                        "turn": {"id": "turn-1", "status": "completed"},
+                    },
+                }
+            )
+
+    async def factory(*_command, **_options):
+        return ImageAppServerProcess()
+
+    class FakeProcessProvider(codex_module.CodexCLIProvider):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, process_factory=factory, **kwargs)
+
+    monkeypatch.setattr(codex_module, "CodexCLIProvider", FakeProcessProvider)
+    campaign_dir = tmp_path / "world-state" / "campaigns" / "harbour"
+    campaign_dir.mkdir(parents=True)
+
+    event = asyncio.run(
+        render_cinematic_scene(project_root=tmp_path, campaign_name="harbour", prompt="A pier")
+    )
+
+    assert Path(event["source_path"]).read_bytes() == image
@@ -0,0 +1,89 @@
+import pytest
+
+import lib.content_extractor as content_extractor
+from lib.content_extractor import ContentExtractor, PDFExtractor
+
+pytest.importorskip("pdfplumber")
+
+
+def _write_pdf(path, pages):
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in range(1, pages + 1):
+        stream = b"BT /F1 12 Tf 72 720 Td (Chapter %d of the drowned abbey) Tj ET" % page
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref
+    )
+    path.write_bytes(bytes(out))
+
+
+def _expected(pages):
+    return "".join(
+        f"--- Page {page} ---\nChapter {page} of the drowned abbey\n\n"
+        for page in range(1, pages + 1)
+    )
+
+
+def test_parallel_pages_arrive_in_order(tmp_path):
+    pdf = tmp_path / "abbey.pdf"
+    _write_pdf(pdf, 20)
+
+    pages = list(PDFExtractor(workers=2, cache_dir=str(tmp_path / "cache")).iter_pages(str(pdf)))
+
+    assert len(pages) == 20
+    sequential = PDFExtractor(workers=1, cache_dir=str(tmp_path / "sequential"))
+    assert "".join(pages) == sequential.extract(str(pdf)) == _expected(20)
+
+
+def test_page_cache_is_keyed_by_file_hash(tmp_path, monkeypatch):
+    pdf = tmp_path / "abbey.pdf"
+    _write_pdf(pdf, 3)
+    cache_dir = str(tmp_path / "cache")
+    assert PDFExtractor(workers=1, cache_dir=cache_dir).extract(str(pdf)) == _expected(3)
+
+    extracted = []
+    real_range = content_extractor._iter_page_range
+
+    def counting_range(filepath, library, start, stop):
+        extracted.extend(range(start + 1, stop + 1))
+        return real_range(filepath, library, start, stop)
+
+    monkeypatch.setattr(content_extractor, "_iter_page_range", counting_range)
+    assert PDFExtractor(workers=1, cache_dir=cache_dir).extract(str(pdf)) == _expected(3)
+    assert extracted == []
+
+    # An edited book hashes differently, so every page is read again.
+    _write_pdf(pdf, 4)
+    assert PDFExtractor(workers=1, cache_dir=cache_dir).extract(str(pdf)) == _expected(4)
+    assert extracted == [1, 2, 3, 4]
+
+
+def test_content_extractor_streams_pdf_pages(tmp_path, monkeypatch):
+    pdf = tmp_path / "abbey.pdf"
+    _write_pdf(pdf, 2)
+    monkeypatch.setenv("DND_PDF_PAGE_CACHE", "off")
+    monkeypatch.setenv("DND_PDF_WORKERS", "1")
+
+    assert list(ContentExtractor().iter_text(str(pdf))) == [
+        "--- Page 1 ---\nChapter 1 of the drowned abbey\n\n",
+        "--- Page 2 ---\nChapter 2 of the drowned abbey\n\n",
+    ]
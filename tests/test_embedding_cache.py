@@ -0,0 +1,66 @@
+import numpy as np
+
+from lib.rag.embedder import LocalEmbedder
+from lib.rag.embedding_cache import EmbeddingCache, text_digest
+
+
+class _CountingModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **_options):
+        self.encoded.extend(texts)
+        return np.array([[len(text), text.count("a"), 1.0 / 3] for text in texts], dtype=np.float32)
+
+
+def _embedder(cache_dir):
+    embedder = LocalEmbedder(cache_dir=str(cache_dir))
+    embedder._model = _CountingModel()
+    return embedder
+
+
+def test_embed_batch_only_computes_cache_misses(tmp_path):
+    chunks = ["a map of the harbour", "the lighthouse keeper", "a map of the harbour"]
+    first = _embedder(tmp_path)
+
+    vectors = first.embed_batch(chunks)
+
+    assert first._model.encoded == ["a map of the harbour", "the lighthouse keeper"]
+    assert first.last_batch_stats["cache_hits"] == 0
+
+    # A fresh process re-imports the book with one chunk edited.
+    second = _embedder(tmp_path)
+    again = second.embed_batch(chunks[:2] + ["the lighthouse keeper, drowned"])
+
+    assert second._model.encoded == ["the lighthouse keeper, drowned"]
+    assert np.array_equal(again[:2], vectors[:2])
+    assert again.dtype == np.float32
+    assert second.last_batch_stats["cache_hits"] == 2
+    assert second.last_batch_stats["hit_rate"] == 2 / 3
+    assert second.last_batch_stats["seconds_saved"] >= 0
+
+
+def test_fully_cached_batch_does_not_load_the_model(tmp_path, monkeypatch):
+    _embedder(tmp_path).embed_batch(["chapter one", "chapter two"])
+    embedder = LocalEmbedder(cache_dir=str(tmp_path))
+    monkeypatch.setattr(embedder, "_ensure_model", lambda: (_ for _ in ()).throw(AssertionError))
+
+    assert embedder.embed_batch(["chapter two", "chapter one"]).shape == (2, 3)
+
+
+def test_cache_is_keyed_by_model_and_survives_a_torn_append(tmp_path):
+    cache = EmbeddingCache(tmp_path, "all-MiniLM-L6-v2")
+    digest = text_digest("the drowned bell")
+    cache.store([digest], np.ones((1, 4)))
+    # A crash after writing a vector but before its key.
+    with open(cache.directory / "vectors.f16", "ab") as handle:
+        handle.write(np.zeros(4, dtype=np.float16).tobytes())
+
+    reopened = EmbeddingCache(tmp_path, "all-MiniLM-L6-v2")
+    reopened.store([text_digest("the tide")], np.full((1, 4), 2.0))
+
+    reloaded = EmbeddingCache(tmp_path, "all-MiniLM-L6-v2")
+    hits = reloaded.lookup([digest, text_digest("the tide")])
+    assert hits[0].tolist() == [1.0] * 4
+    assert hits[1].tolist() == [2.0] * 4
+    assert EmbeddingCache(tmp_path, "other-model").lookup([digest]) == {}
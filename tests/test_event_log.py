@@ -7,6 +7,7 @@ import pytest
 from backend.event_log import (
     EVENT_LOG_FILENAME,
     append_event,
+    iter_current_session_events_reversed,
     read_current_session_events,
     read_events,
 )
@@ -80,6 +81,19 @@ def test_current_session_events_start_after_latest_reset_boundary(campaign_dir):
     assert read_current_session_events(campaign_dir, after_id=current["id"]) == []
 
 
+def test_reversed_session_events_stop_at_the_latest_boundary(campaign_dir):
+    append_event(campaign_dir, "text", "old answer")
+    append_event(campaign_dir, "session_reset", "")
+    current = [append_event(campaign_dir, "text", f"ответ {index} " * 20) for index in range(5)]
+    with open(campaign_dir / EVENT_LOG_FILENAME, "a") as f:
+        f.write("not valid json{\n")
+
+    newest_first = list(iter_current_session_events_reversed(campaign_dir, chunk_size=7))
+
+    assert newest_first == list(reversed(current))
+    assert list(iter_current_session_events_reversed(campaign_dir / "missing")) == []
+
+
 def test_read_events_skips_corrupted_lines(campaign_dir):
     append_event(campaign_dir, "text", "valid")
     path = campaign_dir / EVENT_LOG_FILENAME
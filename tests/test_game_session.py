@@ -5,6 +5,8 @@ asyncio.run() to await GameSession's background turn task.
 """
 
 import asyncio
+import json
+
 import pytest
 
 import backend.game_session as game_session_module
@@ -143,6 +145,33 @@ def test_restart_prepares_transcript_fallback_for_stale_resume(tmp_path):
     assert "GAME MASTER: At the sealed lift on S-0." in session._history_handoff
 
 
+def test_history_handoff_reads_only_the_tail_of_a_long_log(tmp_path, monkeypatch):
+    import backend.event_log as event_log
+
+    campaign_dir = tmp_path / "world-state" / "campaigns" / "camp-a"
+    campaign_dir.mkdir(parents=True)
+    with open(campaign_dir / event_log.EVENT_LOG_FILENAME, "w", encoding="utf-8") as f:
+        for event_id in range(1, 20_001):
+            event = {"id": event_id, "type": "text", "content": f"Scene {event_id}.", "timestamp": ""}
+            f.write(json.dumps(event) + "\n")
+    reads = []
+    real_reverse_lines = event_log._reverse_lines
+
+    def counting_reverse_lines(file_obj, chunk_size=64 * 1024):
+        for line in real_reverse_lines(file_obj, chunk_size):
+            reads.append(line)
+            yield line
+
+    monkeypatch.setattr(event_log, "_reverse_lines", counting_reverse_lines)
+
+    session = GameSession("camp-a", tmp_path, "claude-sonnet-5")
+
+    assert len(reads) == game_session_module.HANDOFF_MAX_EVENTS
+    assert "GAME MASTER: Scene 20000." in session._history_handoff
+    assert "Scene 19977." in session._history_handoff
+    assert "Scene 19976." not in session._history_handoff
+
+
 def test_provider_session_id_is_persisted_after_turn(tmp_path):
     session = GameSession(
         "camp-a",
@@ -296,6 +325,133 @@ def test_tool_activity_metadata_survives_event_log_round_trip(tmp_path):
     } == {"tool-1"}
 
 
+def test_turn_trace_records_tool_spans_and_storage(tmp_path):
+    session = GameSession("camp-a", tmp_path, "claude-sonnet-5")
+
+    async def tool_events(*_args, **_kwargs):
+        yield AgentEvent("text_delta", "The ")
+        yield AgentEvent(
+            "tool_use",
+            "Bash: bash tools/dm-time.sh advance 1",
+            {"short_name": "Bash", "tool_use_id": "tool-1"},
+        )
+        yield AgentEvent("tool_result", "ok", {"tool_use_id": "tool-1"})
+        yield AgentEvent("text", "The hour passes.")
+
+    session.provider.process_message = tool_events
+
+    async def scenario():
+        session.send("wait an hour", "system prompt")
+        await session._turn_task
+        await game_session_module.flush_turn_records()
+
+    asyncio.run(scenario())
+
+    traces = list((session.campaign_dir / "traces").glob("turn-*.json"))
+    assert [path.name for path in traces] == ["turn-1.json"]
+    events = json.loads(traces[0].read_text())["traceEvents"]
+    names = [event["name"] for event in events]
+    for expected in ("provider.connect", "first token", "append_event", "broadcast"):
+        assert expected in names
+    tool = [event for event in events if event.get("cat") == "tool"]
+    assert [(event["ph"], event["name"]) for event in tool] == [("b", "Bash"), ("e", "Bash")]
+    turn = next(event for event in events if event["name"] == "turn")
+    assert turn["args"]["stream_deltas"] == 1
+    assert turn["args"]["outcome"] == "completed"
+
+
+def test_turn_usage_is_recorded_for_the_prompt_cache_report(tmp_path, monkeypatch):
+    import threading
+
+    from backend.prompt_cache_report import read_turns, record_turn
+
+    session = GameSession("camp-a", tmp_path, "claude-sonnet-5")
+    writers = []
+
+    def tracking_record_turn(campaign_dir, row):
+        writers.append(threading.current_thread())
+        record_turn(campaign_dir, row)
+
+    monkeypatch.setattr(game_session_module, "record_turn", tracking_record_turn)
+
+    async def cached_turn(*_args, **_kwargs):
+        yield AgentEvent("text", "The tide turns.")
+        yield AgentEvent(
+            "turn_end",
+            "Turn completed",
+            {"ok": True, "input_tokens": 20_000, "cached_input_tokens": 18_000, "output_tokens": 300},
+        )
+
+    session.provider.process_message = cached_turn
+
+    async def scenario():
+        session.send("wait", "system prompt")
+        await session._turn_task
+        await game_session_module.flush_turn_records()
+
+    asyncio.run(scenario())
+
+    (row,) = read_turns(session.campaign_dir)
+    assert writers and writers[0] is not threading.main_thread()
+    assert row["turn"] == "turn-1"
+    assert row["cached_input_tokens"] == 18_000
+    assert row["cache_hit_ratio"] == 0.9
+    assert row["ttft_ms"] is not None
+    trace = json.loads((session.campaign_dir / "traces" / "turn-1.json").read_text())
+    turn = next(event for event in trace["traceEvents"] if event["name"] == "turn")
+    assert turn["args"]["input_tokens"] == 20_000
+
+
+def test_next_turn_can_start_while_records_are_still_writing(tmp_path, monkeypatch):
+    import threading
+
+    from backend.live_broker import broker
+    from backend.prompt_cache_report import read_turns, record_turn
+
+    session = GameSession("camp-a", tmp_path, "claude-sonnet-5")
+    release = threading.Event()
+
+    def slow_record_turn(campaign_dir, row):
+        release.wait(timeout=5)
+        record_turn(campaign_dir, row)
+
+    monkeypatch.setattr(game_session_module, "record_turn", slow_record_turn)
+
+    async def cached_turn(*_args, **_kwargs):
+        yield AgentEvent("text", "The tide turns.")
+        yield AgentEvent("turn_end", "Turn completed", {"ok": True, "input_tokens": 10})
+
+    session.provider.process_message = cached_turn
+
+    async def scenario():
+        queue = broker.subscribe("camp-a")
+        try:
+            assert session.send("wait", "system prompt") is True
+            while session.running:
+                await asyncio.sleep(0)
+            # The first turn's row is still blocked on disk.
+            assert session.send("wait again", "system prompt") is True
+            await session._turn_task
+            release.set()
+            await game_session_module.flush_turn_records()
+        finally:
+            broker.unsubscribe("camp-a", queue)
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return events
+
+    events = asyncio.run(scenario())
+
+    lifecycle = [
+        event.get("status", event["type"])
+        for event in events
+        if event["type"] in {"agent_status", "done"}
+    ]
+    assert lifecycle == ["running", "idle", "done", "running", "idle", "done"]
+    assert [row["turn"] for row in read_turns(session.campaign_dir)] == ["turn-1", "turn-3"]
+
+
 def test_hibernate_closes_provider_after_idle_threshold(tmp_path, monkeypatch):
     monkeypatch.setattr(game_session_module, "HIBERNATE_IDLE_SECONDS", 0)
     session = GameSession("camp-a", tmp_path, "claude-sonnet-5")
@@ -320,6 +476,210 @@ def test_hibernate_closes_provider_after_idle_threshold(tmp_path, monkeypatch):
     assert closed == [True]
 
 
+def _closing_session(campaign, tmp_path, closed):
+    session = get_or_create_session(campaign, tmp_path, "claude-sonnet-5")
+    session.provider.process_message = _fake_events
+
+    async def fake_close():
+        closed.append(campaign)
+
+    session.provider.close = fake_close
+    return session
+
+
+def test_live_provider_cap_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setenv("DND_MAX_LIVE_PROVIDERS", "2")
+    closed = []
+    sessions = [_closing_session(name, tmp_path, closed) for name in ("a", "b", "c")]
+
+    async def scenario():
+        for session in sessions:
+            session.send("look", "system prompt")
+            await session._turn_task
+        # "a" is least recently used; touching it again evicts "b" instead.
+        sessions[0].send("again", "system prompt")
+        await sessions[0]._turn_task
+
+    asyncio.run(scenario())
+
+    assert closed == ["a", "b"]
+    assert [session.provider_live for session in sessions] == [True, False, True]
+
+
+def test_reaper_hibernates_idle_providers_then_evicts_unwatched_sessions(
+    tmp_path, monkeypatch
+):
+    closed = []
+    session = _closing_session("camp-a", tmp_path, closed)
+
+    async def scenario():
+        session.send("look", "system prompt")
+        await session._turn_task
+        soon = session.last_active + game_session_module.HIBERNATE_IDLE_SECONDS + 1
+        first = await game_session_module.reap_idle_sessions(soon)
+        later = session.last_active + game_session_module.SESSION_EVICT_SECONDS + 1
+        second = await game_session_module.reap_idle_sessions(later)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == {"hibernated": ["camp-a"], "evicted": []}
+    assert second == {"hibernated": [], "evicted": ["camp-a"]}
+    assert closed == ["camp-a"]
+    assert game_session_module.peek_session("camp-a") is None
+
+    save_runtime_session(
+        session.campaign_dir,
+        runtime_id="claude",
+        model_name="claude-sonnet-5",
+        session_id="session-before-eviction",
+    )
+    rebuilt = get_or_create_session("camp-a", tmp_path, "claude-sonnet-5")
+    assert rebuilt is not session
+    assert rebuilt.provider.session_id == "session-before-eviction"
+
+
+def test_reaper_keeps_sessions_that_are_watched(tmp_path):
+    from backend.live_broker import broker
+
+    session = _closing_session("camp-a", tmp_path, [])
+    queue = broker.subscribe("camp-a")
+    try:
+        far = session.last_active + game_session_module.SESSION_EVICT_SECONDS + 1
+        reaped = asyncio.run(game_session_module.reap_idle_sessions(far))
+    finally:
+        broker.unsubscribe("camp-a", queue)
+
+    assert reaped == {"hibernated": [], "evicted": []}
+    assert game_session_module.peek_session("camp-a") is session
+
+
+def test_session_stats_report_provider_process_memory(tmp_path, monkeypatch):
+    import os
+
+    session = _closing_session("camp-a", tmp_path, [])
+    session.provider_live = True
+    monkeypatch.setattr(type(session.provider), "process_id", os.getpid(), raising=False)
+
+    async def scenario():
+        stats = await game_session_module.session_stats()
+        await game_session_module.sample_provider_rss()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats["live_providers"] == 1
+    (entry,) = stats["sessions"]
+    assert entry["provider_pid"] == os.getpid()
+    assert entry["rss_kib"] > 0
+    ((labels, rss_bytes),) = game_session_module._rss_samples
+    assert labels == ("camp-a",) and rss_bytes > 0
+
+
+def _prewarmable_session(campaign, tmp_path, warmed, gate=None):
+    session = _closing_session(campaign, tmp_path, [])
+
+    async def fake_prewarm(system_prompt, mcp_servers=None):
+        if gate is not None:
+            await gate.wait()
+        warmed.append((campaign, system_prompt))
+
+    session.provider.prewarm = fake_prewarm
+    return session
+
+
+def test_prewarm_connects_provider_and_keeps_handoff_for_first_turn(tmp_path):
+    warmed = []
+    turn_prompts = []
+    session = _prewarmable_session("camp-a", tmp_path, warmed)
+    session._history_handoff = "\n<provider_handoff>PLAYER: I wake.</provider_handoff>"
+
+    async def recording_events(*_args, **kwargs):
+        turn_prompts.append(kwargs["system_prompt"])
+        yield {"type": "text", "content": "the DM speaks"}
+
+    session.provider.process_message = recording_events
+
+    async def scenario():
+        assert await session.prewarm("SYSTEM RULES") is True
+        session.send("look", "SYSTEM RULES")
+        await session._turn_task
+        await game_session_module.flush_turn_records()
+
+    asyncio.run(scenario())
+
+    assert warmed == [("camp-a", "SYSTEM RULES\n<provider_handoff>PLAYER: I wake.</provider_handoff>")]
+    assert session.provider_live is True
+    # The connected client ignores it, but a stale-resume reconnect needs it.
+    assert turn_prompts == ["SYSTEM RULES\n<provider_handoff>PLAYER: I wake.</provider_handoff>"]
+    assert session._history_handoff is None
+    trace = json.loads((session.campaign_dir / "traces" / "turn-1.json").read_text())
+    turn = next(event for event in trace["traceEvents"] if event["name"] == "turn")
+    assert turn["args"]["provider_start"] == "warm"
+
+
+def test_send_during_background_prewarm_queues_behind_it(tmp_path):
+    warmed = []
+
+    async def scenario():
+        gate = asyncio.Event()
+        session = _prewarmable_session("camp-a", tmp_path, warmed, gate)
+        assert session.start_prewarm("system prompt") is True
+        await asyncio.sleep(0)
+        assert session._mutation_lock.locked()
+
+        assert session.send("look", "system prompt") is True
+        await asyncio.sleep(0)
+        assert read_events(session.campaign_dir)[-1]["type"] == "user_message"
+        gate.set()
+        await session._turn_task
+        return session
+
+    session = asyncio.run(scenario())
+
+    assert warmed == [("camp-a", "system prompt")]
+    assert [event["type"] for event in read_events(session.campaign_dir)] == [
+        "user_message",
+        "text",
+    ]
+
+
+def test_prewarm_only_uses_spare_live_provider_capacity(tmp_path, monkeypatch):
+    monkeypatch.setenv("DND_MAX_LIVE_PROVIDERS", "1")
+    warmed = []
+    playing = _prewarmable_session("playing", tmp_path, warmed)
+    idle = _prewarmable_session("idle", tmp_path, warmed)
+
+    async def scenario():
+        playing.send("look", "system prompt")
+        await playing._turn_task
+        return await idle.prewarm("system prompt")
+
+    assert asyncio.run(scenario()) is False
+    assert warmed == []
+    assert playing.provider_live is True
+    assert idle.provider_live is False
+
+
+def test_provider_switch_cancels_background_prewarm(tmp_path):
+    async def scenario():
+        session = _prewarmable_session("camp-a", tmp_path, [], asyncio.Event())
+        session.start_prewarm("system prompt")
+        await asyncio.sleep(0)
+        prewarm_task = session._prewarm_task
+
+        assert session.configure("codex", "gpt-5.6-terra") is True
+        with pytest.raises(asyncio.CancelledError):
+            await prewarm_task
+        return session
+
+    session = asyncio.run(scenario())
+
+    assert session.runtime_id == "codex"
+    assert session.provider_live is False
+    assert not session._mutation_lock.locked()
+
+
 def test_no_hibernate_when_under_idle_threshold(tmp_path):
     session = GameSession("camp-a", tmp_path, "claude-sonnet-5")
     session.provider.process_message = _fake_events
@@ -78,3 +78,64 @@ def test_character_status_falls_back_to_overview_location(tmp_path):
     )
 
     assert game_state.get_character_status(campaign)["location"] == "Old Camp"
+
+
+def test_status_cache_follows_revision_without_ttl(tmp_path, monkeypatch):
+    from lib.world_graph import WorldGraph
+
+    game_state.invalidate_cache()
+    campaign = _campaign(tmp_path, "live", "Live")
+    builds = []
+    real_location = game_state.player_location
+
+    def counting_location(*args):
+        builds.append(1)
+        return real_location(*args)
+
+    monkeypatch.setattr(game_state, "player_location", counting_location)
+
+    first = game_state.get_character_status(campaign)
+    assert game_state.get_character_status(campaign) is first
+    assert len(builds) == 1
+
+    WorldGraph(campaign_dir=campaign).update_node(
+        "player:active", {"data": {"hp": {"current": 4, "max": 12}}}
+    )
+    assert str(campaign.resolve()) not in game_state._character_cache
+
+    assert game_state.get_character_status(campaign)["hp"] == 4
+    assert len(builds) == 2
+
+
+def test_status_cache_detects_external_writes_and_overview_changes(tmp_path):
+    game_state.invalidate_cache()
+    campaign = _campaign(tmp_path, "external", "Before")
+    assert game_state.get_character_status(campaign)["name"] == "Before"
+
+    world = json.loads((campaign / "world.json").read_text())
+    world["nodes"]["player:active"]["name"] = "After"
+    replacement = campaign / "world.json.new"
+    replacement.write_text(json.dumps(world))
+    replacement.replace(campaign / "world.json")
+    assert game_state.get_character_status(campaign)["name"] == "After"
+
+    (campaign / "campaign-overview.json").write_text(
+        json.dumps({"player_position": {"current_location": "Harbor"}})
+    )
+    assert game_state.get_character_status(campaign)["location"] == "Harbor"
+
+
+def test_status_cache_evicts_least_recently_used_campaign(tmp_path, monkeypatch):
+    game_state.invalidate_cache()
+    monkeypatch.setattr(game_state, "_CACHE_LIMIT", 2)
+    campaigns = [_campaign(tmp_path, f"c{i}", f"C{i}") for i in range(3)]
+
+    game_state.get_character_status(campaigns[0])
+    game_state.get_character_status(campaigns[1])
+    game_state.get_character_status(campaigns[0])
+    game_state.get_character_status(campaigns[2])
+
+    assert list(game_state._character_cache) == [
+        str(campaigns[0].resolve()),
+        str(campaigns[2].resolve()),
+    ]
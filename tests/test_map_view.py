@@ -1,5 +1,6 @@
 import json
 
+import backend.map_view as map_view
 from backend.map_view import get_map_snapshot
 
 
@@ -240,3 +241,161 @@ def test_interior_layout_is_deterministic_and_honors_inferred_children(tmp_path)
     projected = {node["name"]: node for node in first["nodes"]}
     assert projected["Base"]["children"] == ["Door", "Hall"]
     assert "Lab" not in json.dumps(first)
+
+
+def _compound_world(tmp_path, rooms, links):
+    nodes = {
+        "location:base": _location("Base", type="compound", entry_points=["Door"]),
+    }
+    for room in rooms:
+        nodes[f"location:{room.lower()}"] = _location(room, type="interior", parent="Base")
+    edges = []
+    for source, target in links:
+        edges.append(
+            {
+                "from": f"location:{source.lower()}",
+                "to": f"location:{target.lower()}",
+                "type": "connected",
+                "data": {},
+            }
+        )
+    return nodes, edges
+
+
+def _rewrite_world(campaign, nodes, edges):
+    (campaign / "world.json").write_text(
+        json.dumps(
+            {"meta": {"version": 2, "schema": "graph"}, "nodes": nodes, "edges": edges}
+        ),
+        encoding="utf-8",
+    )
+
+
+def test_interior_layouts_are_cached_persisted_and_warm_started(tmp_path, monkeypatch):
+    map_view.clear_layout_cache()
+    calls = []
+    real_compute = map_view.compute_layout
+
+    def counting_compute(names, *args, **kwargs):
+        calls.append(list(names))
+        return real_compute(names, *args, **kwargs)
+
+    monkeypatch.setattr(map_view, "compute_layout", counting_compute)
+    nodes, edges = _compound_world(
+        tmp_path, ["Door", "Hall", "Lab"], [("Door", "Hall"), ("Hall", "Lab")]
+    )
+    campaign = _write_campaign(
+        tmp_path,
+        modules=["world-travel"],
+        nodes=nodes,
+        edges=edges,
+        position={"current_location": "Hall"},
+    )
+
+    first = get_map_snapshot(campaign)["layouts"]["Base"]
+    assert get_map_snapshot(campaign)["layouts"]["Base"] == first
+    assert (campaign / map_view.LAYOUT_CACHE_FILE).exists()
+    map_view.clear_layout_cache()
+    assert get_map_snapshot(campaign)["layouts"]["Base"] == first
+    assert len(calls) == 1
+
+    nodes, edges = _compound_world(
+        tmp_path,
+        ["Door", "Hall", "Lab", "Vault"],
+        [("Door", "Hall"), ("Hall", "Lab"), ("Lab", "Vault")],
+    )
+    _rewrite_world(campaign, nodes, edges)
+    grown = get_map_snapshot(campaign)["layouts"]["Base"]
+
+    assert len(calls) == 1
+    assert {name: grown[name] for name in first} == first
+    assert 40 <= grown["Vault"]["x"] <= 760 and 40 <= grown["Vault"]["y"] <= 560
+    assert grown["Vault"] not in first.values()
+
+    nodes, edges = _compound_world(
+        tmp_path,
+        ["Door", "Hall", "Lab", "Vault", "Armory", "Dock"],
+        [("Door", "Hall"), ("Hall", "Armory"), ("Armory", "Dock")],
+    )
+    _rewrite_world(campaign, nodes, edges)
+    get_map_snapshot(campaign)
+    assert len(calls) == 2
+
+
+def _grid_world(tmp_path, side, spacing=10, outpost=None):
+    nodes = {}
+    edges = []
+    if outpost is not None:
+        nodes["location:outpost"] = _location(
+            "Outpost", type="world", coordinates={"x": outpost, "y": outpost}
+        )
+    for row in range(side):
+        for column in range(side):
+            node_id = f"location:p-{row}-{column}"
+            nodes[node_id] = _location(
+                f"P{row:02d}-{column:02d}",
+                type="world",
+                coordinates={"x": column * spacing, "y": row * spacing},
+            )
+            if column:
+                edges.append(
+                    {
+                        "from": f"location:p-{row}-{column - 1}",
+                        "to": node_id,
+                        "type": "connected",
+                        "data": {},
+                    }
+                )
+    return _write_campaign(
+        tmp_path,
+        modules=["world-travel"],
+        nodes=nodes,
+        edges=edges,
+        position={"current_location": "P00-00"},
+    )
+
+
+def test_viewport_returns_only_nodes_and_edges_in_view(tmp_path):
+    campaign = _grid_world(tmp_path, 10)
+
+    view = map_view.get_map_viewport(campaign, (20, 20, 40, 30), zoom=5)
+
+    names = {node["name"] for node in view["nodes"]}
+    assert names == {"P02-02", "P02-03", "P02-04", "P03-02", "P03-03", "P03-04", "P00-00"}
+    assert view["viewport"]["clustered"] is False
+    assert view["viewport"]["total_nodes"] == 100
+    assert all(
+        edge["source"] in names and edge["target"] in names
+        for edge in view["connections"]
+    )
+    assert len(view["connections"]) == 4
+    assert view["clusters"] == []
+
+
+def test_dense_viewports_are_clustered_by_zoom(tmp_path, monkeypatch):
+    monkeypatch.setattr(map_view, "DETAIL_NODE_LIMIT", 50)
+    campaign = _grid_world(tmp_path, 16)
+
+    far = map_view.get_map_viewport(campaign, None, zoom=0)
+    near = map_view.get_map_viewport(campaign, None, zoom=2)
+
+    assert far["viewport"]["clustered"] is True
+    assert sum(cluster["count"] for cluster in far["clusters"]) + len(far["nodes"]) >= 256
+    assert len(near["clusters"]) < len(far["clusters"])
+    assert len(near["nodes"]) > len(far["nodes"])
+    assert all(link["count"] >= 1 for link in far["cluster_links"])
+    assert "P00-00" in {node["name"] for node in far["nodes"]}
+    assert len(json.dumps(far)) < len(json.dumps(get_map_snapshot(campaign)))
+
+
+def test_cluster_cells_keep_halving_past_the_index_grid(tmp_path, monkeypatch):
+    monkeypatch.setattr(map_view, "DETAIL_NODE_LIMIT", 50)
+    # A dense town in one corner of a large map fits in a single index cell.
+    campaign = _grid_world(tmp_path, 16, spacing=1, outpost=1000)
+
+    cluster_counts = [
+        len(map_view.get_map_viewport(campaign, None, zoom=zoom)["clusters"])
+        for zoom in (3, 4, 5)
+    ]
+
+    assert cluster_counts[0] < cluster_counts[1] < cluster_counts[2]
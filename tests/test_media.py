@@ -1,7 +1,9 @@
 import base64
+import hashlib
 
 import pytest
 
+from backend import media
 from backend.media import resolve_campaign_media, store_generated_image
 
 
@@ -44,3 +46,27 @@ def test_generated_media_rejects_non_image_bytes(tmp_path):
             tmp_path,
             data_url="data:image/png;base64,bm90IGFuIGltYWdl",
         )
+
+
+def test_large_data_url_is_decoded_in_chunks(tmp_path):
+    image = PNG + bytes(range(256)) * (3 * media.CHUNK_BYTES // 256 + 7)
+    encoded = base64.b64encode(image).decode()
+
+    published = store_generated_image(tmp_path, data_url=f"data:image/png;base64,{encoded}")
+
+    assert published.size == len(image)
+    assert published.filename.startswith(hashlib.sha256(image).hexdigest()[:32])
+    assert resolve_campaign_media(tmp_path, published.filename).read_bytes() == image
+    assert [path.name for path in (tmp_path / "media").iterdir()] == [published.filename]
+
+
+def test_oversized_image_is_rejected_without_leaving_partial_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(media, "MAX_IMAGE_BYTES", media.CHUNK_BYTES)
+    source = tmp_path / "huge.png"
+    source.write_bytes(PNG + b"\0" * media.CHUNK_BYTES)
+    campaign_dir = tmp_path / "campaign"
+
+    with pytest.raises(ValueError, match="invalid size"):
+        store_generated_image(campaign_dir, source_path=source)
+
+    assert list((campaign_dir / "media").iterdir()) == []
@@ -0,0 +1,99 @@
+import io
+import json
+
+import pytest
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from backend import media_variants  # noqa: E402
+from backend.media import store_generated_image  # noqa: E402
+from backend.media_variants import generate_variants, select_variant  # noqa: E402
+
+WEBP_ACCEPT = "image/webp,image/apng,image/*,*/*;q=0.8"
+
+
+def _publish(campaign_dir, size=(1200, 675)):
+    # Soft noise over a gradient compresses about like a rendered scene.
+    noise = Image.effect_noise(size, 24).convert("RGB")
+    gradient = Image.linear_gradient("L").resize(size).convert("RGB")
+    image = Image.blend(gradient, noise, 0.3)
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    source = campaign_dir.parent / "frame.png"
+    source.write_bytes(buffer.getvalue())
+    return store_generated_image(campaign_dir, source_path=source)
+
+
+@pytest.fixture(autouse=True)
+def webp_only(monkeypatch):
+    # AVIF depends on how Pillow was built; WebP keeps the tests deterministic.
+    monkeypatch.setattr(media_variants, "_formats", lambda: ["webp"])
+
+
+def test_variants_are_smaller_downscaled_webp_files(tmp_path):
+    campaign_dir = tmp_path / "campaign"
+    published = _publish(campaign_dir)
+    media_path = campaign_dir / "media" / published.filename
+
+    manifest = generate_variants(media_path)
+
+    assert [variant["width"] for variant in manifest["variants"]] == [480, 960, 1200]
+    for variant in manifest["variants"]:
+        path = campaign_dir / "media" / "variants" / variant["file"]
+        assert variant["size"] == path.stat().st_size < published.size
+        with Image.open(path) as stored:
+            assert stored.format == "WEBP"
+            assert stored.width == variant["width"]
+    stored_manifest = campaign_dir / "media" / "variants" / f"{media_path.stem}.json"
+    assert json.loads(stored_manifest.read_text()) == manifest
+
+
+def test_select_variant_negotiates_format_and_width(tmp_path):
+    campaign_dir = tmp_path / "campaign"
+    published = _publish(campaign_dir)
+    generate_variants(campaign_dir / "media" / published.filename)
+
+    def chosen(accept, width=None):
+        selection = select_variant(campaign_dir, published.filename, accept, width)
+        assert not selection.pending
+        return None if selection.variant is None else selection.variant.path.name
+
+    stem = published.filename.split(".")[0]
+    assert chosen(WEBP_ACCEPT, 960) == f"{stem}-960.webp"
+    assert chosen(WEBP_ACCEPT, 700) == f"{stem}-960.webp"
+    assert chosen(WEBP_ACCEPT, 4000) == f"{stem}-1200.webp"
+    assert chosen(WEBP_ACCEPT) == f"{stem}-1200.webp"
+    assert chosen("image/png,image/*;q=0.8", 480) is None
+    assert chosen("image/webp;q=0,image/png", 480) is None
+
+
+def test_select_variant_queues_images_without_variants(tmp_path, monkeypatch):
+    campaign_dir = tmp_path / "campaign"
+    published = _publish(campaign_dir, size=(64, 36))
+    queued = []
+    monkeypatch.setattr(
+        media_variants, "schedule_variants", lambda *args: queued.append(args) or True
+    )
+
+    selection = select_variant(campaign_dir, published.filename, WEBP_ACCEPT, 480)
+
+    assert selection.variant is None and selection.pending
+    assert queued == [(campaign_dir, published.filename)]
+
+
+def test_undecodable_image_gets_an_empty_manifest(tmp_path, monkeypatch):
+    campaign_dir = tmp_path / "campaign"
+    published = _publish(campaign_dir, size=(64, 36))
+    media_path = campaign_dir / "media" / published.filename
+    media_path.write_bytes(b"\x89PNG\r\n\x1a\n truncated")
+    queued = []
+    monkeypatch.setattr(
+        media_variants, "schedule_variants", lambda *args: queued.append(args) or True
+    )
+
+    assert generate_variants(media_path) is None
+    selection = select_variant(campaign_dir, published.filename, WEBP_ACCEPT, 480)
+
+    assert selection.variant is None and not selection.pending
+    assert queued == []
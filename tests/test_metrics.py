@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from lib import metrics
+from lib.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "demo_seconds", "Demo latency.", ("route",), buckets=(0.1, 1.0)
+    )
+    fast = latency.labels("views")
+    fast.observe(0.05)
+    fast.observe(0.5)
+    fast.observe(5)
+
+    text = registry.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{route="views",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{route="views",le="1"} 2' in text
+    assert 'demo_seconds_bucket{route="views",le="+Inf"} 3' in text
+    assert 'demo_seconds_sum{route="views"} 5.55' in text
+    assert 'demo_seconds_count{route="views"} 3' in text
+
+
+def test_counters_and_gauges_render_with_escaped_labels():
+    registry = MetricsRegistry()
+    registry.counter("demo_fsync", "Demo fsyncs.").inc(2)
+    registry.gauge(
+        "demo_depth",
+        "Demo depth.",
+        ("campaign",),
+        callback=lambda: [(('say "hi"',), 4)],
+    )
+
+    text = registry.render()
+
+    assert "demo_fsync_total 2" in text
+    assert 'demo_depth{campaign="say \\"hi\\""} 4' in text
+
+
+def test_registration_is_idempotent_and_label_arity_is_checked():
+    registry = MetricsRegistry()
+    first = registry.histogram("demo_seconds", "Demo.", ("stage",))
+
+    assert registry.histogram("demo_seconds", "Demo.", ("stage",)) is first
+    assert first.labels("load") is first.labels("load")
+    with pytest.raises(ValueError):
+        registry.counter("demo_seconds", "Demo.")
+    with pytest.raises(ValueError):
+        first.labels("load", "extra")
+
+
+def test_samples_from_many_threads_are_not_lost():
+    registry = MetricsRegistry()
+    child = registry.histogram("demo_seconds", "Demo.", buckets=(1.0,)).labels()
+    calls = registry.counter("demo_calls", "Demo.").labels()
+
+    def record():
+        for _ in range(20_000):
+            child.observe(0.5)
+            calls.inc()
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    counts, total = child.snapshot()
+    assert counts == [160_000, 0]
+    assert total == pytest.approx(80_000)
+    assert calls.value == 160_000
+
+
+def test_plain_and_package_imports_share_one_registry():
+    import sys
+
+    sys.path.insert(0, str(metrics.__file__).rsplit("/", 1)[0])
+    try:
+        import metrics as plain_metrics
+    finally:
+        sys.path.pop(0)
+
+    assert plain_metrics is metrics
+    assert plain_metrics.REGISTRY is metrics.REGISTRY
+
+
+def test_hot_paths_report_into_the_shared_registry(tmp_path):
+    from backend.event_log import append_event
+    from lib.world_graph import WorldGraph
+
+    graph = WorldGraph(campaign_dir=tmp_path)
+    graph.add_node("npc:mira", "npc", "Mira", {})
+    graph.get_node("npc:mira")
+    append_event(tmp_path, "dm", "The gate creaks open.")
+
+    text = metrics.render()
+
+    for name in (
+        "dm_world_load_seconds_count",
+        "dm_world_save_seconds_count",
+        "dm_event_append_seconds_count",
+        "dm_event_fsync_total",
+    ):
+        line = next(line for line in text.splitlines() if line.startswith(name))
+        assert float(line.rsplit(" ", 1)[1]) >= 1
+
+
+def test_observe_is_cheap():
+    child = MetricsRegistry().histogram("demo_seconds", "Demo.").labels()
+    samples = 50_000
+    started = time.perf_counter()
+    for _ in range(samples):
+        child.observe(0.003)
+    per_sample = (time.perf_counter() - started) / samples
+
+    # The budget is 1 µs; leave headroom for slow, shared CI machines.
+    assert per_sample < 5e-6
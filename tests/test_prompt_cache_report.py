@@ -0,0 +1,73 @@
+import json
+
+from backend import prompt_cache_report
+from backend.prompt_cache_report import (
+    all_campaigns_report,
+    campaign_report,
+    read_turns,
+    record_turn,
+    summarize,
+)
+
+
+def _row(turn, input_tokens, cached, ttft_ms):
+    return {
+        "turn": f"turn-{turn}",
+        "input_tokens": input_tokens,
+        "cached_input_tokens": cached,
+        "output_tokens": 100,
+        "ttft_ms": ttft_ms,
+    }
+
+
+def test_summary_reports_hit_ratio_and_ttft_by_cache_state():
+    summary = summarize(
+        [
+            _row(1, 10_000, 0, 4_000.0),
+            _row(2, 11_000, 10_000, 1_500.0),
+            _row(3, 12_000, 11_000, 1_300.0),
+        ]
+    )
+
+    assert summary["turns"] == 3
+    assert summary["input_tokens"] == 33_000
+    assert summary["uncached_input_tokens"] == 12_000
+    assert summary["cache_hit_ratio"] == round(21_000 / 33_000, 4)
+    assert summary["median_ttft_ms"] == {"warm_cache": 1_400.0, "cold_cache": 4_000.0}
+
+
+def test_campaign_report_lists_newest_turns_and_skips_bad_lines(tmp_path):
+    for turn in range(1, 4):
+        record_turn(tmp_path, _row(turn, 1_000, 500, 10.0))
+    with (tmp_path / "prompt-cache.jsonl").open("a") as handle:
+        handle.write("{truncated\n")
+
+    report = campaign_report(tmp_path, limit=2)
+
+    assert [row["turn"] for row in report["turns"]] == ["turn-3", "turn-2"]
+    assert report["summary"]["turns"] == 3
+
+
+def test_report_file_is_trimmed_to_retention(tmp_path, monkeypatch):
+    monkeypatch.setattr(prompt_cache_report, "_TRIM_BYTES", 2_000)
+    monkeypatch.setattr(prompt_cache_report, "REPORT_RETENTION", 5)
+
+    for turn in range(1, 40):
+        record_turn(tmp_path, _row(turn, 1_000, 900, 10.0))
+
+    rows = read_turns(tmp_path)
+    assert len(rows) <= 5 + 2_000 // len(json.dumps(rows[0]))
+    assert rows[-1]["turn"] == "turn-39"
+
+
+def test_all_campaigns_report_summarises_each_campaign(tmp_path):
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+    record_turn(tmp_path / "a", _row(1, 100, 50, 1.0))
+    record_turn(tmp_path / "b", _row(1, 300, 300, 1.0))
+
+    report = all_campaigns_report(tmp_path)
+
+    assert set(report["campaigns"]) == {"a", "b"}
+    assert report["campaigns"]["b"]["cache_hit_ratio"] == 1.0
+    assert report["summary"]["cache_hit_ratio"] == 0.875
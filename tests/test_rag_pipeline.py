@@ -0,0 +1,148 @@
+import json
+
+import numpy as np
+import pytest
+
+import lib.content_extractor as content_extractor
+import lib.rag as rag
+from lib.agent_extractor import AgentExtractor
+from lib.rag.pipeline import run_pipeline
+from lib.rag.rag_extractor import RAGExtractor
+
+
+class _FakeEmbedder:
+    def __init__(self):
+        self.embedded = []
+        self.last_batch_stats = {}
+
+    def embed_batch(self, texts, batch_size=32, show_progress=False):
+        self.embedded.extend(texts)
+        self.last_batch_stats = {
+            "texts": len(texts),
+            "cache_hits": 0,
+            "cache_misses": len(texts),
+            "hit_rate": 0.0,
+            "seconds_embedding": 0.0,
+            "seconds_saved": 0.0,
+        }
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+class _FakeStore:
+    def __init__(self):
+        self.ids = []
+        self.chunks = []
+
+    def clear(self):
+        self.ids, self.chunks = [], []
+
+    def count(self):
+        return len(self.ids)
+
+    def add_chunks(self, chunks, embeddings, metadatas=None, ids=None):
+        assert [meta["chunk_index"] for meta in metadatas] == [int(i[4:]) for i in ids]
+        self.chunks.extend(chunks)
+        self.ids.extend(ids)
+        return len(chunks)
+
+    def get_stats(self):
+        return {"total_chunks": self.count()}
+
+
+def _book(chapters=40):
+    return "".join(
+        f"Chapter {n}\nThe road to the drowned abbey winds past milestone {n}.\n\n" * 3
+        for n in range(1, chapters + 1)
+    )
+
+
+def _rag_extractor(campaign_dir, chunk_size=200):
+    extractor = RAGExtractor(str(campaign_dir), chunk_size=chunk_size, embedder=_FakeEmbedder())
+    extractor.vector_store = _FakeStore()
+    return extractor
+
+
+def test_streamed_pieces_chunk_like_the_whole_text(tmp_path):
+    extractor = _rag_extractor(tmp_path)
+    text = _book()
+    pieces = [text[i:i + 97] for i in range(0, len(text), 97)]
+
+    assert list(extractor.iter_chunks(pieces)) == extractor._split_into_chunks(text)
+    # One oversized header-less chunk still falls back to paragraphs.
+    prose = "\n\n".join(["a quiet paragraph about the harbour"] * 20)
+    assert len(list(extractor.iter_chunks([prose[:300], prose[300:]]))) > 1
+
+
+def test_pipeline_runs_each_stage_once(tmp_path, monkeypatch):
+    source = tmp_path / "abbey.txt"
+    source.write_text(_book())
+    calls = []
+    real_extract = content_extractor.extract_content
+    monkeypatch.setattr(
+        content_extractor,
+        "extract_content",
+        lambda path: calls.append(path) or real_extract(path),
+    )
+    monkeypatch.setattr("lib.agent_extractor.check_rag_available", lambda: True)
+    monkeypatch.setattr(
+        rag, "RAGExtractor", lambda campaign_dir: _rag_extractor(campaign_dir), raising=False
+    )
+    agent = AgentExtractor(str(tmp_path / "world-state"), "abbey")
+
+    result = agent.prepare_for_agents(str(source))
+
+    rag_extractor = agent._rag_extractor
+    expected = rag_extractor._split_into_chunks(_book())
+    assert calls == [str(source)]
+    assert rag_extractor.embedder.embedded == expected
+    assert rag_extractor.vector_store.ids == [f"doc_{i:04d}" for i in range(len(expected))]
+    assert (agent.extraction_dir / "current-document.txt").read_text() == _book()
+    chunk_files = sorted((agent.extraction_dir / "chunks").glob("chunk_*.txt"))
+    assert len(chunk_files) == len(expected) == result["total_chunks"]
+    assert chunk_files[-1].read_text() == (
+        f"# Chunk {len(expected)} of {len(expected)}\n---\n\n{expected[-1]}"
+    )
+    pipeline = json.loads((agent.extraction_dir / "metadata.json").read_text())["rag_stats"][
+        "extraction"
+    ]["pipeline"]
+    assert list(pipeline["stages"]) == ["extract", "chunk", "embed", "store", "write"]
+    assert pipeline["stages"]["extract"]["items_out"] == 1
+    assert pipeline["stages"]["embed"]["items_out"] == len(expected)
+
+
+def test_a_failing_stage_stops_the_pipeline():
+    def source(_inputs):
+        yield from range(1000)
+
+    def explode(items):
+        for item in items:
+            if item == 3:
+                raise ValueError("bad page")
+            yield item
+
+    with pytest.raises(ValueError, match="bad page"):
+        run_pipeline([("extract", source), ("chunk", explode)], queue_size=2)
+
+
+def test_failed_ingest_keeps_previous_document_text(tmp_path, monkeypatch):
+    source = tmp_path / "abbey.txt"
+    source.write_text(_book())
+
+    def failing_extractor(campaign_dir):
+        extractor = _rag_extractor(campaign_dir)
+        extractor.embedder.embed_batch = lambda *args, **kwargs: (_ for _ in ()).throw(
+            RuntimeError("model unavailable")
+        )
+        return extractor
+
+    monkeypatch.setattr("lib.agent_extractor.check_rag_available", lambda: True)
+    monkeypatch.setattr(rag, "RAGExtractor", failing_extractor, raising=False)
+    agent = AgentExtractor(str(tmp_path / "world-state"), "abbey")
+    document = agent.extraction_dir / "current-document.txt"
+    document.write_text("the previous book")
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        agent.prepare_for_agents(str(source))
+
+    assert document.read_text() == "the previous book"
+    assert [path.name for path in agent.extraction_dir.glob("*.tmp")] == []
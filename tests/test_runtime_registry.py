@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from backend.runtime import (
@@ -9,6 +11,7 @@ from backend.runtime import (
     RuntimeDefinition,
     RuntimeRegistry,
     create_default_registry,
+    register_replay_runtime,
 )
 
 
@@ -216,3 +219,59 @@ def test_default_registry_exposes_supported_model_catalog():
     claude = registry.get_model("claude-sonnet-5")
     assert claude.selected_reasoning_effort == "provider_default"
     assert claude.usage_limits == {"scope": "provider_subscription"}
+
+
+def test_replay_runtime_is_registered_only_when_a_recording_is_configured(
+    tmp_path, monkeypatch
+):
+    monkeypatch.delenv("DND_REPLAY_RECORDING", raising=False)
+    assert "replay" not in [model.id for model in create_default_registry().list_models()]
+
+    recording = tmp_path / "turn.jsonl"
+    recording.write_text(
+        '{"delay": 0.2, "type": "text_delta", "content": "Hi"}\n'
+        "\n"
+        '{"delay": 0.1, "type": "tool_use", "content": "Bash: ls",'
+        ' "metadata": {"tool_use_id": "t1"}}\n'
+    )
+    monkeypatch.setenv("DND_REPLAY_RECORDING", str(recording))
+    monkeypatch.setenv("DND_REPLAY_SPEED", "1000")
+    registry = create_default_registry()
+    provider = registry.build(ProviderBuildContext(tmp_path, "camp", "replay"))
+
+    async def turn():
+        return [
+            event
+            async for event in provider.process_message("look", "system", "replay")
+        ]
+
+    events = asyncio.run(turn())
+
+    assert [event.type for event in events] == ["text_delta", "tool_use", "turn_end"]
+    assert events[1].metadata == {"tool_use_id": "t1"}
+    assert provider.session_id.startswith("replay-")
+    assert provider.get_context_usage().used_tokens > 0
+
+
+def test_builtin_replay_covers_streaming_tools_images_and_rate_limits(tmp_path):
+    registry = RuntimeRegistry()
+    register_replay_runtime(registry, "builtin", speed=1000)
+    provider = registry.build(ProviderBuildContext(tmp_path, "camp", "replay"))
+
+    async def turn():
+        return {
+            event.type
+            async for event in provider.process_message("look", "system", "replay")
+        }
+
+    assert {"text_delta", "tool_use", "tool_result", "image", "rate_limit"} <= asyncio.run(turn())
+
+
+def test_replay_recording_errors_name_the_line(tmp_path):
+    from backend.providers.replay import load_recording
+
+    recording = tmp_path / "turn.jsonl"
+    recording.write_text('{"type": "text"}\n{"content": "no type"}\n')
+
+    with pytest.raises(ValueError, match="turn.jsonl:2"):
+        load_recording(recording)
@@ -0,0 +1,109 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from lib.rag.extraction_queries import EXTRACTION_QUERIES
+from lib.rag.semantic_chunker import SemanticChunker
+
+
+class _HashEmbedder:
+    """Deterministic pseudo-embeddings; counts model calls."""
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_batch(self, texts, batch_size=32, show_progress=False):
+        self.batches.append(list(texts))
+        return np.stack([self._vector(text) for text in texts])
+
+    def _vector(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        return np.random.default_rng(seed).normal(size=16).astype(np.float32)
+
+
+def _cosine(a, b):
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def test_batched_scores_match_per_category_cosine():
+    embedder = _HashEmbedder()
+    chunker = SemanticChunker(embedder=embedder, threshold=0.1)
+    chunks = [f"chunk {index}: the harbour watch and its captain" for index in range(40)]
+
+    categorized = chunker.categorize_chunks(chunks)
+
+    assert embedder.batches[-1] == chunks
+    placed = sorted(item["index"] for items in categorized.values() for item in items)
+    assert placed == list(range(len(chunks)))
+    for category, items in categorized.items():
+        for item in items:
+            vector = embedder._vector(item["text"])
+            expected = {
+                cat: _cosine(vector, np.stack([embedder._vector(q) for q in queries]).mean(axis=0))
+                for cat, queries in EXTRACTION_QUERIES.items()
+            }
+            assert item["all_scores"] == pytest.approx(expected, abs=1e-5)
+            best = max(expected, key=expected.get)
+            assert category == (best if expected[best] >= 0.1 else "general")
+
+
+def test_detailed_mode_uses_per_query_similarities():
+    embedder = _HashEmbedder()
+    chunker = SemanticChunker(embedder=embedder)
+    text = "The innkeeper greets travellers by the fire."
+
+    detailed = chunker.score_chunk_detailed(text)
+
+    vector = embedder._vector(text)
+    for category, queries in EXTRACTION_QUERIES.items():
+        sims = [_cosine(vector, embedder._vector(query)) for query in queries]
+        detail = detailed["details"][category]
+        assert detail["query_similarities"] == pytest.approx(sims, abs=1e-5)
+        assert detail["max_similarity"] == pytest.approx(max(sims), abs=1e-5)
+        assert detail["avg_similarity"] == pytest.approx(sum(sims) / len(sims), abs=1e-5)
+        assert detailed["scores"][category] == detail["max_similarity"]
+
+
+def test_categorize_chunk_ranks_categories_above_threshold():
+    chunker = SemanticChunker(embedder=_HashEmbedder(), threshold=-1.0)
+
+    ranked = chunker.categorize_chunk("A +2 longsword of flame.", allow_multiple=True)
+
+    assert [category for category, _ in ranked] == sorted(
+        EXTRACTION_QUERIES, key=dict(ranked).get, reverse=True
+    )
+    assert chunker.categorize_chunk("A +2 longsword of flame.") == ranked[:1]
+
+
+def test_query_table_is_reused_without_the_model(tmp_path, monkeypatch):
+    import lib.rag.semantic_chunker as chunker_module
+
+    first = _HashEmbedder()
+    first.model_name = "all-MiniLM-L6-v2"
+    SemanticChunker(embedder=first, table_dir=str(tmp_path))._ensure_initialized()
+    assert len(first.batches) == len(EXTRACTION_QUERIES)
+
+    class _NoModel(_HashEmbedder):
+        model_name = "all-MiniLM-L6-v2"
+
+        def embed_batch(self, texts, batch_size=32, show_progress=False):
+            raise AssertionError("model used while the query table was current")
+
+    chunker = SemanticChunker(embedder=_NoModel(), table_dir=str(tmp_path))
+    assert chunker.get_stats()["embedding_dimension"] == 16
+    text = "The drowned bell tolls."
+    scores = chunker.score_embeddings(first._vector(text)[np.newaxis, :])[0]
+    reference = SemanticChunker(embedder=_HashEmbedder()).score_embeddings(
+        first._vector(text)[np.newaxis, :]
+    )[0]
+    assert np.allclose(scores, reference)
+
+    # Editing extraction_queries.py (or switching model) needs a fresh table.
+    edited = tmp_path / "extraction_queries.py"
+    edited.write_text("# edited\n")
+    monkeypatch.setattr(chunker_module.extraction_queries, "__file__", str(edited))
+    recomputed = _HashEmbedder()
+    recomputed.model_name = "all-MiniLM-L6-v2"
+    SemanticChunker(embedder=recomputed, table_dir=str(tmp_path))._ensure_initialized()
+    assert len(recomputed.batches) == len(EXTRACTION_QUERIES)
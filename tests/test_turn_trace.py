@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from backend.turn_trace import (
+    TurnTrace,
+    list_traces,
+    resolve_trace,
+    save_trace,
+    trace_retention,
+)
+
+
+def _trace(turn: int) -> TurnTrace:
+    return TurnTrace(f"turn-{turn}", "blood-arena", "claude", "claude-sonnet-5")
+
+
+def test_trace_is_chrome_trace_json_with_paired_tool_spans():
+    trace = _trace(1)
+    with trace.span("append_event", "storage", type="text"):
+        pass
+    trace.tool_started("tool-1", "Bash", "bash tools/dm-time.sh advance 1")
+    trace.tool_started("tool-2", "Read", "notes.md")
+    trace.tool_finished("tool-1", is_error=False)
+
+    document = trace.to_json(outcome="completed")
+    events = document["traceEvents"]
+
+    assert document["displayTimeUnit"] == "ms"
+    turn = next(event for event in events if event["name"] == "turn")
+    assert turn["ph"] == "X" and turn["args"]["outcome"] == "completed"
+    append = next(event for event in events if event["name"] == "append_event")
+    assert append["ph"] == "X" and append["dur"] >= 0
+    tools = [(event["ph"], event["id"]) for event in events if event.get("cat") == "tool"]
+    assert tools == [("b", "tool-1"), ("b", "tool-2"), ("e", "tool-1"), ("e", "tool-2")]
+    unfinished = [event for event in events if event.get("id") == "tool-2" and event["ph"] == "e"]
+    assert unfinished[0]["args"] == {"unfinished": True}
+
+
+def test_results_without_ids_close_the_oldest_open_tool():
+    trace = _trace(1)
+    trace.tool_started("", "Bash")
+    trace.tool_finished("")
+    trace.tool_finished("never-opened")
+
+    ends = [event for event in trace.to_json()["traceEvents"] if event["ph"] == "e"]
+    assert [event["id"] for event in ends] == ["anonymous-1"]
+
+
+def test_retention_keeps_only_the_newest_turns(tmp_path):
+    for turn in (1, 2, 10, 11):
+        save_trace(tmp_path, _trace(turn), retention=3)
+
+    assert [entry["id"] for entry in list_traces(tmp_path)] == ["turn-11", "turn-10", "turn-2"]
+    stored = json.loads(resolve_trace(tmp_path, "turn-10").read_text())
+    assert stored["otherData"]["trace_id"] == "turn-10"
+
+
+def test_zero_retention_disables_tracing(tmp_path, monkeypatch):
+    monkeypatch.setenv("DND_TRACE_RETENTION", "0")
+
+    assert trace_retention() == 0
+    assert save_trace(tmp_path, _trace(1)) is None
+    assert list_traces(tmp_path) == []
+
+
+@pytest.mark.parametrize("trace_id", ["../world", "turn-1.json", "turn-x", "turn-404"])
+def test_resolve_rejects_unknown_and_unsafe_ids(tmp_path, trace_id):
+    save_trace(tmp_path, _trace(1), retention=5)
+
+    with pytest.raises(FileNotFoundError):
+        resolve_trace(tmp_path, trace_id)
@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+
+from backend import view_cache
+from lib.world_graph import WorldGraph
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    view_cache.clear_view_cache()
+    yield
+    view_cache.clear_view_cache()
+
+
+def _campaign(tmp_path):
+    campaign = tmp_path / "etag"
+    campaign.mkdir()
+    graph = WorldGraph(campaign_dir=campaign)
+    graph.ensure_initialized()
+    return campaign, graph
+
+
+def test_etag_follows_world_revision_and_overview(tmp_path):
+    campaign, graph = _campaign(tmp_path)
+    first = view_cache.campaign_etag("views", campaign)
+    assert first == view_cache.campaign_etag("views", campaign)
+    assert first != view_cache.campaign_etag("map", campaign)
+
+    graph.add_node("npc:bo", "npc", "Bo")
+    after_write = view_cache.campaign_etag("views", campaign)
+    assert after_write != first
+    assert '"views-2-' in after_write
+
+    (campaign / "campaign-overview.json").write_text(json.dumps({"name": "x"}))
+    assert view_cache.campaign_etag("views", campaign) != after_write
+
+
+def test_revision_is_parsed_once_per_file_stamp(tmp_path, monkeypatch):
+    campaign, _ = _campaign(tmp_path)
+    view_cache.world_revision(campaign)
+    loads = []
+    real_read = view_cache._read_meta
+    monkeypatch.setattr(
+        view_cache, "_read_meta", lambda path: loads.append(1) or real_read(path)
+    )
+
+    assert view_cache.world_revision(campaign)[0] == 1
+    assert loads == []
+
+    world_file = campaign / "world.json"
+    stat = world_file.stat()
+    os.utime(world_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    view_cache.world_revision(campaign)
+    assert loads == [1]
+
+
+def test_rendered_body_is_reused_for_the_same_etag(tmp_path):
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"name": "Ada", "glyph": "ё"}
+
+    body = view_cache.rendered_body("views", tmp_path, '"a"', build)
+    assert view_cache.rendered_body("views", tmp_path, '"a"', build) is body
+    assert json.loads(body) == {"name": "Ada", "glyph": "ё"}
+    view_cache.rendered_body("views", tmp_path, '"b"', build)
+    assert len(builds) == 2
+
+
+def test_rendered_bodies_are_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(view_cache, "_BODY_LIMIT", 2)
+    for kind in ("views", "map", "status"):
+        view_cache.rendered_body(kind, tmp_path, '"a"', dict)
+
+    assert [kind for kind, _ in view_cache._rendered_bodies] == ["map", "status"]
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('"x"', True),
+        ('W/"x"', True),
+        ('"y", "x"', True),
+        ("*", True),
+        ('"y"', False),
+    ],
+)
+def test_if_none_match_comparison(header, expected):
+    assert view_cache.etag_matches(header, '"x"') is expected
+
+
+def test_revision_falls_back_when_meta_is_not_the_first_key(tmp_path):
+    campaign = tmp_path / "legacy"
+    campaign.mkdir()
+    (campaign / "world.json").write_text(
+        json.dumps({"nodes": {}, "edges": [], "meta": {"revision": 9}})
+    )
+    assert view_cache.world_revision(campaign)[0] == 9
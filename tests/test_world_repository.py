@@ -138,3 +138,29 @@ def test_reset_replaces_world_and_advances_revision(tmp_path):
     assert saved["nodes"] == {}
     assert saved["edges"] == []
     assert saved["meta"]["revision"] == previous_revision + 1
+
+
+def test_commit_listeners_see_each_committed_revision(tmp_path):
+    import world_repository
+
+    seen = []
+
+    def listener(world_file, revision):
+        seen.append((world_file, revision))
+
+    def broken(_world_file, _revision):
+        raise RuntimeError("cache hook failed")
+
+    world_repository.add_commit_listener(broken)
+    world_repository.add_commit_listener(listener)
+    try:
+        graph = WorldGraph(tmp_path)
+        graph.ensure_initialized()
+        assert graph.add_node("npc:a", "npc", "A")
+        with graph.transaction():
+            pass
+    finally:
+        world_repository.remove_commit_listener(broken)
+        world_repository.remove_commit_listener(listener)
+
+    assert seen == [(tmp_path / "world.json", 1), (tmp_path / "world.json", 2)]
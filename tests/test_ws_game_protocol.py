@@ -283,6 +283,39 @@ def test_claude_game_websocket_receives_cinematic_mcp(client, tmp_path, monkeypa
     assert set(captured["mcp_servers"]) == {"cinematic"}
 
 
+def test_opening_the_game_socket_prewarms_the_provider(client, tmp_path, monkeypatch):
+    _campaign_dir(tmp_path, "camp-a")
+    prewarmed = []
+
+    def fake_start_prewarm(self, system_prompt, mcp_servers=None):
+        prewarmed.append((self.campaign, system_prompt, set(mcp_servers or ())))
+        return True
+
+    monkeypatch.setattr(game_session_module.GameSession, "start_prewarm", fake_start_prewarm)
+
+    with client.websocket_connect("/ws/game?campaign=camp-a&model=claude-sonnet-5") as ws:
+        ws.receive_json()
+    assert prewarmed == []
+
+    monkeypatch.setenv("DND_PREWARM", "1")
+    with client.websocket_connect("/ws/game?campaign=camp-a&model=claude-sonnet-5") as ws:
+        ws.receive_json()
+    assert prewarmed == [("camp-a", "system prompt", {"cinematic"})]
+
+
+def test_prewarm_pool_picks_most_recently_played_campaigns(tmp_path):
+    import os
+
+    campaigns_dir = tmp_path / "world-state" / "campaigns"
+    for age, name in enumerate(("newest", "older", "oldest")):
+        append_event(_campaign_dir(tmp_path, name), "user_message", "hello")
+        log = campaigns_dir / name / "events.jsonl"
+        os.utime(log, (1_000_000 - age, 1_000_000 - age))
+    _campaign_dir(tmp_path, "never-played")
+
+    assert server_module._recent_campaigns(campaigns_dir, 2) == ["newest", "older"]
+
+
 def test_generated_campaign_media_endpoint(client, tmp_path):
     from backend.media import store_generated_image
 
@@ -296,3 +329,170 @@ def test_generated_campaign_media_endpoint(client, tmp_path):
     assert response.status_code == 200
     assert response.headers["content-type"] == "image/png"
     assert response.content == source.read_bytes()
+
+
+def test_campaign_views_honor_revision_etag(client, tmp_path, monkeypatch):
+    from lib.world_graph import WorldGraph
+
+    campaign_dir = _campaign_dir(tmp_path, "camp-a")
+    graph = WorldGraph(campaign_dir=campaign_dir)
+    graph.ensure_initialized()
+    graph.add_node("player:active", "player", "Ada", {"hp": 5})
+    projections = []
+    real_views = server_module.get_campaign_views
+
+    def counting_views(path, sections=None):
+        projections.append(path)
+        return real_views(path, sections)
+
+    monkeypatch.setattr(server_module, "get_campaign_views", counting_views)
+
+    first = client.get("/api/campaigns/camp-a/views")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.json()["character"]["name"] == "Ada"
+
+    cached = client.get("/api/campaigns/camp-a/views")
+    assert cached.content == first.content
+    not_modified = client.get(
+        "/api/campaigns/camp-a/views", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert len(projections) == 1
+
+    graph.update_node("player:active", {"name": "Ada Prime"})
+    changed = client.get(
+        "/api/campaigns/camp-a/views", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["character"]["name"] == "Ada Prime"
+    assert len(projections) == 2
+
+
+def test_campaign_views_section_selection_and_endpoints(client, tmp_path):
+    from lib.world_graph import WorldGraph
+
+    campaign_dir = _campaign_dir(tmp_path, "camp-a")
+    graph = WorldGraph(campaign_dir=campaign_dir)
+    graph.ensure_initialized()
+    graph.add_node("quest:relay", "quest", "Relay", {"status": "active"})
+
+    selected = client.get("/api/campaigns/camp-a/views?sections=quests,inventory")
+    assert selected.status_code == 200
+    assert set(selected.json()) == {"visibility_policy", "quests", "inventory"}
+    assert "," not in selected.headers["etag"]
+    reordered = client.get("/api/campaigns/camp-a/views?sections=inventory,quests,quests")
+    assert reordered.headers["etag"] == selected.headers["etag"]
+
+    single = client.get("/api/campaigns/camp-a/views/quests")
+    assert single.status_code == 200
+    assert [quest["name"] for quest in single.json()] == ["Relay"]
+
+    assert client.get("/api/campaigns/camp-a/views?sections=secrets").status_code == 400
+    assert client.get("/api/campaigns/camp-a/views/secrets").status_code == 404
+
+
+def test_map_viewport_query_is_validated_and_revision_tagged(client, tmp_path):
+    import json
+
+    campaign_dir = _campaign_dir(tmp_path, "camp-a")
+    (campaign_dir / "campaign-overview.json").write_text(
+        json.dumps({"modules": ["world-travel"]})
+    )
+
+    view = client.get("/api/campaigns/camp-a/map?bbox=0,0,100,100&zoom=3")
+    assert view.status_code == 200
+    assert view.json()["viewport"]["zoom"] == 3
+    repeat = client.get(
+        "/api/campaigns/camp-a/map?bbox=0,0,100,100&zoom=3",
+        headers={"If-None-Match": view.headers["etag"]},
+    )
+    assert repeat.status_code == 304
+
+    assert client.get("/api/campaigns/camp-a/map?bbox=1,2,3").status_code == 400
+    assert client.get("/api/campaigns/camp-a/map?bbox=5,0,1,1").status_code == 400
+    assert client.get("/api/campaigns/camp-a/map?bbox=0,0,1,nan").status_code == 400
+    assert client.get("/api/campaigns/camp-a/map?zoom=99").status_code == 422
+
+
+def test_metrics_endpoint_exposes_prometheus_text(client, tmp_path):
+    _campaign_dir(tmp_path, "blood-arena")
+    with client.websocket_connect("/ws/game?campaign=blood-arena") as ws:
+        ws.receive_json()
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    for name in (
+        "dm_ws_send_seconds",
+        "dm_turn_ttft_seconds",
+        "dm_turn_duration_seconds",
+        "dm_view_projection_seconds",
+        "dm_tick_stage_seconds",
+        "dm_broker_queue_depth",
+    ):
+        assert f"# TYPE {name} " in text
+
+
+def test_turn_traces_are_listed_and_downloadable(client, tmp_path):
+    from backend.turn_trace import TurnTrace, save_trace
+
+    campaign_dir = _campaign_dir(tmp_path, "blood-arena")
+    save_trace(campaign_dir, TurnTrace("turn-7", "blood-arena", "claude", "claude-sonnet-5"))
+
+    listing = client.get("/api/campaigns/blood-arena/traces").json()
+    assert [entry["id"] for entry in listing["traces"]] == ["turn-7"]
+
+    response = client.get("/api/campaigns/blood-arena/traces/turn-7")
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+    assert response.json()["otherData"]["trace_id"] == "turn-7"
+    assert client.get("/api/campaigns/blood-arena/traces/turn-8").status_code == 404
+
+
+def test_prompt_cache_report_endpoints(client, tmp_path):
+    from backend.prompt_cache_report import record_turn
+
+    campaign_dir = _campaign_dir(tmp_path, "blood-arena")
+    record_turn(campaign_dir, {"turn": "turn-1", "input_tokens": 1_000, "cached_input_tokens": 0})
+    record_turn(campaign_dir, {"turn": "turn-3", "input_tokens": 1_000, "cached_input_tokens": 900})
+
+    report = client.get("/api/campaigns/blood-arena/prompt-cache?limit=1").json()
+    overall = client.get("/api/prompt-cache").json()
+
+    assert [row["turn"] for row in report["turns"]] == ["turn-3"]
+    assert report["summary"]["cache_hit_ratio"] == 0.45
+    assert overall["campaigns"]["blood-arena"]["turns"] == 2
+    assert client.get("/api/campaigns/missing/prompt-cache").status_code == 404
+
+
+def test_campaign_media_serves_negotiated_variant(client, tmp_path):
+    from PIL import Image
+
+    from backend.media import store_generated_image
+    from backend.media_variants import generate_variants
+
+    campaign_dir = _campaign_dir(tmp_path, "camp-a")
+    source = tmp_path / "frame.png"
+    Image.effect_noise((1000, 560), 20).convert("RGB").save(source)
+    published = store_generated_image(campaign_dir, source_path=source)
+    url = f"/api/campaigns/camp-a/media/{published.filename}"
+    pending = client.get(f"{url}?w=480", headers={"Accept": "image/webp,*/*;q=0.8"})
+    generate_variants(campaign_dir / "media" / published.filename)
+
+    thumbnail = client.get(f"{url}?w=480", headers={"Accept": "image/webp,*/*;q=0.8"})
+    original = client.get(url, headers={"Accept": "image/png"})
+
+    assert pending.headers["content-type"] == "image/png"
+    assert pending.headers["cache-control"] == "private, no-cache"
+    assert thumbnail.status_code == 200
+    assert thumbnail.headers["content-type"] == "image/webp"
+    assert thumbnail.headers["vary"] == "Accept"
+    assert "immutable" in thumbnail.headers["cache-control"]
+    assert len(thumbnail.content) < published.size
+    assert original.headers["content-type"] == "image/png"
+    assert original.content == source.read_bytes()